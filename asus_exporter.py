@@ -9,7 +9,7 @@ import asyncio
 import sys
 
 from src.config import ExporterConfig, setup_logging
-from src.main import AsusExporter
+from src.main import run_exporter
 
 
 def parse_args():
@@ -30,7 +30,30 @@ Environment Variables:
   EXPORTER_PORT            HTTP server port (default: 8000)
   EXPORTER_COLLECTION_INTERVAL  Metrics collection interval in seconds (default: 15)
   EXPORTER_LOG_LEVEL       Log level (default: INFO)
+  EXPORTER_LOG_FORMAT      Log format: text or json (default: text)
   EXPORTER_CACHE_TIME      Cache time in seconds (default: 5)
+  EXPORTER_OUTPUT_MODE     Output mode: http, remote_write, textfile or unix (default: http)
+  EXPORTER_REMOTE_WRITE_URL     Remote write endpoint for remote_write mode
+  EXPORTER_PROCESS_MODE    single, or split collector/server processes (default: single)
+  EXPORTER_COLLECTORS / EXPORTER_DISABLED_COLLECTORS       Collector allow/deny lists
+  EXPORTER_DATA_TYPES / EXPORTER_DISABLED_DATA_TYPES       AsusData allow/deny lists
+  EXPORTER_METRICS / EXPORTER_DISABLED_METRICS             Metric family allow/deny lists
+  EXPORTER_SCRAPE_GROUPS   Collector subsets at /metrics/<group> (default: fast, clients)
+  EXPORTER_DATA_SOURCE     Data source: http, ssh or fixture (default: http)
+  EXPORTER_DATA_SOURCE_ROUTES  Per data type sources, e.g. cpu=ssh,ram=ssh
+  EXPORTER_AIMESH_DIRECT   Poll AiMesh satellites directly, in parallel (default: false)
+  EXPORTER_PORT_POLL_INTERVAL  Fast poll of port state in seconds (default: 0 = off)
+  EXPORTER_PARSE_WORKERS   Processes parsing large client/port tables (default: 0 = inline)
+  EXPORTER_ANOMALY_DETECTION   EWMA z-scores for WAN, CPU and temperature (default: false)
+  EXPORTER_SYSLOG_ENABLED      Real-time client/WAN events from router syslog (default: false)
+  EXPORTER_PROBE_TARGETS   TCP/HTTP/DNS latency probe targets (default: none)
+  EXPORTER_CLIENT_RSSI_THRESHOLD  RSSI (dBm) below which WiFi clients count as weak
+  EXPORTER_ADMIN_TOKEN     Enables /admin endpoints for runtime toggles
+  EXPORTER_DEBUG_TOKEN     Enables /debug profiling, heap and trace endpoints
+  EXPORTER_INGEST_KEY      Enables /api/ingest for a router-side push agent
+  EXPORTER_HISTORY_ENABLED Columnar history archive at /api/history (default: false)
+  EXPORTER_INVENTORY_ENABLED  Client inventory with first/last seen at /api/clients (default: false)
+  EXPORTER_CLIENT_VENDORS  Client vendor labels from the IEEE OUI registry (default: false)
         """,
     )
     parser.add_argument("--hostname", help="Router IP address", default=None)
@@ -109,11 +132,10 @@ async def main():
             config.cache_time = args.cache_time
 
         # Setup logging
-        setup_logging(config.log_level)
+        setup_logging(config.log_level, config.log_format)
 
         # Create and run exporter
-        exporter = AsusExporter(config)
-        await exporter.run_forever()
+        await run_exporter(config)
 
     except KeyboardInterrupt:
         print("\n🛑 Exporter stopped by user")
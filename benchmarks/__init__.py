@@ -0,0 +1 @@
+"""Benchmarks for the ASUS Router Prometheus Exporter"""
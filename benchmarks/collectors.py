@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Collector micro-benchmarks on synthetic payloads: WiFi client table processing at
+10/1k/10k clients (and at 10k with parse worker processes), port parsing at 4/48 ports, VPN at 1/50 clients,
+flatten_for_info_metric and generate_latest at each client scale.
+
+Usage: python -m benchmarks.collectors [--quick]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+
+from asusrouter import AsusData
+from prometheus_client import generate_latest
+from prometheus_client.metrics import MetricWrapperBase
+
+from src.collectors.hardware import HardwareCollector
+from src.collectors.pool import ParsePool
+from src.collectors.vpn import VPNCollector
+from src.collectors.wifi import WiFiCollector
+from src.metrics.prometheus_metrics import COLLECTOR_FAMILIES, register_collector_families
+
+from . import payloads
+from .payloads import StaticSource
+
+CLIENT_SCALES = (10, 1000, 10000)
+PORT_SCALES = (4, 48)
+VPN_SCALES = (1, 50)
+
+# Worker processes for the process-pool parsing case at the largest client scale
+PARSE_WORKERS = 4
+
+# Each case runs until it has this many samples or has used this much time
+MAX_ITERATIONS = 200
+TIME_BUDGET = 3.0
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """p50/p99/mean seconds of a list of timings"""
+    ordered = sorted(samples)
+    return {
+        "p50": statistics.median(ordered),
+        "p99": ordered[min(len(ordered) - 1, round(0.99 * (len(ordered) - 1)))],
+        "mean": statistics.fmean(ordered),
+        "iterations": len(ordered),
+    }
+
+
+def run_case(
+    loop: asyncio.AbstractEventLoop,
+    step: Callable[[int], Awaitable[object] | object],
+    budget: float = TIME_BUDGET,
+    max_iterations: int = MAX_ITERATIONS,
+) -> dict[str, float]:
+    """Time step(iteration) repeatedly; coroutines are run on the loop"""
+    samples = []
+    deadline = time.perf_counter() + budget
+    iteration = 0
+    while iteration < max_iterations and (iteration < 5 or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        result = step(iteration)
+        if asyncio.iscoroutine(result):
+            loop.run_until_complete(result)
+        samples.append(time.perf_counter() - start)
+        iteration += 1
+    return summarize(samples)
+
+
+def _reset_families(collector_name: str) -> None:
+    """Drop every labelled child so one scale does not inherit the previous one's series"""
+    for family in COLLECTOR_FAMILIES.get(collector_name, []):
+        # Custom collectors (client distributions) are rebuilt from the client table
+        if isinstance(family, MetricWrapperBase):
+            family.clear()
+
+
+def bench_wifi(
+    loop, count: int, budget: float, parse_workers: int = 0
+) -> dict[str, dict[str, float]]:
+    """Client table diff plus series updates, then rendering the resulting exposition"""
+    _reset_families("wifi")
+    register_collector_families("wifi")
+    # Pre-built so payload generation is not timed; cycles alternate between variants
+    variants = [payloads.clients(count, cycle=cycle) for cycle in range(4)]
+    source = StaticSource({AsusData.CLIENTS: variants[0]})
+    collector = WiFiCollector(source)
+    collector.parser = ParsePool(parse_workers)
+    # Also starts the parse workers, so their startup is not timed
+    loop.run_until_complete(collector.collect())
+
+    def cycle(iteration: int):
+        source.payloads[AsusData.CLIENTS] = variants[(iteration + 1) % len(variants)]
+        return collector.collect()
+
+    if parse_workers:
+        results = {
+            f"wifi_collect[clients={count},parse_workers={parse_workers}]": run_case(
+                loop, cycle, budget
+            )
+        }
+    else:
+        results = {
+            f"wifi_collect[clients={count}]": run_case(loop, cycle, budget),
+            f"generate_latest[clients={count}]": run_case(
+                loop, lambda _: generate_latest(), budget
+            ),
+        }
+    collector.parser.close()
+    _reset_families("wifi")
+    return results
+
+
+def bench_ports(loop, count: int, budget: float) -> dict[str, float]:
+    register_collector_families("hardware")
+    collector = HardwareCollector(StaticSource({AsusData.PORTS: payloads.ports(count)}))
+    return run_case(loop, lambda _: collector.collect(), budget)
+
+
+def bench_vpn(loop, count: int, budget: float) -> dict[str, float]:
+    register_collector_families("vpn")
+    collector = VPNCollector(StaticSource(payloads.vpn(count)))
+    return run_case(loop, lambda _: collector.collect(), budget)
+
+
+def run(quick: bool = False) -> dict[str, dict[str, float]]:
+    """Every case, keyed by a stable name used in the baseline file"""
+    budget = 0.5 if quick else TIME_BUDGET
+    # Collector debug output would dominate the timings
+    logging.getLogger().setLevel(logging.WARNING)
+    loop = asyncio.new_event_loop()
+    results: dict[str, dict[str, float]] = {}
+    try:
+        for count in CLIENT_SCALES:
+            results.update(bench_wifi(loop, count, budget))
+        results.update(bench_wifi(loop, CLIENT_SCALES[-1], budget, PARSE_WORKERS))
+        for count in PORT_SCALES:
+            results[f"hardware_collect[ports={count}]"] = bench_ports(loop, count, budget)
+        for count in VPN_SCALES:
+            results[f"vpn_collect[clients={count}]"] = bench_vpn(loop, count, budget)
+
+        flatten = HardwareCollector(StaticSource({})).flatten_for_info_metric
+        for width, depth in ((8, 1), (16, 3)):
+            info = payloads.nested_info(width, depth)
+            results[f"flatten_for_info_metric[width={width},depth={depth}]"] = run_case(
+                loop, lambda _, info=info: flatten(info), budget
+            )
+    finally:
+        loop.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collector micro-benchmarks")
+    parser.add_argument("--quick", action="store_true", help="Shorter time budget per case")
+    args = parser.parse_args()
+    print(json.dumps(run(args.quick), indent=2))
+
+
+if __name__ == "__main__":
+    main()
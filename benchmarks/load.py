@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+HTTP load test: concurrent scrapes of /metrics, /health and /info with p50/p99 latency
+and throughput per path.
+
+Without --url a server is started in a child process with the WiFi collector populated
+from a synthetic client table, so the load generator and the server do not share an
+event loop. Usage: python -m benchmarks.load [--clients 1000] [--concurrency 64]
+[--duration 10] [--url http://host:port]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import aiohttp
+
+from .collectors import summarize
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PATHS = ("/metrics", "/health", "/info")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def serve(port: int, clients: int) -> None:
+    """Child process: a PrometheusServer with N synthetic clients' series, until killed"""
+    from asusrouter import AsusData
+
+    from src.collectors.wifi import WiFiCollector
+    from src.config import ExporterConfig
+    from src.metrics.prometheus_metrics import register_collector_families
+    from src.server.server import PrometheusServer
+
+    from . import payloads
+
+    register_collector_families("wifi")
+    collector = WiFiCollector(payloads.StaticSource({AsusData.CLIENTS: payloads.clients(clients)}))
+    await collector.collect()
+
+    config = ExporterConfig(hostname="192.0.2.1", username="admin", password="benchmark", port=port)
+    server = PrometheusServer(config)
+    await server.start_server()
+    await asyncio.Event().wait()
+
+
+async def _worker(
+    session: aiohttp.ClientSession,
+    url: str,
+    deadline: float,
+    latencies: list[float],
+    errors: list[int],
+) -> None:
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            async with session.get(url) as response:
+                await response.read()
+                if response.status >= 400:
+                    errors[0] += 1
+                    continue
+        except (aiohttp.ClientError, TimeoutError):
+            errors[0] += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def load(base_url: str, path: str, concurrency: int, duration: float) -> dict[str, float]:
+    """Hammer one path with N concurrent workers for some seconds"""
+    latencies: list[float] = []
+    errors = [0]
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=30)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(
+            *(
+                _worker(session, base_url + path, deadline, latencies, errors)
+                for _ in range(concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - start
+    result = summarize(latencies) if latencies else {"iterations": 0}
+    result["requests_per_second"] = len(latencies) / elapsed
+    result["errors"] = errors[0]
+    return result
+
+
+def _wait_live(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(f"{base_url}/livez", timeout=1):
+                return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.05)
+    raise TimeoutError(f"{base_url} did not come up within {timeout}s")
+
+
+def run(
+    clients: int = 1000,
+    concurrency: int = 64,
+    duration: float = 10.0,
+    url: str = "",
+) -> dict[str, dict[str, float]]:
+    """Load every path in turn, against url or a freshly started child server"""
+    process = None
+    if not url:
+        port = _free_port()
+        url = f"http://127.0.0.1:{port}"
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.load",
+                "--serve",
+                str(port),
+                "--clients",
+                str(clients),
+            ],
+            cwd=ROOT,
+            env={**os.environ, "PYTHONPATH": str(ROOT)},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    try:
+        _wait_live(url)
+        return {
+            f"http{path}[clients={clients},concurrency={concurrency}]": asyncio.run(
+                load(url, path, concurrency, duration)
+            )
+            for path in PATHS
+        }
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP server load test")
+    parser.add_argument("--clients", type=int, default=1000, help="Synthetic clients to expose")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per path")
+    parser.add_argument("--url", default="", help="Load an already running exporter instead")
+    parser.add_argument("--serve", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        asyncio.run(serve(args.serve, args.clients))
+        return
+    results = run(args.clients, args.concurrency, args.duration, args.url.rstrip("/"))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
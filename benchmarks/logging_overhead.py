@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Collector logging overhead: time and transient allocation per cycle at INFO and DEBUG.
+
+Runs the hardware and system collectors against a large synthetic payload (many AiMesh
+nodes and ports, a many-core CPU) with records sent to a handler that formats them and
+throws the text away. At INFO nothing should be formatted, so INFO and "no logging"
+should match. Usage: python -m benchmarks.logging_overhead [--cycles 200] [--nodes 16]
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import statistics
+import time
+import tracemalloc
+
+from asusrouter import AsusData
+from asusrouter.modules.ports import PortType
+
+from src.collectors.hardware import HardwareCollector
+from src.collectors.system import SystemCollector
+
+from .payloads import StaticSource
+
+
+def build_payloads(nodes: int) -> dict[AsusData, object]:
+    """PORTS for N nodes (8 LAN, 2 WAN, 2 USB each), CPU with 8 cores and temperatures"""
+    ports = {}
+    for node in range(nodes):
+        mac = f"AA:BB:CC:00:00:{node:02X}"
+        ports[mac] = {
+            PortType.LAN: {
+                port: {
+                    "state": port % 3 != 0,
+                    "link_rate": 1000,
+                    "max_rate": 2500,
+                    "capabilities": ["LAN", "GAME"],
+                }
+                for port in range(1, 9)
+            },
+            PortType.WAN: {port: {"state": True, "link_rate": 2500} for port in range(2)},
+            PortType.USB: {port: {"state": False, "link_rate": 0} for port in range(2)},
+        }
+    cpu = {"total": {"total": 100000, "used": 25000, "usage": 25.0}}
+    cpu.update({core: {"total": 12500, "used": 3000, "usage": 24.0} for core in range(1, 9)})
+    return {
+        AsusData.PORTS: ports,
+        AsusData.CPU: cpu,
+        AsusData.RAM: {"used": 300000, "free": 200000, "total": 500000, "usage": 60.0},
+        AsusData.TEMPERATURE: {"cpu": 70.0, "2ghz": 48.0, "5ghz": 52.0, "6ghz": 55.0},
+    }
+
+
+def _set_level(level: int | None) -> None:
+    """Route collector logs to a formatting handler that discards the text"""
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    root = logging.getLogger()
+    root.handlers = [handler]
+    # Above CRITICAL disables every level, the floor any logging layer can reach
+    root.setLevel(level if level is not None else logging.CRITICAL + 10)
+
+
+async def _cycle(collectors) -> None:
+    for collector in collectors:
+        await collector.collect()
+
+
+def measure(level: int | None, nodes: int, cycles: int) -> dict[str, float]:
+    """Fastest cycle time and median transient peak bytes per collection cycle"""
+    _set_level(level)
+    source = StaticSource(build_payloads(nodes))
+    collectors = [HardwareCollector(source), SystemCollector(source)]
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(_cycle(collectors))  # warm up label children
+
+        durations = []
+        for _ in range(cycles):
+            start = time.perf_counter()
+            loop.run_until_complete(_cycle(collectors))
+            durations.append(time.perf_counter() - start)
+
+        peaks = []
+        tracemalloc.start()
+        try:
+            for _ in range(min(cycles, 20)):
+                baseline, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                loop.run_until_complete(_cycle(collectors))
+                peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+        finally:
+            tracemalloc.stop()
+    finally:
+        loop.close()
+    return {
+        "seconds_per_cycle": min(durations),
+        "peak_alloc_bytes_per_cycle": statistics.median(peaks),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collector logging overhead benchmark")
+    parser.add_argument("--cycles", type=int, default=200, help="Collection cycles per level")
+    parser.add_argument("--nodes", type=int, default=16, help="AiMesh nodes in the payload")
+    args = parser.parse_args()
+
+    results = {
+        name: measure(level, args.nodes, args.cycles)
+        for name, level in (("off", None), ("INFO", logging.INFO), ("DEBUG", logging.DEBUG))
+    }
+    print(json.dumps({"nodes": args.nodes, "cycles": args.cycles, "levels": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Synthetic router payloads at configurable scale, shaped like the asusrouter data types"""
+
+import random
+
+from asusrouter import AsusData
+from asusrouter.modules.ports import PortType
+
+
+class StaticSource:
+    """DataSource returning fixed payloads; replace .payloads between cycles to vary them"""
+
+    name = "benchmark"
+
+    def __init__(self, payloads: dict[AsusData, object]):
+        self.payloads = payloads
+
+    def supports(self, data_type: AsusData) -> bool:
+        return data_type in self.payloads
+
+    async def async_connect(self) -> bool:
+        return True
+
+    async def async_disconnect(self) -> bool:
+        return True
+
+    async def async_get_data(self, data_type: AsusData, force: bool = False):  # noqa: ARG002
+        return self.payloads.get(data_type)
+
+
+def _mac(index: int, prefix: int = 0x10) -> str:
+    octets = [prefix, *((index >> shift) & 0xFF for shift in (24, 16, 8, 0)), 0]
+    return ":".join(f"{octet:02X}" for octet in octets)
+
+
+def clients(count: int, cycle: int = 0, churn: float = 0.1, seed: int = 0) -> dict[str, dict]:
+    """
+    A CLIENTS table of N clients spread over wired and the three bands and up to four
+    AiMesh nodes. A churn fraction of the wireless clients gets new RSSI and rates on
+    every cycle, so consecutive cycles exercise the changed-client path.
+    """
+    rng = random.Random(seed)
+    changed_from = int(count * churn * cycle) % max(count, 1)
+    changed_to = changed_from + int(count * churn)
+    table = {}
+    for index in range(count):
+        is_wl = str(index % 4)
+        mac = _mac(index)
+        rssi = -40 - rng.randrange(50)
+        tx = rng.choice((72.2, 144.4, 286.8, 576.5, 866.7, 1201.0, 2401.9))
+        if changed_from <= index < changed_to and is_wl != "0":
+            rssi -= cycle % 7
+            tx = round(tx * (0.5 + (cycle % 5) / 10), 1)
+        table[mac] = {
+            "name": f"client-{index}",
+            "nickName": None,
+            "isWL": is_wl,
+            "isOnline": "1",
+            "rssi": str(rssi) if is_wl != "0" else None,
+            "curTx": str(tx) if is_wl != "0" else None,
+            "curRx": str(round(tx * 0.8, 1)) if is_wl != "0" else None,
+            "internetState": 1,
+            "node": _mac(index % 4, prefix=0xAA) if index % 4 else None,
+        }
+    return table
+
+
+def ports(count: int, nodes: int = 1) -> dict[str, dict]:
+    """PORTS with one WAN and count-1 LAN ports on each of N nodes"""
+    table = {}
+    for node in range(nodes):
+        table[_mac(node, prefix=0xAA)] = {
+            PortType.WAN: {0: {"state": True, "link_rate": 2500, "max_rate": 2500}},
+            PortType.LAN: {
+                port: {
+                    "state": port % 3 != 0,
+                    "link_rate": 1000 if port % 3 else 0,
+                    "max_rate": 2500,
+                    "capabilities": ["LAN", "GAME"] if port == 1 else ["LAN"],
+                }
+                for port in range(1, count)
+            },
+        }
+    return table
+
+
+def vpn(count: int) -> dict[AsusData, object]:
+    """OpenVPN, WireGuard and VPN Fusion payloads with N clients each"""
+    return {
+        AsusData.OPENVPN: {
+            "client": {index: {"state": index % 2} for index in range(1, count + 1)},
+            "server": {1: {"state": 1}, 2: {"state": 0}},
+        },
+        AsusData.WIREGUARD_CLIENT: {index: {"state": index % 2} for index in range(1, count + 1)},
+        AsusData.WIREGUARD_SERVER: {1: {"state": 1}},
+        AsusData.VPNC: {
+            "client_count": count,
+            "clients": {
+                str(index): {"uptime": 3600 * index, "traffic_rx": 1024, "traffic_tx": 512}
+                for index in range(1, count + 1)
+            },
+        },
+    }
+
+
+def nested_info(width: int, depth: int) -> dict[str, object]:
+    """A nested dict like the firmware/sysinfo payloads fed to flatten_for_info_metric"""
+    if depth == 0:
+        return {f"key_{index}": f"value {index}" for index in range(width)}
+    node: dict[str, object] = {f"list_{index}": list(range(5)) for index in range(width // 4)}
+    node.update({f"child_{index}": nested_info(width, depth - 1) for index in range(width // 2)})
+    node["empty"] = None
+    return node
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: cold import time and time until /livez answers.
+
+Runs the exporter against an unreachable router so only the exporter's own startup
+is measured. Usage: python -m benchmarks.startup [--runs 5]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_import(module: str) -> float:
+    """Wall time of a fresh interpreter importing a module"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", f"import {module}"], cwd=ROOT, check=True)
+    return time.perf_counter() - start
+
+
+def measure_time_to_live(timeout: float = 30.0) -> dict[str, float]:
+    """Start the exporter and time how long /livez and /metrics take to answer"""
+    port = _free_port()
+    env = {
+        **os.environ,
+        "ASUS_HOSTNAME": "127.0.0.1",
+        "ASUS_PASSWORD": "benchmark",
+        "EXPORTER_PORT": str(port),
+        "EXPORTER_LOG_LEVEL": "WARNING",
+    }
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "asus_exporter.py"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    result = {}
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/livez", timeout=1):
+                    result["time_to_livez"] = time.perf_counter() - start
+                    break
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+
+        # Startup phases reported by the exporter itself
+        time.sleep(1)
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            for line in response.read().decode().splitlines():
+                if line.startswith("asus_exporter_startup_duration_seconds{"):
+                    phase = line.split('phase="')[1].split('"')[0]
+                    result[f"phase_{phase}"] = float(line.rsplit(" ", 1)[1])
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporter startup benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Repetitions per measurement")
+    args = parser.parse_args()
+
+    imports = {
+        module: statistics.median(measure_import(module) for _ in range(args.runs))
+        for module in ("src.config", "src.main", "src.server")
+    }
+    runs = [measure_time_to_live() for _ in range(args.runs)]
+    live = {key: statistics.median(run[key] for run in runs if key in run) for key in runs[0]}
+
+    print(json.dumps({"import_seconds": imports, "startup_seconds": live}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Run the collector micro-benchmarks and the HTTP load test and compare them against the
+JSON baseline, so regressions show up as a ratio per case.
+
+Usage:
+  python -m benchmarks.suite                    # compare against benchmarks/baseline.json
+  python -m benchmarks.suite --update-baseline  # record the current numbers as the baseline
+  python -m benchmarks.suite --check            # exit 1 if any case regressed
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+from pathlib import Path
+
+from . import collectors, load
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# A case regresses when it is this much slower than the baseline; sub-millisecond cases
+# swing by a third between runs on a busy machine
+DEFAULT_TOLERANCE = 0.5
+
+
+def environment() -> dict[str, str | int]:
+    """Where the numbers were taken; baselines only compare on similar machines"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count() or 0,
+    }
+
+
+def _slowdown(current: dict[str, float], baseline: dict[str, float]) -> float | None:
+    """current / baseline cost: p50 latency, or inverse throughput for load tests"""
+    if "requests_per_second" in current and baseline.get("requests_per_second"):
+        return baseline["requests_per_second"] / max(current["requests_per_second"], 1e-9)
+    if current.get("p50") and baseline.get("p50"):
+        return current["p50"] / baseline["p50"]
+    return None
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+) -> list[str]:
+    """Print one line per case and return the names of regressed cases"""
+    regressed = []
+    for name, current in results.items():
+        ratio = _slowdown(current, baseline[name]) if name in baseline else None
+        if ratio is None:
+            status = "new"
+        elif ratio > 1 + tolerance:
+            status = "REGRESSED"
+            regressed.append(name)
+        elif ratio < 1 - tolerance:
+            status = "improved"
+        else:
+            status = "ok"
+        shown = f"{ratio:6.2f}x" if ratio is not None else "      -"
+        p50 = current.get("p50")
+        detail = f"p50 {p50 * 1e3:10.3f} ms" if p50 is not None else " " * 17
+        if "requests_per_second" in current:
+            detail += f"  {current['requests_per_second']:9.1f} req/s"
+        print(f"{name:60} {detail}  {shown}  {status}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite with a JSON baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the baseline")
+    parser.add_argument("--check", action="store_true", help="Exit 1 on any regression")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--quick", action="store_true", help="Shorter runs, noisier numbers")
+    parser.add_argument("--skip-load", action="store_true", help="Only the micro-benchmarks")
+    parser.add_argument("--output", type=Path, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = collectors.run(quick=args.quick)
+    if not args.skip_load:
+        results.update(load.run(duration=2.0 if args.quick else 10.0))
+
+    report = {"environment": environment(), "results": results}
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    baseline = {}
+    if args.baseline.exists():
+        saved = json.loads(args.baseline.read_text())
+        baseline = saved["results"]
+        if saved.get("environment") != report["environment"]:
+            print("Note: the baseline was recorded on a different environment", file=sys.stderr)
+    regressed = compare(results, baseline, args.tolerance)
+    if regressed and args.check:
+        print(f"{len(regressed)} case(s) regressed beyond {args.tolerance:.0%}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+#!/bin/sh
+# Router-side push agent for Asuswrt-Merlin (e.g. /jffs/scripts/push-agent.sh, started from
+# services-start). Reads /proc directly, which is far cheaper than the httpd endpoints, and
+# pushes interface counters and load averages to the exporter's /api/ingest every second.
+#
+#   EXPORTER_URL=http://192.168.1.10:8000/api/ingest INGEST_KEY=secret /jffs/scripts/push-agent.sh &
+
+EXPORTER_URL="${EXPORTER_URL:?set EXPORTER_URL to http://<exporter>:8000/api/ingest}"
+INGEST_KEY="${INGEST_KEY:?set INGEST_KEY to the exporter's EXPORTER_INGEST_KEY}"
+WAN_IF="${WAN_IF:-$(nvram get wan0_ifname)}"
+INTERVAL="${INTERVAL:-1}"
+
+while true; do
+    {
+        awk -v wan="$WAN_IF" 'NR > 2 {
+            sub(":", " ")
+            printf "net,if=%s%s rx=%s,tx=%s\n", $1, ($1 == wan ? ",role=wan" : ""), $2, $10
+        }' /proc/net/dev
+        awk '{ printf "load 1m=%s,5m=%s,15m=%s\n", $1, $2, $3 }' /proc/loadavg
+    } | curl -s -m 2 -H "Authorization: Bearer $INGEST_KEY" --data-binary @- "$EXPORTER_URL" \
+        >/dev/null
+    sleep "$INTERVAL"
+done
@@ -0,0 +1,243 @@
+"""Direct, parallel polling of AiMesh satellite nodes"""
+
+import asyncio
+import contextlib
+import re
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from asusrouter import AsusData
+
+from ..metrics.prometheus_metrics import (
+    AIMESH_NODE_CLIENTS,
+    AIMESH_NODE_CPU_USAGE,
+    AIMESH_NODE_POLL_DURATION,
+    AIMESH_NODE_PORT_LINK_RATE,
+    AIMESH_NODE_PORT_STATUS,
+    AIMESH_NODE_RAM_USAGE,
+    AIMESH_NODE_TEMPERATURE,
+    AIMESH_NODE_UP,
+    COLLECTION_ERRORS_TOTAL,
+)
+from .base import BaseCollector, DataTypeFilter
+from .clients import CONNECTION_TYPES
+from .hardware import _parse_link_rate
+from .ports import PortStateTracker
+
+if TYPE_CHECKING:
+    from ..sources import DataSource
+
+# Data types fetched from every satellite, in this order
+NODE_DATA_TYPES = (
+    AsusData.CPU,
+    AsusData.RAM,
+    AsusData.TEMPERATURE,
+    AsusData.PORTS,
+    AsusData.CLIENTS,
+)
+
+MAC_PATTERN = re.compile(r"[0-9A-Fa-f]{2}(?::[0-9A-Fa-f]{2}){5}")
+
+
+def _field(device: Any, name: str) -> Any:
+    """Read an AiMeshDevice attribute, or a key when the node is a plain dict"""
+    if isinstance(device, dict):
+        return device.get(name)
+    return getattr(device, name, None)
+
+
+def discover_nodes(aimesh_data: Any) -> dict[str, str]:
+    """Online satellite MAC -> IP from AsusData.AIMESH, leaving out the primary router"""
+    nodes = {}
+    if not isinstance(aimesh_data, dict):
+        return nodes
+    for mac, device in aimesh_data.items():
+        ip = _field(device, "ip")
+        if not ip or _field(device, "type") == "router" or not _field(device, "status"):
+            continue
+        nodes[str(_field(device, "mac") or mac).upper()] = str(ip)
+    return nodes
+
+
+class _Node:
+    """Session state of one satellite"""
+
+    __slots__ = ("connected", "ip", "series", "source")
+
+    def __init__(self, ip: str, source: "DataSource"):
+        self.ip = ip
+        self.source = source
+        self.connected = False
+        # (family, label values) set for this node, removed when it leaves the mesh
+        self.series: set[tuple[Any, tuple[str, ...]]] = set()
+
+
+class AiMeshCollector(BaseCollector):
+    """
+    Discovers satellites from the primary's AiMesh list and polls each one
+    concurrently with its own session, so per-node data no longer goes through the
+    primary's aggregated (and often stale) view. A slow or failing node only affects
+    its own series.
+    """
+
+    name = "aimesh"
+
+    def __init__(self, source: "DataSource", data_filter: DataTypeFilter | None = None):
+        super().__init__(source, data_filter)
+        # Builds a data source for a node IP; set by the manager from the configuration
+        self.node_source_factory: Callable[[str], DataSource] | None = None
+        self.node_timeout = 10.0
+        self.nodes: dict[str, _Node] = {}
+        self.port_states = PortStateTracker()
+
+    def get_data_types(self) -> list[AsusData]:
+        return [AsusData.AIMESH, *NODE_DATA_TYPES]
+
+    async def collect(self) -> dict[str, Any]:
+        """Poll every online satellite in parallel"""
+        metrics = {}
+        if self.node_source_factory is None:
+            return metrics
+
+        discovered = discover_nodes(await self._get_data(AsusData.AIMESH))
+        for mac in set(self.nodes) - set(discovered):
+            await self._drop_node(mac)
+
+        macs = sorted(discovered)
+        results = await asyncio.gather(
+            *(self._poll_node(mac, discovered[mac]) for mac in macs), return_exceptions=True
+        )
+        for mac, result in zip(macs, results, strict=True):
+            if isinstance(result, dict):
+                metrics.update(result)
+            else:
+                self.logger.debug(f"AiMesh node {mac} poll failed: {result}")
+        metrics["aimesh_nodes_polled"] = len(macs)
+        return metrics
+
+    async def close(self) -> None:
+        """Close every node session"""
+        for mac in list(self.nodes):
+            await self._drop_node(mac)
+
+    async def _drop_node(self, mac: str) -> None:
+        node = self.nodes.pop(mac, None)
+        if node is None:
+            return
+        for family, labels in node.series:
+            with contextlib.suppress(KeyError):
+                family.remove(*labels)
+        if node.connected:
+            try:
+                await node.source.async_disconnect()
+            except Exception as e:
+                self.logger.debug(f"Error disconnecting AiMesh node {mac}: {e}")
+
+    async def _poll_node(self, mac: str, ip: str) -> dict[str, Any]:
+        """Fetch the node data types from one satellite; errors stay local to the node"""
+        node = self.nodes.get(mac)
+        if node is None or node.ip != ip:
+            await self._drop_node(mac)
+            node = self.nodes[mac] = _Node(ip, self.node_source_factory(ip))
+
+        metrics = {}
+        start = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.node_timeout):
+                if not node.connected:
+                    await node.source.async_connect()
+                    node.connected = True
+                for data_type in NODE_DATA_TYPES:
+                    if self.data_filter.is_enabled(data_type):
+                        await self._poll_data_type(node, mac, data_type, metrics)
+            self._set(node, AIMESH_NODE_UP, (mac,), 1)
+        except Exception as e:
+            # Log in again on the next cycle; the node's own session may have expired
+            node.connected = False
+            self._set(node, AIMESH_NODE_UP, (mac,), 0)
+            COLLECTION_ERRORS_TOTAL.labels(error_type="aimesh_node").inc()
+            self.logger.warning(f"AiMesh node {mac} ({ip}) poll failed: {e!r}")
+        finally:
+            self._set(node, AIMESH_NODE_POLL_DURATION, (mac,), time.perf_counter() - start)
+        return metrics
+
+    async def _poll_data_type(
+        self, node: _Node, mac: str, data_type: AsusData, metrics: dict[str, Any]
+    ) -> None:
+        """One data type of one node; a model lacking it does not mark the node down"""
+        try:
+            data = await node.source.async_get_data(data_type)
+            if data:
+                getattr(self, f"_apply_{data_type.value}")(node, mac, data, metrics)
+        except (TimeoutError, ConnectionError):
+            raise
+        except Exception as e:
+            self.logger.debug(f"AiMesh node {mac}: failed to collect {data_type.value}: {e}")
+            COLLECTION_ERRORS_TOTAL.labels(error_type="aimesh_node").inc()
+
+    @staticmethod
+    def _set(node: _Node, family: Any, labels: tuple[str, ...], value: float) -> None:
+        family.labels(*labels).set(value)
+        node.series.add((family, labels))
+
+    def _apply_cpu(self, node: _Node, mac: str, data: Any, metrics: dict[str, Any]) -> None:
+        total = data.get("total") if isinstance(data, dict) else None
+        if isinstance(total, dict) and total.get("usage") is not None:
+            usage = max(float(total["usage"]), 0.0)
+            self._set(node, AIMESH_NODE_CPU_USAGE, (mac,), usage)
+            metrics[f"aimesh_node_{mac}_cpu_usage"] = usage
+
+    def _apply_ram(self, node: _Node, mac: str, data: Any, metrics: dict[str, Any]) -> None:
+        if isinstance(data, dict) and data.get("usage") is not None:
+            usage = float(data["usage"])
+            self._set(node, AIMESH_NODE_RAM_USAGE, (mac,), usage)
+            metrics[f"aimesh_node_{mac}_ram_usage"] = usage
+
+    def _apply_temperature(self, node: _Node, mac: str, data: Any, metrics: dict[str, Any]) -> None:
+        for sensor, temp in data.items():
+            if isinstance(temp, (int, float)):
+                self._set(node, AIMESH_NODE_TEMPERATURE, (mac, str(sensor)), float(temp))
+                metrics[f"aimesh_node_{mac}_temperature_{sensor}"] = temp
+
+    def _apply_ports(self, node: _Node, mac: str, data: Any, metrics: dict[str, Any]) -> None:
+        """A node reports its own ports, either flat or keyed by its MAC (newer firmware)"""
+        by_node = {str(k).upper(): v for k, v in data.items() if MAC_PATTERN.fullmatch(str(k))}
+        if by_node:
+            data = by_node.get(mac) or (next(iter(by_node.values())) if len(by_node) == 1 else {})
+        for port_type, ports in data.items():
+            if not isinstance(ports, dict):
+                continue
+            type_name = str(port_type.value if hasattr(port_type, "value") else port_type).lower()
+            for port_id, info in ports.items():
+                if not isinstance(info, dict):
+                    continue
+                port_name = str(port_id.value if hasattr(port_id, "value") else port_id).lower()
+                labels = (mac, type_name, port_name)
+                up = bool(info["state"]) if "state" in info else None
+                rate = _parse_link_rate(info["link_rate"]) if "link_rate" in info else None
+                if up is not None:
+                    self._set(node, AIMESH_NODE_PORT_STATUS, labels, 1 if up else 0)
+                    metrics[f"aimesh_node_{mac}_port_{type_name}_{port_name}_status"] = int(up)
+                if rate is not None:
+                    self._set(node, AIMESH_NODE_PORT_LINK_RATE, labels, float(rate))
+                self.port_states.observe(
+                    mac, type_name, port_name, up, float(rate) if rate is not None else None
+                )
+
+    def _apply_clients(self, node: _Node, mac: str, data: Any, metrics: dict[str, Any]) -> None:
+        """Count online clients the node attributes to itself (all of them if untagged)"""
+        counts = dict.fromkeys((t for t, _ in CONNECTION_TYPES.values()), 0)
+        for client in data.values():
+            if not isinstance(client, dict) or str(client.get("isOnline")) != "1":
+                continue
+            client_node = client.get("node")
+            if client_node and str(client_node).upper() != mac:
+                continue
+            is_wl = client.get("isWL")
+            code = str(is_wl.value if hasattr(is_wl, "value") else is_wl)
+            connection_type = CONNECTION_TYPES.get(code, ("unknown", None))[0]
+            counts[connection_type] = counts.get(connection_type, 0) + 1
+        for connection_type, count in counts.items():
+            self._set(node, AIMESH_NODE_CLIENTS, (mac, connection_type), count)
+        metrics[f"aimesh_node_{mac}_clients"] = sum(counts.values())
@@ -2,21 +2,62 @@
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from asusrouter import AsusData, AsusRouter
+from asusrouter import AsusData
 from asusrouter.config import ARConfig, ARConfigKey
 from asusrouter.tools.security import ARSecurityLevel
 
+from ..log import EventLogger
+from .pool import ParsePool
+from .tracing import TRACER
+
+if TYPE_CHECKING:
+    from ..sources import DataSource
+
 logger = logging.getLogger(__name__)
 
 
+class DataTypeFilter:
+    """Allow/deny rules for AsusData types, shared by every collector of a manager"""
+
+    def __init__(self, allowed: list[str] | None = None, denied: list[str] | None = None):
+        self.allowed = {name.lower() for name in allowed or []}
+        self.denied = {name.lower() for name in denied or []}
+        # Filled by capability probing, kept apart so operators can override it
+        self.unsupported: set[str] = set()
+
+    def is_enabled(self, data_type: AsusData) -> bool:
+        """Whether a data type may be fetched from the router"""
+        if data_type.value in self.denied or data_type.value in self.unsupported:
+            return False
+        return not self.allowed or data_type.value in self.allowed
+
+    def set_enabled(self, data_type: AsusData, enabled: bool) -> None:
+        """Toggle a data type at runtime"""
+        if enabled:
+            self.denied.discard(data_type.value)
+            self.unsupported.discard(data_type.value)
+            if self.allowed:
+                self.allowed.add(data_type.value)
+        else:
+            self.denied.add(data_type.value)
+
+
 class BaseCollector(ABC):
     """Base class for all metric collectors"""
 
-    def __init__(self, router: AsusRouter):
-        self.router = router
+    # Collector name used in configuration and the admin API
+    name = "base"
+
+    def __init__(self, source: "DataSource", data_filter: DataTypeFilter | None = None):
+        self.source = source
+        self.data_filter = data_filter or DataTypeFilter()
         self.logger = logging.getLogger(self.__class__.__name__)
+        # Per-item events in collection loops go through here so disabled levels cost nothing
+        self.log = EventLogger(self.logger)
+        # Inline until the manager hands out a shared pool (EXPORTER_PARSE_WORKERS)
+        self.parser = ParsePool()
         # Initialize secure configuration for debug payload (v1.19.0+)
         self._setup_secure_config()
 
@@ -30,6 +71,17 @@ class BaseCollector(ABC):
         except Exception as e:
             logger.debug(f"Could not set secure configuration: {e}")
 
+    async def _get_data(self, data_type: AsusData, force: bool = False) -> Any:
+        """Fetch a data type from the data source, skipping the request entirely if it is disabled"""
+        if not self.data_filter.is_enabled(data_type):
+            return None
+        with TRACER.span(data_type.value, "fetch", self.name):
+            return await self.source.async_get_data(data_type, force=force)
+
+    def get_enabled_data_types(self) -> list[AsusData]:
+        """Data types this collector handles that are currently enabled"""
+        return [dt for dt in self.get_data_types() if self.data_filter.is_enabled(dt)]
+
     @abstractmethod
     async def collect(self) -> dict[str, Any]:
         """Collect metrics and return as dict"""
@@ -0,0 +1,150 @@
+"""Per-model capability probing to skip data types a router does not support"""
+
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from asusrouter import AsusData
+from asusrouter.error import AsusRouter404Error, AsusRouterNotImplementedError
+
+from ..metrics.prometheus_metrics import CAPABILITY_SUPPORTED
+
+if TYPE_CHECKING:
+    from ..sources import DataSource
+
+logger = logging.getLogger(__name__)
+
+# Fetched on every probe to identify the model and firmware, never pruned
+IDENTITY_DATA_TYPES = (AsusData.DEVICEMAP, AsusData.FIRMWARE)
+
+# Hardware-dependent types: asusrouter answers {} when the model has no such feature
+MODEL_GATED_DATA_TYPES = {AsusData.AURA, AsusData.DSL, AsusData.LED, AsusData.SPEEDTEST_RESULT}
+
+# Errors that definitively mean "not supported"; the sources raise ValueError for data
+# types they do not provide. Anything else (timeouts, overload) is retried next start.
+UNSUPPORTED_ERRORS = (AsusRouter404Error, AsusRouterNotImplementedError, ValueError)
+
+
+class CapabilityProbe:
+    """
+    Works out once which AsusData types a router supports and caches the answer on
+    disk per model. The cache entry is reused until the firmware version changes; trial
+    fetches that failed for another reason are left out of it and probed again.
+    """
+
+    def __init__(self, source: "DataSource", cache_path: str):
+        self.source = source
+        self.cache_path = Path(cache_path)
+        self.model: str | None = None
+        self.firmware: str | None = None
+        self.unsupported: set[str] = set()
+        self.probed = False
+        self._force = False
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def probe(self, data_types: list[AsusData]) -> set[str]:
+        """Return the values of unsupported data types, probing only what is not cached"""
+        device = await self._fetch(AsusData.DEVICEMAP)
+        firmware = await self._fetch(AsusData.FIRMWARE)
+
+        self.model = str(device.get("model", "unknown")) if device else "unknown"
+        self.firmware = str(firmware.get("current", "unknown")) if firmware else "unknown"
+
+        cache = self._load_cache()
+        entry = cache.get(self.model)
+        if not entry or entry.get("firmware") != self.firmware or self._force:
+            entry = {"firmware": self.firmware, "supported": [], "unsupported": []}
+
+        known = set(entry["supported"]) | set(entry["unsupported"])
+        to_probe = [
+            dt for dt in data_types if dt not in IDENTITY_DATA_TYPES and dt.value not in known
+        ]
+        if to_probe:
+            self.logger.info(
+                f"Probing {len(to_probe)} data types on {self.model} (firmware {self.firmware})"
+            )
+            results = await asyncio.gather(*(self._is_supported(dt) for dt in to_probe))
+            unknown = []
+            for data_type, supported in zip(to_probe, results, strict=True):
+                if supported is None:
+                    unknown.append(data_type.value)
+                else:
+                    entry["supported" if supported else "unsupported"].append(data_type.value)
+            if unknown:
+                self.logger.warning(
+                    f"Could not probe {', '.join(unknown)}, keeping them and retrying next start"
+                )
+
+            entry["supported"] = sorted(set(entry["supported"]))
+            entry["unsupported"] = sorted(set(entry["unsupported"]))
+            entry.pop("flags", None)
+            entry["probed_at"] = time.time()
+            cache[self.model] = entry
+            self._save_cache(cache)
+        else:
+            self.logger.info(f"Using cached capabilities for {self.model} ({self.firmware})")
+
+        for value in entry["supported"]:
+            CAPABILITY_SUPPORTED.labels(data_type=value).set(1)
+        for value in entry["unsupported"]:
+            CAPABILITY_SUPPORTED.labels(data_type=value).set(0)
+
+        self.unsupported = set(entry["unsupported"])
+        self.probed = True
+        self._force = False
+        if self.unsupported:
+            self.logger.info(
+                f"Skipping unsupported data types: {', '.join(sorted(self.unsupported))}"
+            )
+        return self.unsupported
+
+    def check_firmware(self, current: Any) -> None:
+        """Schedule a fresh probe when the running firmware differs from the probed one"""
+        if current is None or self.firmware is None or str(current) == self.firmware:
+            return
+        self.logger.info(f"Firmware changed from {self.firmware} to {current}, re-probing")
+        self.probed = False
+        self._force = True
+
+    async def _fetch(self, data_type: AsusData) -> Any:
+        try:
+            return await self.source.async_get_data(data_type)
+        except Exception as e:
+            self.logger.debug(f"Probe fetch of {data_type.value} failed: {e}")
+            return None
+
+    async def _is_supported(self, data_type: AsusData) -> bool | None:
+        """
+        Trial fetch: unsupported on an empty answer for gated types or a not-found or
+        not-provided error, None when the attempt failed for any other reason
+        """
+        try:
+            data = await self.source.async_get_data(data_type)
+        except UNSUPPORTED_ERRORS as e:
+            self.logger.debug(f"{data_type.value} not supported: {e}")
+            return False
+        except Exception as e:
+            self.logger.debug(f"Probe of {data_type.value} failed: {e}")
+            return None
+        return bool(data) or data_type not in MODEL_GATED_DATA_TYPES
+
+    def _load_cache(self) -> dict[str, Any]:
+        try:
+            return json.loads(self.cache_path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable capability cache {self.cache_path}: {e}")
+            return {}
+
+    def _save_cache(self, cache: dict[str, Any]) -> None:
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(cache, indent=2, sort_keys=True))
+            tmp_path.replace(self.cache_path)
+        except OSError as e:
+            self.logger.warning(f"Could not write capability cache {self.cache_path}: {e}")
@@ -0,0 +1,284 @@
+"""Persistent client table diffed against each CLIENTS payload"""
+
+import logging
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# isWL code -> (connection_type label, band label)
+CONNECTION_TYPES = {
+    "0": ("wired", "wired"),
+    "1": ("wifi_2g", "2g"),
+    "2": ("wifi_5g", "5g"),
+    "3": ("wifi_6g", "6g"),
+}
+
+# Raw payload keys compared between cycles; a record is only reparsed when one differs
+RAW_FIELDS = (
+    "name",
+    "nickName",
+    "isWL",
+    "isOnline",
+    "rssi",
+    "curTx",
+    "curRx",
+    "internetState",
+    "node",
+)
+
+NAME_MAX_LENGTH = 50
+
+# Stands in for a raw field overridden by a pushed event; never equal to a router value
+_OVERRIDDEN = object()
+
+
+def _float_or_none(value: Any) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _int_or_none(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _full_name(name: Any, nick_name: Any) -> str:
+    value = name if name is not None else nick_name
+    return str(value if value is not None else "Unknown")
+
+
+def _parse_name(name: Any, nick_name: Any) -> str:
+    return _full_name(name, nick_name)[:NAME_MAX_LENGTH]
+
+
+def _parse_connection(is_wl: Any) -> tuple[str, str | None]:
+    code = str(is_wl.value if hasattr(is_wl, "value") else is_wl)
+    return CONNECTION_TYPES.get(code, ("unknown", None))
+
+
+def parse_client(raw: tuple) -> tuple:
+    """
+    Every attribute of one client from its raw fields: name, connection type, band,
+    online, RSSI, TX rate, RX rate, internet state and node
+    """
+    name, nick_name, is_wl, is_online, rssi, cur_tx, cur_rx, internet_state, node = raw
+    return (
+        _parse_name(name, nick_name),
+        *_parse_connection(is_wl),
+        str(is_online) == "1",
+        _float_or_none(rssi),
+        _float_or_none(cur_tx),
+        _float_or_none(cur_rx),
+        _int_or_none(internet_state),
+        str(node or "main"),
+    )
+
+
+def parse_client_rows(rows: list[tuple[str, tuple]]) -> list[tuple]:
+    """parse_client for each (mac, raw) row; runs in a parse worker for large tables"""
+    return [parse_client(raw) for _, raw in rows]
+
+
+def client_rows(clients: dict[str, Any]) -> Iterator[tuple[str, tuple]]:
+    """(mac, raw fields) of each client in a CLIENTS payload"""
+    return (
+        (str(mac), tuple(info.get(key) for key in RAW_FIELDS))
+        for mac, info in clients.items()
+        if isinstance(info, dict)
+    )
+
+
+class ClientRecord:
+    """Parsed state of one client, updated field by field as the payload changes"""
+
+    __slots__ = (
+        "band",
+        "connection_type",
+        "first_seen",
+        "internet_state",
+        "last_seen",
+        "mac",
+        "name",
+        "node",
+        "online",
+        "raw",
+        "rssi",
+        "rx_rate",
+        "tx_rate",
+        "vendor",
+    )
+
+    def __init__(self, mac: str, now: float):
+        self.mac = mac
+        self.name = "Unknown"
+        self.connection_type = "unknown"
+        self.band: str | None = None
+        self.node = "main"
+        self.online = False
+        self.rssi: float | None = None
+        self.tx_rate: float | None = None
+        self.rx_rate: float | None = None
+        self.internet_state: int | None = None
+        self.first_seen = now
+        self.last_seen = now
+        self.raw: tuple = (None,) * len(RAW_FIELDS)
+        # OUI vendor, looked up once per MAC when vendor enrichment is enabled
+        self.vendor: str | None = None
+
+    @property
+    def is_wireless(self) -> bool:
+        return self.band not in (None, "wired")
+
+    @property
+    def full_name(self) -> str:
+        """Name as reported, before truncation to NAME_MAX_LENGTH for the labels"""
+        return _full_name(self.raw[0], self.raw[1])
+
+    def labels(self) -> tuple[str, str, str]:
+        """Identity labels used by the per-client gauges"""
+        return self.mac, self.name, self.connection_type
+
+    def set_online(self, online: bool) -> None:
+        """Apply a pushed online state; the next CLIENTS payload reports isOnline again"""
+        self.online = online
+        raw = list(self.raw)
+        raw[3] = _OVERRIDDEN
+        self.raw = tuple(raw)
+
+    def apply(self, raw: tuple, parsed: tuple | None = None) -> set[str]:
+        """
+        Take over the raw fields that changed and return the changed attribute names.
+        Changed fields are parsed here unless parse_client already did it in a worker.
+        """
+        previous = self.raw
+        self.raw = raw
+        name, nick_name, is_wl, is_online, rssi, cur_tx, cur_rx, internet_state, node = raw
+        changed = set()
+
+        if name != previous[0] or nick_name != previous[1]:
+            self.name = parsed[0] if parsed else _parse_name(name, nick_name)
+            changed.add("name")
+        if is_wl != previous[2]:
+            self.connection_type, self.band = parsed[1:3] if parsed else _parse_connection(is_wl)
+            changed.add("connection_type")
+        if is_online != previous[3]:
+            self.online = parsed[3] if parsed else str(is_online) == "1"
+            changed.add("online")
+        if rssi != previous[4]:
+            self.rssi = parsed[4] if parsed else _float_or_none(rssi)
+            changed.add("rssi")
+        if cur_tx != previous[5]:
+            self.tx_rate = parsed[5] if parsed else _float_or_none(cur_tx)
+            changed.add("tx_rate")
+        if cur_rx != previous[6]:
+            self.rx_rate = parsed[6] if parsed else _float_or_none(cur_rx)
+            changed.add("rx_rate")
+        if internet_state != previous[7]:
+            self.internet_state = parsed[7] if parsed else _int_or_none(internet_state)
+            changed.add("internet_state")
+        if node != previous[8]:
+            self.node = parsed[8] if parsed else str(node or "main")
+            changed.add("node")
+        return changed
+
+
+class ClientDiff:
+    """Outcome of applying one CLIENTS payload to the store"""
+
+    __slots__ = ("added", "changed", "removed")
+
+    def __init__(self):
+        self.added: list[ClientRecord] = []
+        # (record, changed attributes, labels before the change)
+        self.changed: list[tuple[ClientRecord, set[str], tuple[str, str, str]]] = []
+        self.removed: list[ClientRecord] = []
+
+
+class ClientStore:
+    """
+    Client records keyed by MAC. Payloads are diffed against the stored raw values so
+    unchanged clients cost one tuple comparison per cycle. Clients missing from the
+    payload are kept (with their last_seen time) for max_idle seconds.
+    """
+
+    def __init__(self, max_idle: float = 86400.0):
+        self.max_idle = max_idle
+        self.records: dict[str, ClientRecord] = {}
+        self.present: set[str] = set()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def __len__(self) -> int:
+        return len(self.present)
+
+    def __iter__(self) -> Iterator[ClientRecord]:
+        """Iterate over the clients present in the latest payload"""
+        records = self.records
+        return (records[mac] for mac in self.present)
+
+    def get(self, mac: str) -> ClientRecord | None:
+        return self.records.get(mac)
+
+    def pending(self, rows: list[tuple[str, tuple]]) -> list[tuple[str, tuple]]:
+        """Rows that need parsing: new or returning clients and changed raw fields"""
+        records, present = self.records, self.present
+        return [
+            (mac, raw)
+            for mac, raw in rows
+            if mac not in present or (record := records.get(mac)) is None or record.raw != raw
+        ]
+
+    def update(self, clients: dict[str, Any], now: float | None = None) -> ClientDiff:
+        """Apply a CLIENTS payload and report which clients were added, changed or removed"""
+        return self.apply_rows(client_rows(clients), now)
+
+    def apply_rows(
+        self,
+        rows: Iterable[tuple[str, tuple]],
+        now: float | None = None,
+        parsed: dict[str, tuple] | None = None,
+    ) -> ClientDiff:
+        """Apply (mac, raw) rows, taking parse_client results from parsed where given"""
+        now = time.time() if now is None else now
+        parsed = parsed or {}
+        diff = ClientDiff()
+        present = set()
+
+        for mac, raw in rows:
+            present.add(mac)
+
+            record = self.records.get(mac)
+            if record is None:
+                record = self.records[mac] = ClientRecord(mac, now)
+                record.apply(raw, parsed.get(mac))
+                diff.added.append(record)
+            elif mac not in self.present:
+                # Returning client: its series were removed when it vanished, republish all
+                record.apply(raw, parsed.get(mac))
+                diff.added.append(record)
+            elif record.raw != raw:
+                old_labels = record.labels()
+                diff.changed.append((record, record.apply(raw, parsed.get(mac)), old_labels))
+            record.last_seen = now
+
+        for mac in self.present - present:
+            diff.removed.append(self.records[mac])
+        self.present = present
+
+        if self.max_idle:
+            expired = [
+                mac
+                for mac, record in self.records.items()
+                if mac not in present and now - record.last_seen > self.max_idle
+            ]
+            for mac in expired:
+                del self.records[mac]
+
+        return diff
@@ -21,6 +21,8 @@ from .base import BaseCollector
 class FirmwareCollector(BaseCollector):
     """Collects firmware and system information"""
 
+    name = "firmware"
+
     def get_data_types(self) -> list[AsusData]:
         return [
             AsusData.FIRMWARE,
@@ -56,7 +58,7 @@ class FirmwareCollector(BaseCollector):
 
     async def _collect_firmware_metrics(self, metrics: dict[str, Any]):
         """Collect firmware metrics"""
-        firmware_data = await self.router.async_get_data(AsusData.FIRMWARE)
+        firmware_data = await self._get_data(AsusData.FIRMWARE)
         if firmware_data:
             # Firmware info
             if "current" in firmware_data:
@@ -85,7 +87,7 @@ class FirmwareCollector(BaseCollector):
 
         # Firmware release notes
         try:
-            firmware_notes = await self.router.async_get_data(AsusData.FIRMWARE_NOTE)
+            firmware_notes = await self._get_data(AsusData.FIRMWARE_NOTE)
             if firmware_notes:
                 flattened_notes = self.flatten_for_info_metric(firmware_notes)
                 FIRMWARE_RELEASE_NOTES.info(flattened_notes)
@@ -96,7 +98,7 @@ class FirmwareCollector(BaseCollector):
     async def _collect_device_info(self, metrics: dict[str, Any]):
         """Collect device information"""
         try:
-            device_data = await self.router.async_get_data(AsusData.DEVICEMAP)
+            device_data = await self._get_data(AsusData.DEVICEMAP)
             if device_data:
                 router_info = {
                     "model": str(device_data.get("model", "unknown")),
@@ -120,7 +122,7 @@ class FirmwareCollector(BaseCollector):
 
         # Boot time
         try:
-            boot_data = await self.router.async_get_data(AsusData.BOOTTIME)
+            boot_data = await self._get_data(AsusData.BOOTTIME)
             if boot_data and "timestamp" in boot_data:
                 BOOTTIME.set(boot_data["timestamp"])
                 metrics["boot_timestamp"] = boot_data["timestamp"]
@@ -131,7 +133,7 @@ class FirmwareCollector(BaseCollector):
     async def _collect_system_flags(self, metrics: dict[str, Any]):
         """Collect system flags and capabilities"""
         try:
-            flags_data = await self.router.async_get_data(AsusData.FLAGS)
+            flags_data = await self._get_data(AsusData.FLAGS)
             if flags_data:
                 flattened_flags = self.flatten_for_info_metric(flags_data)
                 SYSTEM_FLAGS.info(flattened_flags)
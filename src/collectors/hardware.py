@@ -1,6 +1,6 @@
 """Hardware metrics collector (Ports, Temperature, etc.)"""
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from asusrouter import AsusData
 
@@ -13,45 +13,128 @@ from ..metrics.prometheus_metrics import (
     PORT_STATUS,
     TEMPERATURE,
 )
-from .base import BaseCollector
+from .base import BaseCollector, DataTypeFilter
+from .ports import PortStateTracker
+
+if TYPE_CHECKING:
+    from ..sources import DataSource
+
+# Link rate names used by asusrouter when the value is not an enum
+LINK_RATES = {
+    "LINK_10": 10,
+    "LINK_100": 100,
+    "LINK_1000": 1000,
+    "LINK_2500": 2500,
+    "LINK_5000": 5000,
+    "LINK_10000": 10000,
+    "LINK_DOWN": 0,
+}
+
+
+def _parse_link_rate(rate: Any) -> Any:
+    """Link rate in Mbps from an enum, a LINK_* name or a number"""
+    if hasattr(rate, "value"):
+        return rate.value
+    if isinstance(rate, str):
+        return LINK_RATES.get(rate, 0)
+    return rate
+
+
+def _normalize_port_id(port_id: Any, port_type: str) -> str:
+    """Normalize port ID to a safe string format.
+
+    Handles enums, integers, and other types that might come from asusrouter.
+    """
+    # If it's an enum, try to get the name first
+    if hasattr(port_id, "name"):
+        return str(port_id.name).lower()
+
+    # If it has a value attribute (Enum), use that
+    port_value = port_id.value if hasattr(port_id, "value") else port_id
+
+    # Convert to string and remove any special characters
+    port_str = str(port_value)
+
+    # Map common port type patterns
+    if port_type.lower() == "lan":
+        # For LAN ports, try to extract just the number
+        if isinstance(port_value, int):
+            return str(port_value)
+        # Remove non-alphanumeric except underscore and dash
+        return "".join(c for c in port_str if c.isalnum() or c in "_-").lower()
+    elif port_type.lower() == "wan":
+        return "wan"
+    elif port_type.lower() == "usb":
+        return "usb"
+    else:
+        # Generic cleanup
+        return "".join(c for c in port_str if c.isalnum() or c in "_-").lower()
+
+
+def port_items(ports_data: dict[Any, Any]) -> list[tuple[str, str, Any, dict[str, Any]]]:
+    """(node MAC, port type, port ID, port info) of every port in a PORTS payload"""
+    items = []
+    for node_or_type, ports_info in ports_data.items():
+        if not isinstance(ports_info, dict):
+            continue
+        # Handle both formats: node-based and direct port type
+        if all(
+            isinstance(v, dict) and any(isinstance(vv, dict) for vv in v.values())
+            for v in ports_info.values()
+        ):
+            # Node-based format
+            groups = [
+                (str(node_or_type), str(port_type), ports)
+                for port_type, ports in ports_info.items()
+                if isinstance(ports, dict)
+            ]
+        else:
+            # Direct port type format
+            groups = [("main", str(node_or_type), ports_info)]
+        for node_mac, port_type, ports in groups:
+            items.extend(
+                (node_mac, port_type, port_id, port_info)
+                for port_id, port_info in ports.items()
+                if isinstance(port_info, dict)
+            )
+    return items
+
+
+def parse_port_rows(items: list[tuple[str, str, Any, dict[str, Any]]]) -> list[tuple]:
+    """
+    Normalized port ID, link up, link rate, max rate and capability names per port_items
+    entry (None where the router did not report a field); runs in a parse worker for
+    large tables
+    """
+    rows = []
+    for _, port_type, port_id, port_info in items:
+        capabilities = port_info.get("capabilities")
+        rows.append(
+            (
+                _normalize_port_id(port_id, port_type),
+                bool(port_info["state"]) if "state" in port_info else None,
+                _parse_link_rate(port_info["link_rate"]) if "link_rate" in port_info else None,
+                _parse_link_rate(port_info["max_rate"]) if "max_rate" in port_info else None,
+                [c.name if hasattr(c, "name") else str(c) for c in capabilities]
+                if isinstance(capabilities, list)
+                else None,
+            )
+        )
+    return rows
 
 
 class HardwareCollector(BaseCollector):
     """Collects hardware-related metrics"""
 
+    name = "hardware"
+
+    def __init__(self, source: "DataSource", data_filter: DataTypeFilter | None = None):
+        super().__init__(source, data_filter)
+        self.port_states = PortStateTracker()
+
     def get_data_types(self) -> list[AsusData]:
         return [AsusData.PORTS, AsusData.TEMPERATURE, AsusData.NODE_INFO]
 
-    def _normalize_port_id(self, port_id: Any, port_type: str) -> str:
-        """Normalize port ID to a safe string format.
-
-        Handles enums, integers, and other types that might come from asusrouter.
-        """
-        # If it's an enum, try to get the name first
-        if hasattr(port_id, "name"):
-            return str(port_id.name).lower()
-
-        # If it has a value attribute (Enum), use that
-        port_value = port_id.value if hasattr(port_id, "value") else port_id
-
-        # Convert to string and remove any special characters
-        port_str = str(port_value)
-
-        # Map common port type patterns
-        if port_type.lower() == "lan":
-            # For LAN ports, try to extract just the number
-            if isinstance(port_value, int):
-                return str(port_value)
-            # Remove non-alphanumeric except underscore and dash
-            return "".join(c for c in port_str if c.isalnum() or c in "_-").lower()
-        elif port_type.lower() == "wan":
-            return "wan"
-        elif port_type.lower() == "usb":
-            return "usb"
-        else:
-            # Generic cleanup
-            return "".join(c for c in port_str if c.isalnum() or c in "_-").lower()
-
     async def collect(self) -> dict[str, Any]:
         """Collect hardware metrics"""
         metrics = {}
@@ -76,120 +159,87 @@ class HardwareCollector(BaseCollector):
 
         return metrics
 
-    async def _collect_port_metrics(self, metrics: dict[str, Any]):
+    async def poll_ports(self) -> None:
+        """Fast path between cycles: refresh PORTS alone, bypassing the asusrouter cache"""
+        try:
+            await self._collect_port_metrics({}, force=True)
+        except Exception as e:
+            self.logger.debug(f"Failed to poll port data: {e}")
+            COLLECTION_ERRORS_TOTAL.labels(error_type="ports").inc()
+
+    async def _collect_port_metrics(self, metrics: dict[str, Any], force: bool = False):
         """Collect port status metrics"""
-        ports_data = await self.router.async_get_data(AsusData.PORTS)
+        ports_data = await self._get_data(AsusData.PORTS, force=force)
         if ports_data:
-            self.logger.debug(f"Raw ports_data structure: {ports_data}")
-            for node_or_type, ports_info in ports_data.items():
-                if isinstance(ports_info, dict):
-                    # Handle both formats: node-based and direct port type
-                    if all(
-                        isinstance(v, dict) and any(isinstance(vv, dict) for vv in v.values())
-                        for v in ports_info.values()
-                    ):
-                        # Node-based format
-                        node_mac = str(node_or_type)
-                        for port_type, ports in ports_info.items():
-                            if isinstance(ports, dict):
-                                await self._process_port_data(
-                                    ports, str(port_type), node_mac, metrics
-                                )
-                    else:
-                        # Direct port type format
-                        await self._process_port_data(
-                            ports_info, str(node_or_type), "main", metrics
-                        )
+            self.log.debug("ports_raw", data=ports_data)
+            items = port_items(ports_data)
+            rows = await self.parser.map(parse_port_rows, items)
+            for item, row in zip(items, rows, strict=True):
+                self._publish_port(item, row, metrics)
 
             self.logger.debug("Collected port metrics")
 
-    async def _process_port_data(
+    def _publish_port(
         self,
-        ports: dict[str, Any],
-        port_type_name: str,
-        node_mac: str,
+        item: tuple[str, str, Any, dict[str, Any]],
+        row: tuple,
         metrics: dict[str, Any],
     ):
-        """Process port data for a specific type and node"""
-        for port_id, port_info in ports.items():
-            if isinstance(port_info, dict):
-                # Convert port_id properly - handle enums and integers
-                port_id_str = self._normalize_port_id(port_id, port_type_name)
-                self.logger.debug(
-                    f"Port processing: port_id={port_id} (type={type(port_id).__name__}), port_type={port_type_name}, normalized={port_id_str}, port_info={port_info}"
-                )
-                metric_key = f"port_{node_mac}_{port_type_name}_{port_id_str}"
-
-                # Port status
-                if "state" in port_info:
-                    state_value = 1 if port_info["state"] else 0
-                    PORT_STATUS.labels(port_type=port_type_name, port_id=port_id_str).set(
-                        state_value
-                    )
-                    metrics[f"{metric_key}_status"] = state_value
-
-                # Link rate
-                if "link_rate" in port_info:
-                    link_rate = port_info["link_rate"]
-                    if hasattr(link_rate, "value"):
-                        link_rate = link_rate.value
-                    elif isinstance(link_rate, str):
-                        # Parse common link rate strings
-                        rate_map = {
-                            "LINK_10": 10,
-                            "LINK_100": 100,
-                            "LINK_1000": 1000,
-                            "LINK_2500": 2500,
-                            "LINK_5000": 5000,
-                            "LINK_10000": 10000,
-                            "LINK_DOWN": 0,
-                        }
-                        link_rate = rate_map.get(link_rate, 0)
-
-                    PORT_LINK_RATE.labels(port_type=port_type_name, port_id=port_id_str).set(
-                        float(link_rate)
-                    )
-                    metrics[f"{metric_key}_link_rate"] = link_rate
-
-                # Maximum rate (enhanced metric)
-                if "max_rate" in port_info:
-                    max_rate = port_info["max_rate"]
-                    if hasattr(max_rate, "value"):
-                        max_rate = max_rate.value
-                    elif isinstance(max_rate, str):
-                        rate_map = {
-                            "LINK_10": 10,
-                            "LINK_100": 100,
-                            "LINK_1000": 1000,
-                            "LINK_2500": 2500,
-                            "LINK_5000": 5000,
-                            "LINK_10000": 10000,
-                            "LINK_DOWN": 0,
-                        }
-                        max_rate = rate_map.get(max_rate, 0)
-
-                    PORT_MAX_RATE.labels(
-                        node_mac=node_mac, port_type=port_type_name, port_id=port_id_str
-                    ).set(float(max_rate))
-                    metrics[f"{metric_key}_max_rate"] = max_rate
-
-                # Port capabilities (enhanced metric)
-                if "capabilities" in port_info and isinstance(port_info["capabilities"], list):
-                    for capability in port_info["capabilities"]:
-                        capability_name = str(capability)
-                        if hasattr(capability, "name"):
-                            capability_name = capability.name
-                        PORT_CAPABILITIES.labels(
-                            node_mac=node_mac,
-                            port_type=port_type_name,
-                            port_id=port_id_str,
-                            capability=capability_name,
-                        ).set(1)
-                        metrics[f"{metric_key}_capability_{capability_name}"] = 1
+        """Set the gauges of one port from its parse_port_rows row"""
+        node_mac, port_type_name, port_id, port_info = item
+        port_id_str, state_up, link_rate, max_rate, capabilities = row
+        self.log.debug(
+            "port",
+            node=node_mac,
+            port_type=port_type_name,
+            port_id=port_id,
+            normalized=port_id_str,
+            info=port_info,
+        )
+        metric_key = f"port_{node_mac}_{port_type_name}_{port_id_str}"
+
+        # Port status
+        if state_up is not None:
+            state_value = 1 if state_up else 0
+            PORT_STATUS.labels(port_type=port_type_name, port_id=port_id_str).set(state_value)
+            metrics[f"{metric_key}_status"] = state_value
+
+        # Link rate
+        if link_rate is not None:
+            PORT_LINK_RATE.labels(port_type=port_type_name, port_id=port_id_str).set(
+                float(link_rate)
+            )
+            metrics[f"{metric_key}_link_rate"] = link_rate
+
+        # Flaps and renegotiations since the previous reading
+        self.port_states.observe(
+            node_mac,
+            port_type_name,
+            port_id_str,
+            state_up,
+            float(link_rate) if link_rate is not None else None,
+        )
+
+        # Maximum rate (enhanced metric)
+        if max_rate is not None:
+            PORT_MAX_RATE.labels(
+                node_mac=node_mac, port_type=port_type_name, port_id=port_id_str
+            ).set(float(max_rate))
+            metrics[f"{metric_key}_max_rate"] = max_rate
+
+        # Port capabilities (enhanced metric)
+        for capability_name in capabilities or ():
+            PORT_CAPABILITIES.labels(
+                node_mac=node_mac,
+                port_type=port_type_name,
+                port_id=port_id_str,
+                capability=capability_name,
+            ).set(1)
+            metrics[f"{metric_key}_capability_{capability_name}"] = 1
 
     async def _collect_temperature_metrics(self, metrics: dict[str, Any]):
         """Collect temperature metrics"""
-        temp_data = await self.router.async_get_data(AsusData.TEMPERATURE)
+        temp_data = await self._get_data(AsusData.TEMPERATURE)
         if temp_data:
             for sensor, temp in temp_data.items():
                 if isinstance(temp, (int, float)):
@@ -197,11 +247,11 @@ class HardwareCollector(BaseCollector):
                     TEMPERATURE.labels(sensor=sensor_name).set(float(temp))
                     metrics[f"temperature_{sensor_name}"] = temp
 
-            self.logger.debug(f"Temperature data: {temp_data}")
+            self.log.debug("temperature", data=temp_data)
 
     async def _collect_node_info_metrics(self, metrics: dict[str, Any]):
         """Collect node information metrics"""
-        node_data = await self.router.async_get_data(AsusData.NODE_INFO)
+        node_data = await self._get_data(AsusData.NODE_INFO)
         if node_data:
             for node_mac, node_info in node_data.items():
                 if isinstance(node_info, dict):
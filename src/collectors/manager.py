@@ -1,50 +1,262 @@
 """Collector manager to coordinate all metric collection"""
 
 import asyncio
+import importlib
 import logging
-from typing import Any
-
-from asusrouter import AsusRouter
+from typing import TYPE_CHECKING, Any
 
 from ..metrics.prometheus_metrics import (
     COLLECTION_ERRORS_TOTAL,
+    COLLECTOR_FAMILIES,
     CONNECTION_STATUS,
     LAST_COLLECTION_TIMESTAMP,
+    WAN_STATUS,
     collection_time,
+    family_matches,
+    register_collector_families,
+    unregister_collector_families,
 )
-from .base import BaseCollector
-from .firmware import FirmwareCollector
-from .hardware import HardwareCollector
-from .network import NetworkCollector
-from .services import ServicesCollector
-from .system import SystemCollector
-from .vpn import VPNCollector
-from .wifi import WiFiCollector
+from .pool import ParsePool
+from .tracing import TRACER
+
+if TYPE_CHECKING:
+    from ..config import ExporterConfig
+    from ..sources import DataSource
+    from .base import BaseCollector
 
 logger = logging.getLogger(__name__)
 
+# Collector name -> (module, class); modules are only imported when the collector is enabled
+COLLECTOR_CLASSES = {
+    "system": ("system", "SystemCollector"),
+    "network": ("network", "NetworkCollector"),
+    "wifi": ("wifi", "WiFiCollector"),
+    "hardware": ("hardware", "HardwareCollector"),
+    "firmware": ("firmware", "FirmwareCollector"),
+    "vpn": ("vpn", "VPNCollector"),
+    "services": ("services", "ServicesCollector"),
+    "aimesh": ("aimesh", "AiMeshCollector"),
+}
+
+# Collectors that stay off unless listed in EXPORTER_COLLECTORS or their config flag is set
+OPT_IN_COLLECTORS = {"aimesh": "aimesh_direct"}
+
+
+def load_collector_class(name: str) -> type["BaseCollector"]:
+    """Import a collector module on demand and return its collector class"""
+    module_name, class_name = COLLECTOR_CLASSES[name]
+    module = importlib.import_module(f".{module_name}", __package__)
+    return getattr(module, class_name)
+
+
+def resolve_collector_names(config: "ExporterConfig | None") -> list[str]:
+    """Apply the collector allowlist and denylist from the configuration"""
+    if config is None:
+        return [name for name in COLLECTOR_CLASSES if name not in OPT_IN_COLLECTORS]
+
+    unknown = set(config.collectors + config.disabled_collectors) - set(COLLECTOR_CLASSES)
+    if unknown:
+        raise ValueError(f"Unknown collectors: {', '.join(sorted(unknown))}")
+
+    allowed = config.collectors or [
+        name
+        for name in COLLECTOR_CLASSES
+        if name not in OPT_IN_COLLECTORS or getattr(config, OPT_IN_COLLECTORS[name])
+    ]
+    return [name for name in allowed if name not in config.disabled_collectors]
+
 
 class MetricsCollectorManager:
     """Manages all metric collectors and coordinates collection"""
 
-    def __init__(self, router: AsusRouter):
-        self.router = router
-        self.collectors: list[BaseCollector] = [
-            SystemCollector(router),
-            NetworkCollector(router),
-            WiFiCollector(router),
-            HardwareCollector(router),
-            FirmwareCollector(router),
-            VPNCollector(router),
-            ServicesCollector(router),
-        ]
+    def __init__(self, source: "DataSource", config: "ExporterConfig | None" = None):
+        from .base import DataTypeFilter
+
+        self.source = source
+        self.config = config
+        self.data_filter = DataTypeFilter(
+            config.data_types if config else None,
+            config.disabled_data_types if config else None,
+        )
+        self.allowed_metrics = set(config.metrics) if config else set()
+        self.disabled_metrics = set(config.disabled_metrics) if config else set()
+        self.collectors: list[BaseCollector] = []
+        # Syslog events keep client presence current, so CLIENTS can be polled less often
+        self.clients_poll_interval = (
+            config.syslog_clients_poll_interval if config and config.syslog_enabled else 0.0
+        )
+        self.enabled_collectors: set[str] = set()
+        self.parser = ParsePool(config.parse_workers if config else 0)
+        self.inventory = None
+        if config and config.inventory_enabled:
+            from ..inventory import ClientInventory
+
+            self.inventory = ClientInventory(config.inventory_path)
+        self.vendors = None
+        if config and config.client_vendors:
+            from ..vendors import DEFAULT_INDEX, VendorIndex
+
+            self.vendors = VendorIndex(config.oui_index or DEFAULT_INDEX)
+        for name in resolve_collector_names(config):
+            self._load_collector(name)
+        self.capabilities = None
+        if config and config.capability_probe:
+            from .capabilities import CapabilityProbe
+
+            self.capabilities = CapabilityProbe(source, config.capability_cache)
+        if config:
+            from ..metrics.prometheus_metrics import CLIENT_DISTRIBUTIONS
+
+            CLIENT_DISTRIBUTIONS.rssi_threshold = config.client_rssi_threshold
+        self.anomaly = None
+        if config and config.anomaly_detection:
+            from prometheus_client import REGISTRY
+
+            from ..metrics.anomaly import AnomalyDetector
+
+            self.anomaly = AnomalyDetector(
+                config.anomaly_half_life, config.anomaly_seasonal, config.anomaly_state_path
+            )
+            REGISTRY.register(self.anomaly)
+        # Spans are only recorded when /debug/trace can be served
+        TRACER.enabled = bool(config and config.debug_token)
         self.is_connected = False
+        self.has_collected = False
         self.logger = logging.getLogger(self.__class__.__name__)
 
+    async def probe_capabilities(self) -> None:
+        """Prune data types the router model does not support"""
+        requested = {
+            dt
+            for collector in self.collectors
+            for dt in collector.get_data_types()
+            if dt.value not in self.data_filter.denied
+        }
+        self.data_filter.unsupported = await self.capabilities.probe(
+            sorted(requested, key=lambda dt: dt.value)
+        )
+
+    def _load_collector(self, name: str) -> None:
+        """Instantiate a collector and register its metric families"""
+        if not any(collector.name == name for collector in self.collectors):
+            collector_class = load_collector_class(name)
+            collector = collector_class(self.source, self.data_filter)
+            collector.parser = self.parser
+            if name == "wifi":
+                collector.clients_poll_interval = self.clients_poll_interval
+                collector.inventory = self.inventory
+                collector.vendors = self.vendors
+            elif name == "aimesh" and self.config:
+                collector.node_source_factory = self._node_source
+                collector.node_timeout = self.config.aimesh_node_timeout
+            self.collectors.append(collector)
+        self._register_families(name)
+        self.enabled_collectors.add(name)
+
+    def _register_families(self, name: str) -> None:
+        register_collector_families(
+            name, allowed=self.allowed_metrics, denied=self.disabled_metrics
+        )
+
+    def set_collector_enabled(self, name: str, enabled: bool) -> None:
+        """Enable or disable a collector at runtime"""
+        if name not in COLLECTOR_CLASSES:
+            raise ValueError(f"Unknown collector: {name}")
+        if enabled:
+            self._load_collector(name)
+        else:
+            self.enabled_collectors.discard(name)
+            unregister_collector_families(name)
+        self.logger.info(f"Collector {name} {'enabled' if enabled else 'disabled'}")
+
+    def set_data_type_enabled(self, name: str, enabled: bool) -> None:
+        """Enable or disable fetching of an AsusData type at runtime"""
+        from asusrouter import AsusData
+
+        try:
+            data_type = AsusData(name.lower())
+        except ValueError:
+            raise ValueError(f"Unknown data type: {name}") from None
+        self.data_filter.set_enabled(data_type, enabled)
+        self.logger.info(f"Data type {name} {'enabled' if enabled else 'disabled'}")
+
+    def set_metric_enabled(self, name: str, enabled: bool) -> None:
+        """Enable or disable a metric family at runtime"""
+        owner = next(
+            (
+                collector_name
+                for collector_name, families in COLLECTOR_FAMILIES.items()
+                if any(family_matches(family, {name}) for family in families)
+            ),
+            None,
+        )
+        if owner is None:
+            raise ValueError(f"Unknown metric family: {name}")
+
+        if enabled:
+            self.disabled_metrics.discard(name)
+            if self.allowed_metrics:
+                self.allowed_metrics.add(name)
+        else:
+            self.disabled_metrics.add(name)
+
+        # Re-register the owner's families so the change applies immediately
+        unregister_collector_families(owner)
+        if owner in self.enabled_collectors:
+            self._register_families(owner)
+        self.logger.info(f"Metric family {name} {'enabled' if enabled else 'disabled'}")
+
+    def get_collector(self, name: str) -> "BaseCollector | None":
+        """Return an enabled collector by name"""
+        if name not in self.enabled_collectors:
+            return None
+        return next((collector for collector in self.collectors if collector.name == name), None)
+
+    async def poll_ports(self) -> None:
+        """Refresh port state only, used by the fast port poll between cycles"""
+        hardware = self.get_collector("hardware")
+        if hardware is not None and self.is_connected:
+            await hardware.poll_ports()
+
+    def apply_client_event(self, mac: str, online: bool) -> None:
+        """Push a client presence change from an event source (e.g. syslog)"""
+        wifi = self.get_collector("wifi")
+        if wifi is not None:
+            wifi.apply_client_event(mac, online)
+
+    def get_clients(self) -> list[Any]:
+        """Parsed records of the clients in the latest CLIENTS payload"""
+        wifi = self.get_collector("wifi")
+        return list(wifi.clients) if wifi is not None else []
+
+    def apply_wan_event(self, up: bool) -> None:
+        """Push a WAN link change from an event source ahead of the next WAN poll"""
+        if self.get_collector("network") is not None:
+            WAN_STATUS.set(1 if up else 0)
+            self.logger.info(f"WAN link {'up' if up else 'down'} reported by syslog")
+
+    def get_client_events(self, **filters: Any) -> list[dict[str, Any]]:
+        """Recent client connect/disconnect/roam events, newest first"""
+        wifi = self.get_collector("wifi")
+        if wifi is None:
+            return []
+        return wifi.sessions.get_events(**filters)
+
+    def get_filter_state(self) -> dict[str, list[str]]:
+        """Current collector, data type and metric family filters"""
+        return {
+            "enabled_collectors": sorted(self.enabled_collectors),
+            "allowed_data_types": sorted(self.data_filter.allowed),
+            "disabled_data_types": sorted(self.data_filter.denied),
+            "unsupported_data_types": sorted(self.data_filter.unsupported),
+            "allowed_metrics": sorted(self.allowed_metrics),
+            "disabled_metrics": sorted(self.disabled_metrics),
+        }
+
     async def connect_router(self) -> None:
         """Connect to the ASUS router"""
         try:
-            await self.router.async_connect()
+            await self.source.async_connect()
             self.is_connected = True
             CONNECTION_STATUS.set(1)
             self.logger.info("Successfully connected to router")
@@ -57,7 +269,7 @@ class MetricsCollectorManager:
     @collection_time.time()
     async def collect_all_metrics(self) -> dict[str, Any]:
         """Collect metrics from all collectors"""
-        if not self.router or not self.is_connected:
+        if not self.source or not self.is_connected:
             self.logger.warning("Router not connected, attempting to reconnect...")
             try:
                 await self.connect_router()
@@ -67,15 +279,24 @@ class MetricsCollectorManager:
 
         all_metrics = {}
 
+        if self.capabilities and not self.capabilities.probed:
+            try:
+                await self.probe_capabilities()
+            except Exception as e:
+                self.logger.warning(f"Capability probe failed, collecting everything: {e}")
+
+        TRACER.begin_cycle()
         try:
-            # Collect metrics from all collectors concurrently
-            collection_tasks = [collector.collect() for collector in self.collectors]
+            # Collect metrics from all enabled collectors concurrently
+            active = [c for c in self.collectors if c.name in self.enabled_collectors]
+            collection_tasks = [self._collect_traced(collector) for collector in active]
 
-            results = await asyncio.gather(*collection_tasks, return_exceptions=True)
+            with TRACER.span("collect_all_metrics", "cycle", "manager"):
+                results = await asyncio.gather(*collection_tasks, return_exceptions=True)
 
             # Process results
             for i, result in enumerate(results):
-                collector_name = self.collectors[i].__class__.__name__
+                collector_name = active[i].__class__.__name__
 
                 if isinstance(result, Exception):
                     self.logger.error(f"Error in {collector_name}: {result}")
@@ -86,6 +307,15 @@ class MetricsCollectorManager:
 
             CONNECTION_STATUS.set(1)
             LAST_COLLECTION_TIMESTAMP.set_to_current_time()
+            self.has_collected = True
+
+            if self.capabilities:
+                self.capabilities.check_firmware(all_metrics.get("firmware_current"))
+            if self.anomaly:
+                with TRACER.span("anomaly_update", "cycle", "manager"):
+                    self.anomaly.update(all_metrics)
+            if self.inventory:
+                await self._flush_inventory()
             self.logger.debug(f"Successfully collected {len(all_metrics)} total metrics")
 
         except Exception as e:
@@ -93,14 +323,64 @@ class MetricsCollectorManager:
             self.is_connected = False
             CONNECTION_STATUS.set(0)
             COLLECTION_ERRORS_TOTAL.labels(error_type="general").inc()
+        finally:
+            TRACER.end_cycle()
 
         return all_metrics
 
+    async def _flush_inventory(self) -> None:
+        """Write the cycle's client changes to the inventory in one transaction"""
+        try:
+            with TRACER.span("inventory_flush", "cycle", "manager"):
+                await self.inventory.flush()
+        except Exception as e:
+            self.logger.error(f"Error writing the client inventory: {e}")
+
+    def _node_source(self, ip: str) -> "DataSource":
+        """A separate asusrouter session for an AiMesh satellite, same credentials"""
+        from ..sources import HttpSource, create_router
+
+        return HttpSource(create_router(self.config, hostname=ip))
+
+    async def close(self) -> None:
+        """Close collector sessions, the parse workers, the client inventory and OUI index"""
+        for collector in self.collectors:
+            if hasattr(collector, "close"):
+                await collector.close()
+        self.parser.close()
+        if self.inventory:
+            self.inventory.close()
+        if self.vendors is not None:
+            self.vendors.close()
+
+    @staticmethod
+    async def _collect_traced(collector: "BaseCollector") -> dict[str, Any]:
+        with TRACER.span(collector.name, "collector", collector.name):
+            return await collector.collect()
+
+    def save_state(self) -> None:
+        """Persist state that should survive a restart"""
+        if self.anomaly:
+            self.anomaly.save()
+
     def get_collector_info(self) -> dict[str, list[str]]:
-        """Get information about all collectors and their data types"""
+        """Get information about enabled collectors and their enabled data types"""
         info = {}
         for collector in self.collectors:
+            if collector.name not in self.enabled_collectors:
+                continue
             collector_name = collector.__class__.__name__
-            data_types = [dt.value for dt in collector.get_data_types()]
+            data_types = [dt.value for dt in collector.get_enabled_data_types()]
             info[collector_name] = data_types
         return info
+
+    def get_snapshot(self) -> dict[str, Any]:
+        """State a separate server process needs for /health, /readyz, /collectors and /api/events"""
+        from .sessions import MAX_EVENTS
+
+        return {
+            "connected": self.is_connected,
+            "collected": self.has_collected,
+            "collectors": self.get_collector_info(),
+            "events": self.get_client_events(limit=MAX_EVENTS),
+        }
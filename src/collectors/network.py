@@ -23,6 +23,8 @@ from .base import BaseCollector
 class NetworkCollector(BaseCollector):
     """Collects network interface, WAN, and AiMesh traffic metrics (v1.21.0+)"""
 
+    name = "network"
+
     def get_data_types(self) -> list[AsusData]:
         # Include AIMESH_NODE_INFO if available for traffic monitoring (v1.21.0+)
         return [AsusData.WAN, AsusData.NETWORK, AsusData.AIMESH]
@@ -55,7 +57,7 @@ class NetworkCollector(BaseCollector):
         """Collect AiMesh network traffic metrics (v1.21.0+)"""
         try:
             # Try to get AiMesh data for mesh network topology
-            aimesh_data = await self.router.async_get_data(AsusData.AIMESH)
+            aimesh_data = await self._get_data(AsusData.AIMESH)
             if aimesh_data:
                 # AiMesh data structure contains node information
                 # Future enhancement: Process mesh network traffic if available
@@ -69,7 +71,7 @@ class NetworkCollector(BaseCollector):
 
     async def _collect_wan_metrics(self, metrics: dict[str, Any]):
         """Collect WAN metrics"""
-        wan_data = await self.router.async_get_data(AsusData.WAN)
+        wan_data = await self._get_data(AsusData.WAN)
         if wan_data:
             if "rx_bytes" in wan_data:
                 # Set counter to current value (not increment)
@@ -106,9 +108,7 @@ class NetworkCollector(BaseCollector):
 
                 WAN_STATUS.set(wan_status)
                 metrics["wan_status"] = wan_status
-                self.logger.debug(
-                    f"WAN status: {wan_status} (raw value: {status_value}, type: {type(status_value)})"
-                )
+                self.log.debug("wan_status", status=wan_status, raw=status_value)
 
             # IP address (Info metric)
             if "ip_address" in wan_data:
@@ -126,13 +126,13 @@ class NetworkCollector(BaseCollector):
                 WAN_UPTIME.set(float(wan_data["uptime"]))
                 metrics["wan_uptime"] = wan_data["uptime"]
 
-            self.logger.debug(
-                f"WAN - RX: {wan_data.get('rx_bytes', 'N/A')}, TX: {wan_data.get('tx_bytes', 'N/A')}"
+            self.log.debug(
+                "wan", rx_bytes=wan_data.get("rx_bytes"), tx_bytes=wan_data.get("tx_bytes")
             )
 
     async def _collect_network_metrics(self, metrics: dict[str, Any]):
         """Collect network interface metrics"""
-        network_data = await self.router.async_get_data(AsusData.NETWORK)
+        network_data = await self._get_data(AsusData.NETWORK)
         if network_data:
             for interface, stats in network_data.items():
                 if isinstance(stats, dict) and "rx" in stats and "tx" in stats:
@@ -0,0 +1,72 @@
+"""Optional process pool for parsing large payloads off the event loop thread"""
+
+import asyncio
+import logging
+import math
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Below this many items a round trip to a worker costs more than parsing in place
+INLINE_ITEMS = 512
+
+# Each chunk carries at least this many items so pickling overhead stays amortised
+MIN_CHUNK_ITEMS = 256
+
+
+class ParsePool:
+    """
+    Runs a parse function over a list of payload rows, inline or split across worker
+    processes. The function takes a list of rows and returns one result per row, so
+    chunks can be concatenated in order. Small payloads are always parsed inline; large
+    ones are cut into one chunk per worker, fewer when that would make chunks too small.
+    """
+
+    def __init__(self, workers: int = 0):
+        self.workers = workers
+        self.executor: ProcessPoolExecutor | None = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def chunks(self, count: int) -> int:
+        """How many chunks a payload of count rows is split into (1 = parse inline)"""
+        if self.workers <= 0 or count < INLINE_ITEMS:
+            return 1
+        return max(1, min(self.workers, count // MIN_CHUNK_ITEMS))
+
+    async def map(self, func: Callable[[list], list], rows: list) -> list[Any]:
+        """func(rows), with large payloads parsed by the worker processes"""
+        chunks = self.chunks(len(rows))
+        if chunks == 1:
+            return func(rows)
+        if self.executor is None:
+            # spawn: workers must not inherit the event loop, sockets or metric state
+            self.executor = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            self.logger.info(f"Started {self.workers} parse worker processes")
+
+        size = math.ceil(len(rows) / chunks)
+        loop = asyncio.get_running_loop()
+        try:
+            parts = await asyncio.gather(
+                *(
+                    loop.run_in_executor(self.executor, func, rows[start : start + size])
+                    for start in range(0, len(rows), size)
+                )
+            )
+        except BrokenProcessPool:
+            # A worker died (OOM killer, signal): parse this payload here, respawn next time
+            self.logger.warning("Parse worker process died, parsing inline this cycle")
+            self.close()
+            return func(rows)
+        return [result for part in parts for result in part]
+
+    def close(self) -> None:
+        """Stop the worker processes"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,72 @@
+"""Per-port link state tracking across collection cycles"""
+
+import logging
+import time
+
+from ..metrics.prometheus_metrics import PORT_STATE_DURATION, PORT_TRANSITIONS_TOTAL
+
+logger = logging.getLogger(__name__)
+
+
+class _PortState:
+    """Last observed link state of one port and its rate the last time it was up"""
+
+    __slots__ = ("rate", "since", "up")
+
+    def __init__(self, up: bool | None, rate: float | None, since: float):
+        self.up = up
+        self.rate = rate if up else None
+        self.since = since
+
+
+class PortStateTracker:
+    """
+    Remembers each port's link state and rate so flaps and renegotiations show up as
+    counters instead of being reconstructed from sampled gauges in PromQL.
+    """
+
+    def __init__(self):
+        self.ports: dict[tuple[str, str, str], _PortState] = {}
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def observe(
+        self,
+        node_mac: str,
+        port_type: str,
+        port_id: str,
+        up: bool | None,
+        rate: float | None,
+        now: float | None = None,
+    ) -> None:
+        """Compare a port reading with the previous one and count any transitions"""
+        now = time.time() if now is None else now
+        key = (node_mac, port_type, port_id)
+        state = self.ports.get(key)
+
+        if state is None:
+            # First reading: the time in state is counted from exporter start
+            state = self.ports[key] = _PortState(up, rate, now)
+        else:
+            if up is not None and state.up is not None and up != state.up:
+                self._count(key, "up_to_down" if state.up else "down_to_up")
+                state.since = now
+            if up is not None:
+                state.up = up
+
+            # Only up-state rates are compared, so a link that comes back at a lower speed
+            # (up@1000 -> down -> up@100) counts as a downgrade; the 0 while down does not
+            if rate and state.up:
+                if state.rate and rate != state.rate:
+                    self._count(key, "rate_downgrade" if rate < state.rate else "rate_upgrade")
+                state.rate = rate
+
+        PORT_STATE_DURATION.labels(node_mac=node_mac, port_type=port_type, port_id=port_id).set(
+            now - state.since
+        )
+
+    def _count(self, key: tuple[str, str, str], transition: str) -> None:
+        node_mac, port_type, port_id = key
+        PORT_TRANSITIONS_TOTAL.labels(
+            node_mac=node_mac, port_type=port_type, port_id=port_id, transition=transition
+        ).inc()
+        self.logger.info(f"Port {port_type} {port_id} on {node_mac}: {transition}")
@@ -32,11 +32,13 @@ from .base import BaseCollector
 class ServicesCollector(BaseCollector):
     """Collects additional service metrics"""
 
+    name = "services"
+
     def get_data_types(self) -> list[AsusData]:
         return [
             AsusData.LED,
             AsusData.AURA,
-            AsusData.SPEEDTEST,
+            AsusData.SPEEDTEST_RESULT,
             AsusData.AIMESH,
             AsusData.DSL,
             AsusData.PARENTAL_CONTROL,
@@ -96,7 +98,7 @@ class ServicesCollector(BaseCollector):
         """Collect LED and Aura metrics"""
         # LED status
         try:
-            led_data = await self.router.async_get_data(AsusData.LED)
+            led_data = await self._get_data(AsusData.LED)
             if led_data and "state" in led_data:
                 led_status = 1 if led_data["state"] else 0
                 LED_STATUS.set(led_status)
@@ -107,7 +109,7 @@ class ServicesCollector(BaseCollector):
 
         # Aura lighting
         try:
-            aura_data = await self.router.async_get_data(AsusData.AURA)
+            aura_data = await self._get_data(AsusData.AURA)
             if aura_data and "state" in aura_data:
                 AURA_STATUS.set(aura_data["state"])
                 metrics["aura_status"] = aura_data["state"]
@@ -118,7 +120,7 @@ class ServicesCollector(BaseCollector):
     async def _collect_speedtest_metrics(self, metrics: dict[str, Any]):
         """Collect speedtest metrics"""
         try:
-            speedtest_data = await self.router.async_get_data(AsusData.SPEEDTEST_RESULT)
+            speedtest_data = await self._get_data(AsusData.SPEEDTEST_RESULT)
             if speedtest_data:
                 result = speedtest_data.get("result")
                 if result and isinstance(result, dict):
@@ -165,7 +167,7 @@ class ServicesCollector(BaseCollector):
     async def _collect_aimesh_metrics(self, metrics: dict[str, Any]):
         """Collect AiMesh metrics"""
         try:
-            aimesh_data = await self.router.async_get_data(AsusData.AIMESH)
+            aimesh_data = await self._get_data(AsusData.AIMESH)
             if aimesh_data:
                 # Node count
                 if "node_count" in aimesh_data:
@@ -192,7 +194,7 @@ class ServicesCollector(BaseCollector):
     async def _collect_dsl_metrics(self, metrics: dict[str, Any]):
         """Collect DSL metrics"""
         try:
-            dsl_data = await self.router.async_get_data(AsusData.DSL)
+            dsl_data = await self._get_data(AsusData.DSL)
             if dsl_data:
                 # Downstream and upstream rates
                 if "rate_down" in dsl_data:
@@ -217,7 +219,7 @@ class ServicesCollector(BaseCollector):
     async def _collect_parental_control_metrics(self, metrics: dict[str, Any]):
         """Collect Parental Control metrics"""
         try:
-            parental_data = await self.router.async_get_data(AsusData.PARENTAL_CONTROL)
+            parental_data = await self._get_data(AsusData.PARENTAL_CONTROL)
             if parental_data:
                 # Enabled status
                 if "enabled" in parental_data:
@@ -244,7 +246,7 @@ class ServicesCollector(BaseCollector):
     async def _collect_port_forwarding_metrics(self, metrics: dict[str, Any]):
         """Collect Port Forwarding metrics"""
         try:
-            port_forwarding_data = await self.router.async_get_data(AsusData.PORT_FORWARDING)
+            port_forwarding_data = await self._get_data(AsusData.PORT_FORWARDING)
             if port_forwarding_data:
                 # Enabled status
                 if "enabled" in port_forwarding_data:
@@ -265,7 +267,7 @@ class ServicesCollector(BaseCollector):
     async def _collect_ping_metrics(self, metrics: dict[str, Any]):
         """Collect Network Ping metrics"""
         try:
-            ping_data = await self.router.async_get_data(AsusData.PING)
+            ping_data = await self._get_data(AsusData.PING)
             if ping_data:
                 for target, stats in ping_data.items():
                     if isinstance(stats, dict):
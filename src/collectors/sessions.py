@@ -0,0 +1,159 @@
+"""Client presence sessions derived from the client table diff"""
+
+import logging
+import time
+from collections import deque
+from collections.abc import Iterable
+from typing import Any
+
+from ..log import EventLogger
+from ..metrics.prometheus_metrics import (
+    CLIENT_CONNECTS_TOTAL,
+    CLIENT_DISCONNECTS_TOTAL,
+    CLIENT_ROAMS_TOTAL,
+    CLIENT_SESSION_DURATION,
+)
+from .clients import ClientDiff, ClientRecord
+
+logger = logging.getLogger(__name__)
+
+# Events kept in memory for /api/events
+MAX_EVENTS = 1000
+
+
+def filter_events(
+    newest_first: Iterable[dict[str, Any]],
+    limit: int = 100,
+    mac: str | None = None,
+    event_type: str | None = None,
+    since: float | None = None,
+) -> list[dict[str, Any]]:
+    """Up to limit events matching the filters, from an iterable ordered newest first"""
+    result = []
+    for event in newest_first:
+        if since is not None and event["timestamp"] < since:
+            break
+        if mac and event["mac"] != mac:
+            continue
+        if event_type and event["type"] != event_type:
+            continue
+        result.append(event)
+        if len(result) >= limit:
+            break
+    return result
+
+
+class _Session:
+    """An online period of one client"""
+
+    __slots__ = ("band", "node", "start_known", "started")
+
+    def __init__(self, band: str, node: str, started: float, start_known: bool):
+        self.band = band
+        self.node = node
+        self.started = started
+        # False for clients already online when the exporter started
+        self.start_known = start_known
+
+
+class SessionTracker:
+    """
+    Per-MAC online/offline state machine fed with each ClientDiff, so connects,
+    disconnects and roams cost O(1) per changed client instead of changes() queries.
+    """
+
+    def __init__(self, max_events: int = MAX_EVENTS):
+        self.sessions: dict[str, _Session] = {}
+        self.events: deque[dict[str, Any]] = deque(maxlen=max_events)
+        self._baseline_done = False
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.log = EventLogger(self.logger)
+
+    def observe(self, diff: ClientDiff, now: float | None = None) -> None:
+        """Advance the state machine with the clients that changed this cycle"""
+        now = time.time() if now is None else now
+
+        if not self._baseline_done:
+            # First payload: whoever is online already has a session of unknown length
+            for record in diff.added:
+                if record.online:
+                    self.sessions[record.mac] = _Session(
+                        self._band(record), record.node, now, False
+                    )
+            self._baseline_done = True
+            return
+
+        for record in diff.added:
+            if record.online:
+                self._connect(record, now)
+        for record, changed, _old_labels in diff.changed:
+            session = self.sessions.get(record.mac)
+            if session is None:
+                if record.online:
+                    self._connect(record, now)
+            elif not record.online:
+                self._disconnect(record, session, now)
+            elif changed & {"connection_type", "node"} and (
+                session.band != self._band(record) or session.node != record.node
+            ):
+                self._roam(record, session, now)
+        for record in diff.removed:
+            session = self.sessions.get(record.mac)
+            if session is not None:
+                self._disconnect(record, session, now)
+
+    def get_events(
+        self,
+        limit: int = 100,
+        mac: str | None = None,
+        event_type: str | None = None,
+        since: float | None = None,
+    ) -> list[dict[str, Any]]:
+        """Most recent events first, optionally filtered"""
+        return filter_events(reversed(self.events), limit, mac, event_type, since)
+
+    @staticmethod
+    def _band(record: ClientRecord) -> str:
+        return record.band or "unknown"
+
+    def _connect(self, record: ClientRecord, now: float) -> None:
+        band = self._band(record)
+        self.sessions[record.mac] = _Session(band, record.node, now, True)
+        CLIENT_CONNECTS_TOTAL.labels(band=band, node=record.node).inc()
+        self._record("connect", record, now, band=band, node=record.node)
+
+    def _disconnect(self, record: ClientRecord, session: _Session, now: float) -> None:
+        del self.sessions[record.mac]
+        CLIENT_DISCONNECTS_TOTAL.labels(band=session.band, node=session.node).inc()
+        duration = now - session.started
+        if session.start_known:
+            CLIENT_SESSION_DURATION.labels(band=session.band).observe(duration)
+        self._record(
+            "disconnect",
+            record,
+            now,
+            band=session.band,
+            node=session.node,
+            duration=round(duration, 3) if session.start_known else None,
+        )
+
+    def _roam(self, record: ClientRecord, session: _Session, now: float) -> None:
+        band = self._band(record)
+        CLIENT_ROAMS_TOTAL.labels(band=band, node=record.node).inc()
+        self._record(
+            "roam",
+            record,
+            now,
+            band=band,
+            node=record.node,
+            from_band=session.band,
+            from_node=session.node,
+        )
+        session.band = band
+        session.node = record.node
+
+    def _record(self, event_type: str, record: ClientRecord, now: float, **fields: Any) -> None:
+        event = {"timestamp": now, "type": event_type, "mac": record.mac, "name": record.name}
+        event.update(fields)
+        self.events.append(event)
+        self.log.debug("client_event", type=event_type, mac=record.mac, name=record.name, **fields)
@@ -29,6 +29,8 @@ from .base import BaseCollector
 class SystemCollector(BaseCollector):
     """Collects system metrics including CPU, RAM, and system info"""
 
+    name = "system"
+
     def get_data_types(self) -> list[AsusData]:
         return [AsusData.CPU, AsusData.RAM, AsusData.SYSINFO]
 
@@ -58,9 +60,9 @@ class SystemCollector(BaseCollector):
 
     async def _collect_cpu_metrics(self, metrics: dict[str, Any]):
         """Collect CPU metrics"""
-        cpu_data = await self.router.async_get_data(AsusData.CPU)
+        cpu_data = await self._get_data(AsusData.CPU)
         if cpu_data:
-            self.logger.debug(f"CPU data structure: {cpu_data}, type: {type(cpu_data)}")
+            self.log.debug("cpu_raw", data=cpu_data)
 
             # asusrouter returns CPU data as dict with "total" key containing {total, used, usage}
             # and individual core keys like 1, 2, 3, etc.
@@ -74,31 +76,29 @@ class SystemCollector(BaseCollector):
                         # asusrouter.process_cpu already calculates usage if history is available
                         if "usage" in total_info and total_info["usage"] is not None:
                             cpu_usage = total_info["usage"]
-                            self.logger.debug(f"Found CPU usage in total.usage: {cpu_usage}")
+                            self.log.debug("cpu_usage", source="total.usage", value=cpu_usage)
                         else:
                             # Fallback: calculate from total and used
                             total_val = total_info.get("total", 0)
                             used_val = total_info.get("used", 0)
                             if total_val > 0:
                                 cpu_usage = (used_val / total_val) * 100
-                                self.logger.debug(
-                                    f"Calculated CPU usage from total/used: {cpu_usage}%"
-                                )
+                                self.log.debug("cpu_usage", source="total/used", value=cpu_usage)
 
                 # Fallback: try other common keys if total didn't work
                 if cpu_usage is None:
                     for key in ["usage", "cpu_usage", "percent", "cpu", "value"]:
                         if key in cpu_data and isinstance(cpu_data[key], (int, float)):
                             cpu_usage = cpu_data[key]
-                            self.logger.debug(f"Found CPU usage in key '{key}': {cpu_usage}")
+                            self.log.debug("cpu_usage", source=key, value=cpu_usage)
                             break
 
             elif isinstance(cpu_data, (int, float)):
                 cpu_usage = cpu_data
-                self.logger.debug(f"CPU data is numeric: {cpu_usage}")
+                self.log.debug("cpu_usage", source="numeric", value=cpu_usage)
             elif hasattr(cpu_data, "value"):
                 cpu_usage = cpu_data.value
-                self.logger.debug(f"Found enum value: {cpu_usage}")
+                self.log.debug("cpu_usage", source="enum", value=cpu_usage)
 
             if cpu_usage is not None:
                 try:
@@ -109,17 +109,17 @@ class SystemCollector(BaseCollector):
                     # Allow > 100 for multi-core systems reporting aggregated usage
                     CPU_USAGE.set(cpu_value)
                     metrics["cpu_usage"] = cpu_value
-                    self.logger.debug(f"CPU usage set to: {cpu_value}%")
+                    self.log.debug("cpu_usage_set", value=cpu_value)
                 except (ValueError, TypeError) as e:
                     self.logger.error(f"Error parsing CPU usage: {e}")
             else:
-                self.logger.warning(f"No CPU usage found in data: {cpu_data}")
-        else:
-            self.logger.warning("No CPU data returned from router")
+                self.log.warning("cpu_usage_missing", every=300, data=cpu_data)
+        elif self.data_filter.is_enabled(AsusData.CPU):
+            self.log.warning("cpu_data_missing", every=300)
 
     async def _collect_memory_metrics(self, metrics: dict[str, Any]):
         """Collect RAM and memory metrics"""
-        ram_data = await self.router.async_get_data(AsusData.RAM)
+        ram_data = await self._get_data(AsusData.RAM)
         if ram_data:
             if "used" in ram_data:
                 RAM_USED.set(float(ram_data["used"]))
@@ -134,13 +134,11 @@ class SystemCollector(BaseCollector):
                 RAM_USAGE_PERCENT.set(float(ram_data["usage"]))
                 metrics["ram_usage_percent"] = ram_data["usage"]
 
-            self.logger.debug(
-                f"RAM - Used: {ram_data.get('used', 'N/A')}, Free: {ram_data.get('free', 'N/A')}"
-            )
+            self.log.debug("ram", used=ram_data.get("used"), free=ram_data.get("free"))
 
     async def _collect_sysinfo_metrics(self, metrics: dict[str, Any]):
         """Collect system information metrics"""
-        sysinfo_data = await self.router.async_get_data(AsusData.SYSINFO)
+        sysinfo_data = await self._get_data(AsusData.SYSINFO)
         if sysinfo_data:
             # Connection stats
             connections = sysinfo_data.get("connections", {})
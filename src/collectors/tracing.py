@@ -0,0 +1,79 @@
+"""Per-cycle span recording exported as Chrome trace events (chrome://tracing, Perfetto)"""
+
+import os
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+# Collection cycles kept for /debug/trace
+MAX_TRACE_CYCLES = 50
+
+# (name, category, lane, start, duration) with perf_counter times
+Span = tuple[str, str, str, float, float]
+
+
+class CycleTracer:
+    """
+    Records a span per collector and per AsusData fetch of each collection cycle.
+    Recording only happens while enabled and inside a cycle, so the fast port poll and
+    syslog updates between cycles are not traced.
+    """
+
+    def __init__(self, max_cycles: int = MAX_TRACE_CYCLES):
+        self.enabled = False
+        self.cycles: deque[list[Span]] = deque(maxlen=max_cycles)
+        self._current: list[Span] | None = None
+        # perf_counter -> microseconds since the epoch, for absolute trace timestamps
+        self._epoch_offset = time.time() - time.perf_counter()
+
+    def begin_cycle(self) -> None:
+        if self.enabled:
+            self._current = []
+
+    def end_cycle(self) -> None:
+        if self._current is not None:
+            self.cycles.append(self._current)
+            self._current = None
+
+    @contextmanager
+    def span(self, name: str, category: str, lane: str) -> Iterator[None]:
+        """Time a block and add it to the current cycle"""
+        if self._current is None:
+            yield
+            return
+        current = self._current
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            current.append((name, category, lane, start, time.perf_counter() - start))
+
+    def to_chrome(self, cycles: int) -> dict[str, Any]:
+        """The last N cycles in Chrome trace-event format, one thread lane per collector"""
+        pid = os.getpid()
+        lanes: dict[str, int] = {}
+        events = []
+        for cycle in list(self.cycles)[-cycles:] if cycles > 0 else []:
+            for name, category, lane, start, duration in cycle:
+                tid = lanes.setdefault(lane, len(lanes) + 1)
+                events.append(
+                    {
+                        "name": name,
+                        "cat": category,
+                        "ph": "X",
+                        "ts": round((start + self._epoch_offset) * 1e6),
+                        "dur": round(duration * 1e6),
+                        "pid": pid,
+                        "tid": tid,
+                    }
+                )
+        events.extend(
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": lane}}
+            for lane, tid in lanes.items()
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+TRACER = CycleTracer()
@@ -21,8 +21,15 @@ from .base import BaseCollector
 class VPNCollector(BaseCollector):
     """Collects VPN-related metrics"""
 
+    name = "vpn"
+
     def get_data_types(self) -> list[AsusData]:
-        return [AsusData.OPENVPN, AsusData.WIREGUARD, AsusData.VPNC]
+        return [
+            AsusData.OPENVPN,
+            AsusData.WIREGUARD_CLIENT,
+            AsusData.WIREGUARD_SERVER,
+            AsusData.VPNC,
+        ]
 
     async def collect(self) -> dict[str, Any]:
         """Collect VPN metrics"""
@@ -51,7 +58,7 @@ class VPNCollector(BaseCollector):
     async def _collect_openvpn_metrics(self, metrics: dict[str, Any]):
         """Collect OpenVPN metrics"""
         try:
-            openvpn_data = await self.router.async_get_data(AsusData.OPENVPN)
+            openvpn_data = await self._get_data(AsusData.OPENVPN)
             if openvpn_data:
                 # Client metrics
                 clients = openvpn_data.get("client", {})
@@ -82,7 +89,7 @@ class VPNCollector(BaseCollector):
         """Collect WireGuard metrics"""
         try:
             # WireGuard client metrics
-            wg_client_data = await self.router.async_get_data(AsusData.WIREGUARD_CLIENT)
+            wg_client_data = await self._get_data(AsusData.WIREGUARD_CLIENT)
             if wg_client_data:
                 for client_id, client_info in wg_client_data.items():
                     if isinstance(client_info, dict) and "state" in client_info:
@@ -98,7 +105,7 @@ class VPNCollector(BaseCollector):
 
         try:
             # WireGuard server metrics
-            wg_server_data = await self.router.async_get_data(AsusData.WIREGUARD_SERVER)
+            wg_server_data = await self._get_data(AsusData.WIREGUARD_SERVER)
             if wg_server_data:
                 for server_id, server_info in wg_server_data.items():
                     if isinstance(server_info, dict) and "state" in server_info:
@@ -115,7 +122,7 @@ class VPNCollector(BaseCollector):
     async def _collect_vpnc_metrics(self, metrics: dict[str, Any]):
         """Collect VPNC (VPN Client) metrics"""
         try:
-            vpnc_data = await self.router.async_get_data(AsusData.VPNC)
+            vpnc_data = await self._get_data(AsusData.VPNC)
             if vpnc_data:
                 # Client count
                 if "client_count" in vpnc_data:
@@ -1,16 +1,20 @@
 """WiFi and client metrics collector"""
 
-from typing import Any
+import contextlib
+import time
+from typing import TYPE_CHECKING, Any
 
 from asusrouter import AsusData
 
 from ..metrics.prometheus_metrics import (
     CLIENT_COUNT_BY_TYPE,
+    CLIENT_DISTRIBUTIONS,
     CLIENT_INTERNET_STATE,
     CLIENT_ONLINE,
     CLIENT_RSSI,
     CLIENT_RX_RATE,
     CLIENT_TX_RATE,
+    CLIENT_VENDOR,
     COLLECTION_ERRORS_TOTAL,
     GWLAN_CLIENT_COUNT,
     GWLAN_STATUS,
@@ -24,12 +28,32 @@ from ..metrics.prometheus_metrics import (
     WLAN_STATUS,
     WLAN_TXPOWER,
 )
-from .base import BaseCollector
+from .base import BaseCollector, DataTypeFilter
+from .clients import ClientDiff, ClientRecord, ClientStore, client_rows, parse_client_rows
+from .sessions import SessionTracker
+
+if TYPE_CHECKING:
+    from ..sources import DataSource
 
 
 class WiFiCollector(BaseCollector):
     """Collects WiFi and client connection metrics"""
 
+    name = "wifi"
+
+    def __init__(self, source: "DataSource", data_filter: DataTypeFilter | None = None):
+        super().__init__(source, data_filter)
+        self.clients = ClientStore()
+        self.sessions = SessionTracker()
+        # Set by the manager when the client inventory or vendor enrichment is enabled
+        self.inventory = None
+        self.vendors = None
+        # With event-driven updates (syslog) CLIENTS is re-polled at most this often unless
+        # an event reported a change; 0 polls every cycle
+        self.clients_poll_interval = 0.0
+        self._clients_dirty = True
+        self._last_clients_poll = 0.0
+
     def get_data_types(self) -> list[AsusData]:
         return [AsusData.CLIENTS, AsusData.SYSINFO, AsusData.GWLAN, AsusData.WLAN]
 
@@ -37,17 +61,29 @@ class WiFiCollector(BaseCollector):
         """Collect WiFi and client metrics"""
         metrics = {}
 
+        # CLIENTS is fetched once per cycle and shared by the client-level collectors
+        clients_data = None
         try:
-            await self._collect_wifi_metrics(metrics)
+            if self._should_poll_clients():
+                clients_data = await self._get_data(AsusData.CLIENTS)
+                self._clients_dirty = False
+                self._last_clients_poll = time.monotonic()
         except Exception as e:
-            self.logger.debug(f"Failed to collect WiFi client data: {e}")
+            self.logger.debug(f"Failed to fetch client data: {e}")
             COLLECTION_ERRORS_TOTAL.labels(error_type="wifi").inc()
 
-        try:
-            await self._collect_client_details(metrics)
-        except Exception as e:
-            self.logger.debug(f"Failed to collect detailed client data: {e}")
-            COLLECTION_ERRORS_TOTAL.labels(error_type="client_details").inc()
+        if clients_data:
+            try:
+                self._collect_wifi_metrics(clients_data, metrics)
+            except Exception as e:
+                self.logger.debug(f"Failed to collect WiFi client data: {e}")
+                COLLECTION_ERRORS_TOTAL.labels(error_type="wifi").inc()
+
+            try:
+                await self._collect_client_details(clients_data, metrics)
+            except Exception as e:
+                self.logger.debug(f"Failed to collect detailed client data: {e}")
+                COLLECTION_ERRORS_TOTAL.labels(error_type="client_details").inc()
 
         try:
             await self._collect_sysinfo_wifi(metrics)
@@ -69,135 +105,164 @@ class WiFiCollector(BaseCollector):
 
         return metrics
 
-    async def _collect_wifi_metrics(self, metrics: dict[str, Any]):
+    def _should_poll_clients(self) -> bool:
+        """Whether the CLIENTS table is due, given the event-driven poll interval"""
+        if not self.clients_poll_interval or self._clients_dirty:
+            return True
+        return time.monotonic() - self._last_clients_poll >= self.clients_poll_interval
+
+    def apply_client_event(self, mac: str, online: bool) -> None:
+        """Apply a pushed association/DHCP event (upper-case MAC) before the next CLIENTS poll"""
+        record = self.clients.get(mac)
+        if record is None or record.mac not in self.clients.present:
+            # Unknown client: let the next cycle fetch its details
+            self._clients_dirty = True
+            return
+        if record.online == online:
+            return
+
+        old_labels = record.labels()
+        record.set_online(online)
+        self._set_client_series(record, {"online"})
+        diff = ClientDiff()
+        diff.changed.append((record, {"online"}, old_labels))
+        self.sessions.observe(diff)
+        # Band, rates and RSSI of the client are refreshed on the next cycle
+        self._clients_dirty = True
+
+    def _collect_wifi_metrics(self, wifi_data: dict[str, Any], metrics: dict[str, Any]):
         """Collect WiFi client metrics"""
-        wifi_data = await self.router.async_get_data(AsusData.CLIENTS)
-        if wifi_data:
-            total_clients = len(wifi_data)
-            WIFI_CLIENTS_TOTAL.set(total_clients)
-            metrics["wifi_clients_total"] = total_clients
-
-            # Count clients by band if available
-            bands = {}
-            for client in wifi_data.values():
-                if isinstance(client, dict) and "band" in client:
-                    band = str(client["band"])
-                    bands[band] = bands.get(band, 0) + 1
-
-            for band, count in bands.items():
-                WIFI_CLIENTS_BY_BAND.labels(band=band).set(count)
-                metrics[f"wifi_clients_band_{band}"] = count
-
-            self.logger.debug(f"WiFi clients: total={total_clients}, by band={bands}")
-
-    async def _collect_client_details(self, metrics: dict[str, Any]):
-        """Collect detailed client metrics including individual client data"""
-        clients_data = await self.router.async_get_data(AsusData.CLIENTS)
-        if clients_data:
-            # Count clients by connection type
-            connection_counts = {}
-            wifi_clients = 0
-            wired_clients = 0
-
-            for client_mac, client_info in clients_data.items():
-                if isinstance(client_info, dict):
-                    mac = str(client_mac)
-                    name = client_info.get("name", client_info.get("nickName", "Unknown"))[
-                        :50
-                    ]  # Limit name length
-
-                    # Determine connection type
-                    is_wireless = client_info.get("isWL", "0")
-                    # Handle both string and numeric representations
-                    is_wireless_str = str(is_wireless)
-                    if hasattr(is_wireless, "value"):
-                        is_wireless_str = str(is_wireless.value)
-
-                    connection_type = "unknown"
-
-                    if is_wireless_str == "0":
-                        connection_type = "wired"
-                        wired_clients += 1
-                    elif is_wireless_str == "1":
-                        connection_type = "wifi_2g"
-                        wifi_clients += 1
-                    elif is_wireless_str == "2":
-                        connection_type = "wifi_5g"
-                        wifi_clients += 1
-                    elif is_wireless_str == "3":
-                        connection_type = "wifi_6g"
-                        wifi_clients += 1
-
-                    connection_counts[connection_type] = (
-                        connection_counts.get(connection_type, 0) + 1
-                    )
-
-                    # Online status
-                    is_online = client_info.get("isOnline", "0")
-                    CLIENT_ONLINE.labels(mac=mac, name=name, connection_type=connection_type).set(
-                        1 if is_online == "1" else 0
-                    )
-
-                    # RSSI for wireless clients
-                    if is_wireless != "0" and "rssi" in client_info:
-                        try:
-                            rssi_value = float(client_info["rssi"])
-                            band = (
-                                "2g" if is_wireless == "1" else "5g" if is_wireless == "2" else "6g"
-                            )
-                            CLIENT_RSSI.labels(mac=mac, name=name, band=band).set(rssi_value)
-                        except (ValueError, TypeError):
-                            pass
-
-                    # TX rate
-                    if "curTx" in client_info and client_info["curTx"] is not None:
-                        try:
-                            tx_rate = float(client_info["curTx"])
-                            CLIENT_TX_RATE.labels(
-                                mac=mac, name=name, connection_type=connection_type
-                            ).set(tx_rate)
-                        except (ValueError, TypeError):
-                            pass
-
-                    # RX rate
-                    if "curRx" in client_info and client_info["curRx"] is not None:
-                        try:
-                            rx_rate = float(client_info["curRx"])
-                            CLIENT_RX_RATE.labels(
-                                mac=mac, name=name, connection_type=connection_type
-                            ).set(rx_rate)
-                        except (ValueError, TypeError):
-                            pass
-
-                    # Internet access state
-                    internet_state = client_info.get("internetState", "0")
-                    try:
-                        internet_value = int(internet_state)
-                        CLIENT_INTERNET_STATE.labels(
-                            mac=mac, name=name, connection_type=connection_type
-                        ).set(internet_value)
-                    except (ValueError, TypeError):
-                        pass
-
-            # Set connection type counts
-            for conn_type, count in connection_counts.items():
-                CLIENT_COUNT_BY_TYPE.labels(type=conn_type).set(count)
-                metrics[f"client_count_{conn_type}"] = count
-
-            # Set totals
-            CLIENT_COUNT_BY_TYPE.labels(type="wifi_total").set(wifi_clients)
-            CLIENT_COUNT_BY_TYPE.labels(type="wired_total").set(wired_clients)
-            CLIENT_COUNT_BY_TYPE.labels(type="total").set(len(clients_data))
-
-            metrics["wifi_clients_total_count"] = wifi_clients
-            metrics["wired_clients_total_count"] = wired_clients
-            metrics["total_clients_count"] = len(clients_data)
-
-            self.logger.debug(f"Collected detailed metrics for {len(clients_data)} clients")
+        total_clients = len(wifi_data)
+        WIFI_CLIENTS_TOTAL.set(total_clients)
+        metrics["wifi_clients_total"] = total_clients
+
+        # Count clients by band if available
+        bands = {}
+        for client in wifi_data.values():
+            if isinstance(client, dict) and "band" in client:
+                band = str(client["band"])
+                bands[band] = bands.get(band, 0) + 1
+
+        for band, count in bands.items():
+            WIFI_CLIENTS_BY_BAND.labels(band=band).set(count)
+            metrics[f"wifi_clients_band_{band}"] = count
+
+        self.log.debug("wifi_clients", total=total_clients, by_band=bands)
+
+    async def _collect_client_details(self, clients_data: dict[str, Any], metrics: dict[str, Any]):
+        """Collect detailed client metrics, only touching clients that changed"""
+        rows = client_rows(clients_data)
+        parsed = None
+        if self.parser.workers:
+            rows = list(rows)
+            pending = self.clients.pending(rows)
+            if self.parser.chunks(len(pending)) > 1:
+                # Large churn (startup, mass reconnect): parse the changed rows in the workers
+                results = await self.parser.map(parse_client_rows, pending)
+                parsed = {mac: result for (mac, _), result in zip(pending, results, strict=True)}
+        diff = self.clients.apply_rows(rows, parsed=parsed)
+
+        for record in diff.added:
+            self._set_client_series(record, None)
+            if self.vendors is not None:
+                if record.vendor is None:
+                    record.vendor = self.vendors.lookup(record.mac)
+                CLIENT_VENDOR.labels(mac=record.mac, vendor=record.vendor).set(1)
+        for record, changed, old_labels in diff.changed:
+            if old_labels != record.labels():
+                # Name or connection type changed: the old label set would go stale
+                self._remove_client_series(old_labels)
+                changed = None
+            self._set_client_series(record, changed)
+        for record in diff.removed:
+            self._remove_client_series(record.labels())
+            if record.vendor is not None:
+                with contextlib.suppress(KeyError):
+                    CLIENT_VENDOR.remove(record.mac, record.vendor)
+        self.sessions.observe(diff)
+        if self.inventory is not None:
+            self.inventory.observe(diff, self.clients)
+
+        # Count clients by connection type
+        connection_counts = {}
+        for record in self.clients:
+            connection_counts[record.connection_type] = (
+                connection_counts.get(record.connection_type, 0) + 1
+            )
+        wired_clients = connection_counts.get("wired", 0)
+        wifi_clients = sum(
+            count for conn_type, count in connection_counts.items() if conn_type.startswith("wifi")
+        )
+
+        # Set connection type counts
+        for conn_type, count in connection_counts.items():
+            CLIENT_COUNT_BY_TYPE.labels(type=conn_type).set(count)
+            metrics[f"client_count_{conn_type}"] = count
+
+        # Set totals
+        CLIENT_COUNT_BY_TYPE.labels(type="wifi_total").set(wifi_clients)
+        CLIENT_COUNT_BY_TYPE.labels(type="wired_total").set(wired_clients)
+        CLIENT_COUNT_BY_TYPE.labels(type="total").set(len(self.clients))
+
+        metrics["wifi_clients_total_count"] = wifi_clients
+        metrics["wired_clients_total_count"] = wired_clients
+        metrics["total_clients_count"] = len(self.clients)
+
+        # Per-band/per-node histograms and percentiles from the same parsed records
+        CLIENT_DISTRIBUTIONS.update(self.clients)
+
+        self.log.debug(
+            "client_details",
+            clients=len(self.clients),
+            new=len(diff.added),
+            changed=len(diff.changed),
+            gone=len(diff.removed),
+        )
+
+    @staticmethod
+    def _set_client_series(record: ClientRecord, changed: set[str] | None):
+        """Update the per-client gauges for the changed fields (all fields when None)"""
+        mac, name, connection_type = record.labels()
+
+        if changed is None or "online" in changed:
+            CLIENT_ONLINE.labels(mac=mac, name=name, connection_type=connection_type).set(
+                1 if record.online else 0
+            )
+        if record.is_wireless and (changed is None or "rssi" in changed):
+            if record.rssi is not None:
+                CLIENT_RSSI.labels(mac=mac, name=name, band=record.band).set(record.rssi)
+            else:
+                with contextlib.suppress(KeyError):
+                    CLIENT_RSSI.remove(mac, name, record.band)
+        for field, gauge in (
+            ("tx_rate", CLIENT_TX_RATE),
+            ("rx_rate", CLIENT_RX_RATE),
+            ("internet_state", CLIENT_INTERNET_STATE),
+        ):
+            if changed is not None and field not in changed:
+                continue
+            value = getattr(record, field)
+            if value is not None:
+                gauge.labels(mac=mac, name=name, connection_type=connection_type).set(value)
+            else:
+                # The router stopped reporting the value: drop it instead of exporting a stale one
+                with contextlib.suppress(KeyError):
+                    gauge.remove(mac, name, connection_type)
+
+    @staticmethod
+    def _remove_client_series(labels: tuple[str, str, str]):
+        """Drop every per-client series of a label set that is no longer current"""
+        mac, name, connection_type = labels
+        for gauge in (CLIENT_ONLINE, CLIENT_TX_RATE, CLIENT_RX_RATE, CLIENT_INTERNET_STATE):
+            with contextlib.suppress(KeyError):
+                gauge.remove(mac, name, connection_type)
+        if connection_type.startswith("wifi_"):
+            with contextlib.suppress(KeyError):
+                CLIENT_RSSI.remove(mac, name, connection_type.removeprefix("wifi_"))
 
     async def _collect_sysinfo_wifi(self, metrics: dict[str, Any]):
         """Collect WiFi client details from sysinfo"""
-        sysinfo_data = await self.router.async_get_data(AsusData.SYSINFO)
+        sysinfo_data = await self._get_data(AsusData.SYSINFO)
         if sysinfo_data:
             # WiFi client details by band
             wlan = sysinfo_data.get("wlan", {})
@@ -216,7 +281,7 @@ class WiFiCollector(BaseCollector):
     async def _collect_guest_wlan_metrics(self, metrics: dict[str, Any]):
         """Collect Guest WLAN metrics"""
         try:
-            gwlan_data = await self.router.async_get_data(AsusData.GWLAN)
+            gwlan_data = await self._get_data(AsusData.GWLAN)
             if gwlan_data:
                 for band, stats in gwlan_data.items():
                     if isinstance(stats, dict):
@@ -241,7 +306,7 @@ class WiFiCollector(BaseCollector):
     async def _collect_wlan_metrics(self, metrics: dict[str, Any]):
         """Collect WLAN (main WiFi) metrics"""
         try:
-            wlan_data = await self.router.async_get_data(AsusData.WLAN)
+            wlan_data = await self._get_data(AsusData.WLAN)
             if wlan_data:
                 for band, stats in wlan_data.items():
                     if isinstance(stats, dict):
@@ -4,7 +4,25 @@ Configuration module for the ASUS Router Prometheus Exporter
 
 import logging
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+
+def _env_list(name: str) -> list[str]:
+    """Read a comma-separated environment variable as a list of lowercase names"""
+    return [item.strip().lower() for item in os.getenv(name, "").split(",") if item.strip()]
+
+
+DEFAULT_SCRAPE_GROUPS = "fast=system,network,exporter;clients=wifi,hardware"
+
+
+def _parse_groups(value: str) -> dict[str, list[str]]:
+    """Parse "group=a,b;other=c" into group name -> lowercase names"""
+    groups = {}
+    for entry in value.split(";"):
+        group, _, names = entry.partition("=")
+        if group.strip():
+            groups[group.strip()] = [n.strip().lower() for n in names.split(",") if n.strip()]
+    return groups
 
 
 @dataclass
@@ -25,13 +43,124 @@ class ExporterConfig:
     # Exporter settings
     port: int = 8000
     collection_interval: int = 15
+    # Named subsets of collectors served at /metrics/<group>, for per-group scrape intervals
+    scrape_groups: dict[str, list[str]] = field(
+        default_factory=lambda: _parse_groups(DEFAULT_SCRAPE_GROUPS)
+    )
 
     # Logging settings
     log_level: str = "INFO"
+    log_format: str = "text"  # text or json
 
     # Cache settings
     cache_time: int = 5
 
+    # Collection filters: empty allowlists mean "everything", denylists win over allowlists
+    collectors: list[str] = field(default_factory=list)
+    disabled_collectors: list[str] = field(default_factory=list)
+    data_types: list[str] = field(default_factory=list)
+    disabled_data_types: list[str] = field(default_factory=list)
+    metrics: list[str] = field(default_factory=list)
+    disabled_metrics: list[str] = field(default_factory=list)
+
+    # Capability probing: skip data types the router model does not support
+    capability_probe: bool = True
+    capability_cache: str = "data/capabilities.json"
+
+    # Data sources: "http" (asusrouter), "ssh" (/proc and wl) or "fixture" (JSON replay),
+    # with per-data-type overrides such as ["cpu=ssh", "ram=ssh"]
+    data_source: str = "http"
+    data_source_routes: list[str] = field(default_factory=list)
+    data_source_record: bool = False
+    fixture_path: str = "data/fixture.json"
+    ssh_host: str = ""
+    ssh_port: int = 22
+    ssh_username: str = ""
+    ssh_key_path: str = ""
+
+    # Poll AiMesh satellites directly and in parallel, each with its own session
+    aimesh_direct: bool = False
+    aimesh_node_timeout: float = 10.0
+
+    # Fast poll of AsusData.PORTS alone between cycles (seconds, 0 = off) to catch link flaps
+    port_poll_interval: float = 0.0
+
+    # Worker processes for parsing large client and port tables off the event loop (0 = inline)
+    parse_workers: int = 0
+
+    # Streaming anomaly scoring of WAN rates, CPU usage and temperatures
+    anomaly_detection: bool = False
+    anomaly_half_life: float = 86400.0
+    anomaly_seasonal: bool = False
+    anomaly_state_path: str = "data/anomaly.json"
+
+    # Syslog receiver for real-time client association and WAN link events
+    syslog_enabled: bool = False
+    syslog_host: str = "0.0.0.0"
+    syslog_port: int = 5514
+    syslog_protocol: str = "udp"
+    syslog_clients_poll_interval: float = 60.0
+
+    # Active probes (tcp://host:port, http(s)://..., dns://[server]/name), empty = off
+    probe_targets: list[str] = field(default_factory=list)
+    probe_interval: float = 15.0
+    probe_timeout: float = 5.0
+    probe_concurrency: int = 256
+
+    # Client distributions: WiFi clients below this RSSI (dBm) are counted as weak
+    client_rssi_threshold: float = -70.0
+
+    # Admin endpoints are only enabled when a token is configured
+    admin_token: str = ""
+
+    # Enables the /debug profiling, heap and trace endpoints (Authorization: Bearer <token>)
+    debug_token: str = ""
+
+    # Shared key for router-side agents pushing samples to /api/ingest (empty = disabled)
+    ingest_key: str = ""
+
+    # Output settings: "http" serves /metrics, "remote_write" pushes each cycle,
+    # "textfile" writes a .prom file, "unix" serves over a Unix domain socket
+    output_mode: str = "http"
+
+    # Remote write settings (output_mode="remote_write")
+    remote_write_url: str = ""
+    remote_write_bearer_token: str = ""
+    remote_write_timeout: float = 10.0
+    remote_write_batch_size: int = 2000
+    remote_write_max_retries: int = 3
+    remote_write_wal_dir: str = "data/wal"
+    remote_write_wal_max_bytes: int = 64 * 1024 * 1024
+
+    # Textfile settings (output_mode="textfile")
+    textfile_path: str = "/var/lib/node_exporter/textfile_collector/asus_router.prom"
+    textfile_diff_write: bool = False
+
+    # Unix socket settings (output_mode="unix")
+    unix_socket_path: str = "/run/asus-exporter/metrics.sock"
+
+    # Process layout: single, split (collector and server processes under a supervisor),
+    # or one side alone (collector, server) sharing the snapshot through shared memory
+    process_mode: str = "single"
+    shm_name: str = "asus_exporter"
+    shm_size: int = 32 * 1024 * 1024
+
+    # Columnar history archive of each cycle's metrics and client table ("history" extra):
+    # raw hourly segments, compacted per day to history_resolution second buckets
+    history_enabled: bool = False
+    history_dir: str = "data/history"
+    history_retention_days: float = 90.0
+    history_raw_hours: float = 48.0
+    history_resolution: int = 300
+
+    # Vendor per client from a memory-mapped OUI index (python -m src.vendors.build)
+    client_vendors: bool = False
+    oui_index: str = ""
+
+    # Persistent SQLite inventory of every client seen, served at /api/clients
+    inventory_enabled: bool = False
+    inventory_path: str = "data/clients.db"
+
     @classmethod
     def from_env(cls) -> "ExporterConfig":
         """Create configuration from environment variables"""
@@ -52,13 +181,97 @@ class ExporterConfig:
             == "true",
             port=int(os.getenv("EXPORTER_PORT", "8000")),
             collection_interval=int(os.getenv("EXPORTER_COLLECTION_INTERVAL", "15")),
+            scrape_groups=_parse_groups(os.getenv("EXPORTER_SCRAPE_GROUPS", DEFAULT_SCRAPE_GROUPS)),
             log_level=os.getenv("EXPORTER_LOG_LEVEL", "INFO").upper(),
+            log_format=os.getenv("EXPORTER_LOG_FORMAT", "text").lower(),
             cache_time=int(os.getenv("EXPORTER_CACHE_TIME", "5")),
+            collectors=_env_list("EXPORTER_COLLECTORS"),
+            disabled_collectors=_env_list("EXPORTER_DISABLED_COLLECTORS"),
+            data_types=_env_list("EXPORTER_DATA_TYPES"),
+            disabled_data_types=_env_list("EXPORTER_DISABLED_DATA_TYPES"),
+            metrics=_env_list("EXPORTER_METRICS"),
+            disabled_metrics=_env_list("EXPORTER_DISABLED_METRICS"),
+            capability_probe=os.getenv("EXPORTER_CAPABILITY_PROBE", "true").lower() == "true",
+            capability_cache=os.getenv("EXPORTER_CAPABILITY_CACHE", "data/capabilities.json"),
+            data_source=os.getenv("EXPORTER_DATA_SOURCE", "http").lower(),
+            data_source_routes=_env_list("EXPORTER_DATA_SOURCE_ROUTES"),
+            data_source_record=os.getenv("EXPORTER_DATA_SOURCE_RECORD", "false").lower() == "true",
+            fixture_path=os.getenv("EXPORTER_FIXTURE_PATH", "data/fixture.json"),
+            ssh_host=os.getenv("EXPORTER_SSH_HOST", ""),
+            ssh_port=int(os.getenv("EXPORTER_SSH_PORT", "22")),
+            ssh_username=os.getenv("EXPORTER_SSH_USERNAME", ""),
+            ssh_key_path=os.getenv("EXPORTER_SSH_KEY_PATH", ""),
+            aimesh_direct=os.getenv("EXPORTER_AIMESH_DIRECT", "false").lower() == "true",
+            aimesh_node_timeout=float(os.getenv("EXPORTER_AIMESH_NODE_TIMEOUT", "10")),
+            port_poll_interval=float(os.getenv("EXPORTER_PORT_POLL_INTERVAL", "0")),
+            parse_workers=int(os.getenv("EXPORTER_PARSE_WORKERS", "0")),
+            anomaly_detection=os.getenv("EXPORTER_ANOMALY_DETECTION", "false").lower() == "true",
+            anomaly_half_life=float(os.getenv("EXPORTER_ANOMALY_HALF_LIFE", "86400")),
+            anomaly_seasonal=os.getenv("EXPORTER_ANOMALY_SEASONAL", "false").lower() == "true",
+            anomaly_state_path=os.getenv("EXPORTER_ANOMALY_STATE_PATH", "data/anomaly.json"),
+            syslog_enabled=os.getenv("EXPORTER_SYSLOG_ENABLED", "false").lower() == "true",
+            syslog_host=os.getenv("EXPORTER_SYSLOG_HOST", "0.0.0.0"),
+            syslog_port=int(os.getenv("EXPORTER_SYSLOG_PORT", "5514")),
+            syslog_protocol=os.getenv("EXPORTER_SYSLOG_PROTOCOL", "udp").lower(),
+            syslog_clients_poll_interval=float(
+                os.getenv("EXPORTER_SYSLOG_CLIENTS_POLL_INTERVAL", "60")
+            ),
+            # Not _env_list: URL paths are case-sensitive
+            probe_targets=[
+                item.strip()
+                for item in os.getenv("EXPORTER_PROBE_TARGETS", "").split(",")
+                if item.strip()
+            ],
+            probe_interval=float(os.getenv("EXPORTER_PROBE_INTERVAL", "15")),
+            probe_timeout=float(os.getenv("EXPORTER_PROBE_TIMEOUT", "5")),
+            probe_concurrency=int(os.getenv("EXPORTER_PROBE_CONCURRENCY", "256")),
+            client_rssi_threshold=float(os.getenv("EXPORTER_CLIENT_RSSI_THRESHOLD", "-70")),
+            admin_token=os.getenv("EXPORTER_ADMIN_TOKEN", ""),
+            debug_token=os.getenv("EXPORTER_DEBUG_TOKEN", ""),
+            ingest_key=os.getenv("EXPORTER_INGEST_KEY", ""),
+            output_mode=os.getenv("EXPORTER_OUTPUT_MODE", "http").lower(),
+            remote_write_url=os.getenv("EXPORTER_REMOTE_WRITE_URL", ""),
+            remote_write_bearer_token=os.getenv("EXPORTER_REMOTE_WRITE_BEARER_TOKEN", ""),
+            remote_write_timeout=float(os.getenv("EXPORTER_REMOTE_WRITE_TIMEOUT", "10")),
+            remote_write_batch_size=int(os.getenv("EXPORTER_REMOTE_WRITE_BATCH_SIZE", "2000")),
+            remote_write_max_retries=int(os.getenv("EXPORTER_REMOTE_WRITE_MAX_RETRIES", "3")),
+            remote_write_wal_dir=os.getenv("EXPORTER_REMOTE_WRITE_WAL_DIR", "data/wal"),
+            remote_write_wal_max_bytes=int(
+                os.getenv("EXPORTER_REMOTE_WRITE_WAL_MAX_BYTES", str(64 * 1024 * 1024))
+            ),
+            textfile_path=os.getenv(
+                "EXPORTER_TEXTFILE_PATH",
+                "/var/lib/node_exporter/textfile_collector/asus_router.prom",
+            ),
+            textfile_diff_write=os.getenv("EXPORTER_TEXTFILE_DIFF_WRITE", "false").lower()
+            == "true",
+            unix_socket_path=os.getenv(
+                "EXPORTER_UNIX_SOCKET_PATH", "/run/asus-exporter/metrics.sock"
+            ),
+            process_mode=os.getenv("EXPORTER_PROCESS_MODE", "single").lower(),
+            shm_name=os.getenv("EXPORTER_SHM_NAME", "asus_exporter"),
+            shm_size=int(os.getenv("EXPORTER_SHM_SIZE", str(32 * 1024 * 1024))),
+            history_enabled=os.getenv("EXPORTER_HISTORY_ENABLED", "false").lower() == "true",
+            history_dir=os.getenv("EXPORTER_HISTORY_DIR", "data/history"),
+            history_retention_days=float(os.getenv("EXPORTER_HISTORY_RETENTION_DAYS", "90")),
+            history_raw_hours=float(os.getenv("EXPORTER_HISTORY_RAW_HOURS", "48")),
+            history_resolution=int(os.getenv("EXPORTER_HISTORY_RESOLUTION", "300")),
+            client_vendors=os.getenv("EXPORTER_CLIENT_VENDORS", "false").lower() == "true",
+            oui_index=os.getenv("EXPORTER_OUI_INDEX", ""),
+            inventory_enabled=os.getenv("EXPORTER_INVENTORY_ENABLED", "false").lower() == "true",
+            inventory_path=os.getenv("EXPORTER_INVENTORY_PATH", "data/clients.db"),
         )
 
 
-def setup_logging(log_level: str) -> None:
+def setup_logging(log_level: str, log_format: str = "text") -> None:
     """Setup logging configuration"""
+    if log_format == "json":
+        from .log import JsonFormatter
+
+        handler = logging.StreamHandler()
+        handler.setFormatter(JsonFormatter())
+        logging.basicConfig(level=getattr(logging, log_level, logging.INFO), handlers=[handler])
+        return
     logging.basicConfig(
         level=getattr(logging, log_level, logging.INFO),
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -0,0 +1,5 @@
+"""Long-term columnar history of metrics and clients, kept outside Prometheus"""
+
+from .archive import HistoryArchive
+
+__all__ = ["HistoryArchive"]
@@ -0,0 +1,442 @@
+"""
+Append-only columnar archive of each cycle's metrics and client table.
+
+Every cycle is appended as one Arrow record batch to the current hour's raw segment.
+Once a whole day is older than the raw retention, its raw segments are compacted into
+one downsampled segment, and segments older than the retention are deleted. Queries only
+open segments whose time range, kept in index.json, overlaps the requested range.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import ipc
+
+from ..config import ExporterConfig
+from ..metrics.prometheus_metrics import HISTORY_BYTES, HISTORY_SEGMENTS
+
+logger = logging.getLogger(__name__)
+
+SCHEMAS = {
+    "metrics": pa.schema([("time", pa.float64()), ("name", pa.string()), ("value", pa.float64())]),
+    "clients": pa.schema(
+        [
+            ("time", pa.float64()),
+            ("mac", pa.string()),
+            ("name", pa.string()),
+            ("connection_type", pa.string()),
+            ("band", pa.string()),
+            ("node", pa.string()),
+            ("online", pa.float64()),
+            ("rssi", pa.float64()),
+            ("tx_rate", pa.float64()),
+            ("rx_rate", pa.float64()),
+        ]
+    ),
+}
+
+# Compaction per table: group keys besides the time bucket, then (column, aggregation).
+# The first aggregation of a column keeps its name, later ones are named after the function.
+DOWNSAMPLE = {
+    "metrics": (["name"], [("value", "mean"), ("value", "min"), ("value", "max")]),
+    "clients": (
+        ["mac"],
+        [
+            ("online", "mean"),
+            ("rssi", "mean"),
+            ("tx_rate", "mean"),
+            ("rx_rate", "mean"),
+            ("name", "last"),
+            ("connection_type", "last"),
+            ("band", "last"),
+            ("node", "last"),
+        ],
+    ),
+}
+
+WRITE_OPTIONS = ipc.IpcWriteOptions(compression="zstd")
+
+HOUR = 3600
+DAY = 86400
+
+
+def read_segment(path: Path) -> pa.Table | None:
+    """Every complete batch of a segment; a batch torn by a crash ends the read early"""
+    batches = []
+    try:
+        with pa.OSFile(str(path)) as source:
+            reader = ipc.open_stream(source)
+            schema = reader.schema
+            for batch in reader:
+                batches.append(batch)
+    except (OSError, pa.ArrowInvalid) as e:
+        if not batches:
+            if isinstance(e, FileNotFoundError):
+                raise
+            logger.warning(f"Skipping unreadable history segment {path.name}: {e}")
+            return None
+        logger.warning(f"History segment {path.name} ends in a torn batch, read {len(batches)}")
+    return pa.Table.from_batches(batches, schema=schema)
+
+
+def metric_columns(metrics: dict[str, Any]) -> dict[str, list]:
+    """Numeric entries of a cycle's all_metrics as name/value columns"""
+    names, values = [], []
+    for name, value in metrics.items():
+        if isinstance(value, (int, float)):
+            names.append(name)
+            values.append(float(value))
+    return {"name": names, "value": values}
+
+
+def client_columns(records: Iterable[Any]) -> dict[str, list]:
+    """Parsed client records (see collectors.clients) as columns"""
+    columns: dict[str, list] = {name: [] for name in SCHEMAS["clients"].names[1:]}
+    for record in records:
+        columns["mac"].append(record.mac)
+        columns["name"].append(record.name)
+        columns["connection_type"].append(record.connection_type)
+        columns["band"].append(record.band)
+        columns["node"].append(record.node)
+        columns["online"].append(1.0 if record.online else 0.0)
+        columns["rssi"].append(record.rssi)
+        columns["tx_rate"].append(record.tx_rate)
+        columns["rx_rate"].append(record.rx_rate)
+    return columns
+
+
+def downsample(table_name: str, table: pa.Table, resolution: int) -> pa.Table:
+    """Aggregate rows into time buckets of resolution seconds, per DOWNSAMPLE"""
+    keys, aggregations = DOWNSAMPLE[table_name]
+    buckets = pc.multiply(pc.floor(pc.divide(table["time"], resolution)), resolution)
+    table = table.set_column(0, "time", buckets)
+    # Ordered aggregations ("last") need a single thread
+    grouped = table.group_by(["time", *keys], use_threads=False).aggregate(aggregations)
+
+    columns = {name: grouped[name] for name in ["time", *keys]}
+    for column, function in aggregations:
+        columns[column if column not in columns else function] = grouped[f"{column}_{function}"]
+    # Raw column order first, so raw and compacted rows read the same
+    order = [name for name in SCHEMAS[table_name].names if name in columns]
+    order += [name for name in columns if name not in order]
+    return pa.table([columns[name] for name in order], names=order).sort_by("time")
+
+
+class _ActiveSegment:
+    """The raw segment currently appended to for one table"""
+
+    __slots__ = ("entry", "path", "sink", "writer")
+
+    def __init__(self, path: Path, entry: dict[str, Any], schema: pa.Schema):
+        self.path = path
+        self.entry = entry
+        self.sink = pa.OSFile(str(path), "wb")
+        self.writer = ipc.new_stream(self.sink, schema, options=WRITE_OPTIONS)
+
+    def append(self, batch: pa.RecordBatch, now: float) -> None:
+        self.writer.write_batch(batch)
+        self.entry["end"] = now
+        self.entry["rows"] += batch.num_rows
+        self.entry["bytes"] = self.sink.tell()
+
+    def close(self) -> None:
+        self.writer.close()
+        self.entry["bytes"] = self.sink.tell()
+        self.sink.close()
+
+
+class HistoryArchive:
+    """
+    Hourly raw segments plus daily downsampled segments per table, and the segment
+    index used to answer time-range queries. Appends run on the event loop; compaction,
+    retention and queries run in worker threads.
+    """
+
+    def __init__(self, config: ExporterConfig):
+        self.directory = Path(config.history_dir)
+        self.retention = config.history_retention_days * DAY
+        self.raw_retention = config.history_raw_hours * HOUR
+        self.resolution = config.history_resolution
+        self.index_path = self.directory / "index.json"
+        self.entries: list[dict[str, Any]] = []
+        self.active: dict[str, _ActiveSegment] = {}
+        self.maintenance: asyncio.Task | None = None
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def start(self) -> None:
+        """Load the index, adopting segments a crashed run left unindexed"""
+        for table in SCHEMAS:
+            (self.directory / table).mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(self._load_index)
+        self.logger.info(
+            f"History archive in {self.directory}: {len(self.entries)} segments, "
+            f"{self.retention / DAY:.0f} days retention"
+        )
+        self._schedule_maintenance()
+
+    def append(
+        self, metrics: dict[str, Any], clients: Iterable[Any], now: float | None = None
+    ) -> None:
+        """Append one cycle's metrics and client table"""
+        now = time.time() if now is None else now
+        rotated = False
+        for table, columns in (
+            ("metrics", metric_columns(metrics)),
+            ("clients", client_columns(clients)),
+        ):
+            rows = len(next(iter(columns.values())))
+            if not rows:
+                continue
+            segment = self.active.get(table)
+            if segment is not None and segment.entry["start"] // HOUR != now // HOUR:
+                self._seal(table)
+                segment = None
+                rotated = True
+            if segment is None:
+                segment = self._open(table, now)
+            times = pa.array([now] * rows, pa.float64())
+            segment.append(pa.record_batch([times, *columns.values()], schema=SCHEMAS[table]), now)
+        self._update_gauges()
+        if rotated:
+            self._schedule_maintenance()
+
+    def query(
+        self,
+        table: str,
+        start: float,
+        end: float,
+        name: str | None = None,
+        mac: str | None = None,
+        limit: int = 10000,
+    ) -> dict[str, Any]:
+        """Rows of one table between start and end, oldest first (blocking: use a thread)"""
+        if table not in SCHEMAS:
+            raise ValueError(f"Unknown history table: {table}")
+        for attempt in range(2):
+            segments = self._overlapping(table, start, end)
+            try:
+                tables = [self._read_filtered(entry, start, end, name, mac) for entry in segments]
+                break
+            except FileNotFoundError:
+                # Compaction replaced a segment while reading: retry with the new index
+                if attempt:
+                    raise
+        tables = [t for t in tables if t is not None and t.num_rows]
+        result = {"table": table, "start": start, "end": end, "segments": len(segments)}
+        if not tables:
+            return {**result, "rows": [], "truncated": False}
+        rows = pa.concat_tables(tables, promote_options="default").sort_by("time")
+        return {
+            **result,
+            "rows": rows.slice(0, limit).to_pylist(),
+            "truncated": rows.num_rows > limit,
+        }
+
+    async def close(self) -> None:
+        """Finish maintenance and seal the active segments"""
+        if self.maintenance:
+            await self.maintenance
+        for table in list(self.active):
+            self._seal(table)
+
+    def _open(self, table: str, now: float) -> _ActiveSegment:
+        entry = {
+            "table": table,
+            "file": f"{table}/raw-{int(now)}.arrow",
+            "start": now,
+            "end": now,
+            "rows": 0,
+            "bytes": 0,
+            "resolution": 0,
+        }
+        segment = _ActiveSegment(self.directory / entry["file"], entry, SCHEMAS[table])
+        self.active[table] = segment
+        return segment
+
+    def _seal(self, table: str) -> None:
+        segment = self.active.pop(table)
+        segment.close()
+        with self._lock:
+            self.entries.append(segment.entry)
+            self._save_index()
+
+    def _overlapping(self, table: str, start: float, end: float) -> list[dict[str, Any]]:
+        """Index entries (and the active segment) of a table that overlap [start, end]"""
+        with self._lock:
+            entries = [entry for entry in self.entries if entry["table"] == table]
+        if table in self.active:
+            entries.append(dict(self.active[table].entry))
+        return sorted(
+            (entry for entry in entries if entry["end"] >= start and entry["start"] <= end),
+            key=lambda entry: entry["start"],
+        )
+
+    def _read_filtered(
+        self,
+        entry: dict[str, Any],
+        start: float,
+        end: float,
+        name: str | None,
+        mac: str | None,
+    ) -> pa.Table | None:
+        table = read_segment(self.directory / entry["file"])
+        if table is None:
+            return None
+        mask = pc.and_(pc.greater_equal(table["time"], start), pc.less_equal(table["time"], end))
+        is_clients = "mac" in table.column_names
+        if name:
+            # Metric names match by prefix (port_, wifi_...), client names exactly
+            names = table["name"]
+            matches = pc.equal(names, name) if is_clients else pc.starts_with(names, name)
+            mask = pc.and_(mask, matches)
+        if mac and is_clients:
+            mask = pc.and_(mask, pc.equal(pc.utf8_lower(table["mac"]), mac.lower()))
+        return table.filter(mask)
+
+    def _load_index(self) -> None:
+        entries = []
+        if self.index_path.exists():
+            try:
+                entries = json.loads(self.index_path.read_text())["segments"]
+            except (OSError, ValueError, KeyError) as e:
+                self.logger.warning(f"Rebuilding unreadable history index: {e}")
+        known = {entry["file"] for entry in entries}
+        entries = [entry for entry in entries if (self.directory / entry["file"]).exists()]
+        for table in SCHEMAS:
+            for path in sorted((self.directory / table).glob("*.arrow")):
+                relative = f"{table}/{path.name}"
+                if relative not in known:
+                    entry = self._describe(table, path)
+                    if entry:
+                        entries.append(entry)
+        with self._lock:
+            self.entries = entries
+            self._save_index()
+        self._update_gauges()
+
+    def _describe(self, table: str, path: Path) -> dict[str, Any] | None:
+        """Index entry of a segment found on disk but missing from the index"""
+        data = read_segment(path)
+        if data is None or not data.num_rows:
+            path.unlink(missing_ok=True)
+            return None
+        resolution = 0 if path.name.startswith("raw-") else int(path.name.split("s-")[0])
+        return {
+            "table": table,
+            "file": f"{table}/{path.name}",
+            "start": pc.min(data["time"]).as_py(),
+            "end": pc.max(data["time"]).as_py(),
+            "rows": data.num_rows,
+            "bytes": path.stat().st_size,
+            "resolution": resolution,
+        }
+
+    def _save_index(self) -> None:
+        """Write the index atomically; callers hold the lock"""
+        tmp_path = self.index_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"segments": self.entries}, indent=1))
+        os.replace(tmp_path, self.index_path)
+
+    def _schedule_maintenance(self) -> None:
+        if self.maintenance is None or self.maintenance.done():
+            self.maintenance = asyncio.create_task(asyncio.to_thread(self._maintain))
+
+    def _maintain(self, now: float | None = None) -> None:
+        """Compact raw days past the raw retention and drop segments past the retention"""
+        now = time.time() if now is None else now
+        try:
+            self._compact(now)
+            self._expire(now)
+        except Exception as e:
+            self.logger.error(f"History maintenance failed: {e}")
+        self._update_gauges()
+
+    def _compact(self, now: float) -> None:
+        cutoff = now - self.raw_retention
+        with self._lock:
+            raw = [entry for entry in self.entries if entry["resolution"] == 0]
+        days: dict[tuple[str, int], list[dict[str, Any]]] = {}
+        for entry in raw:
+            day = int(entry["start"] // DAY) * DAY
+            if day + DAY <= cutoff:
+                days.setdefault((entry["table"], day), []).append(entry)
+
+        for (table, day), entries in sorted(days.items()):
+            entries.sort(key=lambda entry: entry["start"])
+            parts = [read_segment(self.directory / entry["file"]) for entry in entries]
+            parts = [part for part in parts if part is not None and part.num_rows]
+            file = f"{table}/{self.resolution}s-{day}.arrow"
+            path = self.directory / file
+            compacted = []
+            if parts:
+                compacted.append(downsample(table, pa.concat_tables(parts), self.resolution))
+            if path.exists() and compacted:
+                # A late raw segment for a day compacted before: merge into it
+                existing = read_segment(path)
+                if existing is not None:
+                    compacted.insert(0, existing)
+            if compacted:
+                data = pa.concat_tables(compacted, promote_options="default").sort_by("time")
+                tmp_path = path.with_suffix(".tmp")
+                with (
+                    pa.OSFile(str(tmp_path), "wb") as sink,
+                    ipc.new_stream(sink, data.schema, options=WRITE_OPTIONS) as writer,
+                ):
+                    writer.write_table(data)
+                os.replace(tmp_path, path)
+            with self._lock:
+                self.entries = [
+                    entry
+                    for entry in self.entries
+                    if entry not in entries and entry["file"] != file
+                ]
+                if compacted:
+                    self.entries.append(
+                        {
+                            "table": table,
+                            "file": file,
+                            "start": pc.min(data["time"]).as_py(),
+                            "end": pc.max(data["time"]).as_py(),
+                            "rows": data.num_rows,
+                            "bytes": path.stat().st_size,
+                            "resolution": self.resolution,
+                        }
+                    )
+                self._save_index()
+            for entry in entries:
+                (self.directory / entry["file"]).unlink(missing_ok=True)
+            self.logger.info(
+                f"Compacted {len(entries)} raw {table} segments of "
+                f"{time.strftime('%Y-%m-%d', time.gmtime(day))}"
+            )
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.retention
+        with self._lock:
+            expired = [entry for entry in self.entries if entry["end"] < cutoff]
+            if not expired:
+                return
+            self.entries = [entry for entry in self.entries if entry["end"] >= cutoff]
+            self._save_index()
+        for entry in expired:
+            (self.directory / entry["file"]).unlink(missing_ok=True)
+        self.logger.info(f"Removed {len(expired)} history segments past the retention")
+
+    def _update_gauges(self) -> None:
+        with self._lock:
+            entries = list(self.entries)
+        entries.extend(segment.entry for segment in self.active.values())
+        for table in SCHEMAS:
+            mine = [entry for entry in entries if entry["table"] == table]
+            HISTORY_SEGMENTS.labels(table=table).set(len(mine))
+            HISTORY_BYTES.labels(table=table).set(sum(entry["bytes"] for entry in mine))
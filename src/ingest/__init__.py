@@ -0,0 +1,6 @@
+"""Ingest package for router data pushed to the exporter instead of polled"""
+
+from .push import PushIngestor, parse_line_protocol
+from .syslog import SyslogReceiver, parse_syslog_line
+
+__all__ = ["PushIngestor", "SyslogReceiver", "parse_line_protocol", "parse_syslog_line"]
@@ -0,0 +1,126 @@
+"""Line-protocol ingestion for samples pushed by a router-side agent"""
+
+import contextlib
+import logging
+import time
+from typing import NamedTuple
+
+from prometheus_client import REGISTRY
+
+from ..metrics.prometheus_metrics import (
+    CPU_USAGE,
+    INGEST_SAMPLES_TOTAL,
+    LOAD_AVERAGE,
+    PUSH_FAMILIES,
+    PUSH_INTERFACE_RX_BYTES,
+    PUSH_INTERFACE_TX_BYTES,
+    PUSH_WAN_RX_BYTES,
+    PUSH_WAN_RX_RATE,
+    PUSH_WAN_TX_BYTES,
+    PUSH_WAN_TX_RATE,
+)
+
+logger = logging.getLogger(__name__)
+
+# Largest accepted push body; an agent sends a few hundred bytes per interval
+MAX_PAYLOAD_BYTES = 64 * 1024
+
+
+class PushSample(NamedTuple):
+    """One line: "<measurement>[,tag=value...] field=value[,field=value...] [timestamp]" """
+
+    measurement: str
+    tags: dict[str, str]
+    fields: dict[str, float]
+
+
+def parse_line_protocol(text: str) -> list[PushSample]:
+    """Parse a push body, raising ValueError on the first malformed line"""
+    samples = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.split()
+        if len(parts) not in (2, 3):
+            raise ValueError(f"line {number}: expected '<measurement> <fields> [timestamp]'")
+
+        measurement, *tag_pairs = parts[0].split(",")
+        try:
+            tags = dict(pair.split("=", 1) for pair in tag_pairs)
+            fields = {
+                key: float(value)
+                for key, value in (pair.split("=", 1) for pair in parts[1].split(","))
+            }
+        except ValueError:
+            raise ValueError(f"line {number}: malformed tags or fields") from None
+        samples.append(PushSample(measurement, tags, fields))
+    return samples
+
+
+class PushIngestor:
+    """
+    Applies pushed samples: load and CPU go to the families SystemCollector fills,
+    interface counters to the separate asus_push_* families.
+    """
+
+    def __init__(self):
+        # interface -> (rx bytes, tx bytes, monotonic time) for WAN rate derivation
+        self._last_wan: dict[str, tuple[float, float, float]] = {}
+        for family in PUSH_FAMILIES:
+            # Already registered by an earlier ingestor in this process
+            with contextlib.suppress(ValueError):
+                REGISTRY.register(family)
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def ingest(self, text: str, now: float | None = None) -> int:
+        """Apply a push body and return the number of samples used"""
+        now = time.monotonic() if now is None else now
+        used = 0
+        for sample in parse_line_protocol(text):
+            handler = getattr(self, f"_apply_{sample.measurement}", None)
+            if handler is None or not handler(sample, now):
+                continue
+            INGEST_SAMPLES_TOTAL.labels(measurement=sample.measurement).inc()
+            used += 1
+        return used
+
+    def _apply_net(self, sample: PushSample, now: float) -> bool:
+        """net,if=<interface>[,role=wan] rx=<bytes>,tx=<bytes>"""
+        interface = sample.tags.get("if")
+        rx, tx = sample.fields.get("rx"), sample.fields.get("tx")
+        if not interface or rx is None or tx is None:
+            return False
+        # Counters mirror the kernel's cumulative totals
+        PUSH_INTERFACE_RX_BYTES.labels(interface=interface)._value.set(rx)
+        PUSH_INTERFACE_TX_BYTES.labels(interface=interface)._value.set(tx)
+
+        if sample.tags.get("role") == "wan":
+            PUSH_WAN_RX_BYTES._value.set(rx)
+            PUSH_WAN_TX_BYTES._value.set(tx)
+            previous = self._last_wan.get(interface)
+            self._last_wan[interface] = (rx, tx, now)
+            if previous:
+                elapsed = now - previous[2]
+                rx_delta, tx_delta = rx - previous[0], tx - previous[1]
+                # Skip the interval after a counter reset or wrap
+                if elapsed > 0 and rx_delta >= 0 and tx_delta >= 0:
+                    PUSH_WAN_RX_RATE.set(rx_delta / elapsed)
+                    PUSH_WAN_TX_RATE.set(tx_delta / elapsed)
+        return True
+
+    def _apply_load(self, sample: PushSample, _now: float) -> bool:
+        """load 1m=<avg>,5m=<avg>,15m=<avg>"""
+        applied = False
+        for period in ("1m", "5m", "15m"):
+            if period in sample.fields:
+                LOAD_AVERAGE.labels(period=period).set(sample.fields[period])
+                applied = True
+        return applied
+
+    def _apply_cpu(self, sample: PushSample, _now: float) -> bool:
+        """cpu usage=<percent>"""
+        if "usage" not in sample.fields:
+            return False
+        CPU_USAGE.set(max(sample.fields["usage"], 0.0))
+        return True
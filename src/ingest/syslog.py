@@ -0,0 +1,152 @@
+"""Syslog receiver turning Asuswrt log lines into real-time client and WAN updates"""
+
+import asyncio
+import logging
+import re
+from typing import TYPE_CHECKING, NamedTuple
+
+from ..config import ExporterConfig
+from ..metrics.prometheus_metrics import SYSLOG_EVENTS_TOTAL
+
+if TYPE_CHECKING:
+    from ..collectors.manager import MetricsCollectorManager
+
+logger = logging.getLogger(__name__)
+
+_MAC = r"(?P<mac>[0-9A-Fa-f]{2}(?::[0-9A-Fa-f]{2}){5})"
+
+# wlceventd_proc_event(530): eth6: Assoc AA:BB:CC:DD:EE:FF, status: Successful (0), rssi:-55
+WLCEVENTD_PATTERN = re.compile(
+    r"wlceventd(?:\[\d+\])?:\s+wlceventd_proc_event\(\d+\):\s+(?P<iface>[\w.-]+):\s+"
+    r"(?P<event>ReAssoc|Assoc|Auth|Deauth_ind|Deauth|Disassoc_ind|Disassoc)\s+" + _MAC
+)
+# dnsmasq-dhcp[1234]: DHCPACK(br0) 192.168.1.50 aa:bb:cc:dd:ee:ff hostname
+DHCP_PATTERN = re.compile(
+    r"dnsmasq-dhcp(?:\[\d+\])?:\s+(?P<event>DHCPACK|DHCPRELEASE)\([\w.-]+\)\s+"
+    r"(?P<ip>[\d.]+)\s+" + _MAC
+)
+# WAN(0) Connection: WAN(0) link down. / WAN Connection: WAN was restored.
+WAN_PATTERN = re.compile(
+    r"WAN(?:\(\d+\))?[ _]Connection:.*?"
+    r"(?P<event>link down|link up|exceptionally disconnected|disconnected|restored|is connected)",
+    re.IGNORECASE,
+)
+CLIENT_ONLINE_EVENTS = {"Assoc", "ReAssoc", "DHCPACK"}
+CLIENT_OFFLINE_EVENTS = {"Deauth", "Deauth_ind", "Disassoc", "Disassoc_ind", "DHCPRELEASE"}
+WAN_DOWN_EVENTS = {"link down", "exceptionally disconnected", "disconnected"}
+
+MAX_LINE_BYTES = 8192
+# Largest octet-counted TCP frame accepted before the connection is dropped
+MAX_FRAME_BYTES = 65536
+
+
+class SyslogEvent(NamedTuple):
+    """A parsed log line: program, event name and the upper-cased client MAC if any"""
+
+    program: str
+    event: str
+    mac: str | None = None
+
+
+def parse_syslog_line(line: str) -> SyslogEvent | None:
+    """Match a syslog line against the known Asuswrt patterns"""
+    if "wlceventd" in line:
+        match = WLCEVENTD_PATTERN.search(line)
+        if match:
+            return SyslogEvent("wlceventd", match["event"], match["mac"].upper())
+    elif "dnsmasq-dhcp" in line:
+        match = DHCP_PATTERN.search(line)
+        if match:
+            return SyslogEvent("dnsmasq-dhcp", match["event"], match["mac"].upper())
+    elif "WAN" in line:
+        match = WAN_PATTERN.search(line)
+        if match:
+            return SyslogEvent("wan", match["event"].lower())
+    return None
+
+
+class _UdpProtocol(asyncio.DatagramProtocol):
+    def __init__(self, receiver: "SyslogReceiver"):
+        self.receiver = receiver
+
+    def datagram_received(self, data: bytes, _addr) -> None:
+        self.receiver.handle_message(data)
+
+
+class SyslogReceiver:
+    """
+    Listens for syslog over UDP and/or TCP and applies client association and WAN
+    link events to the collectors immediately instead of waiting for the next poll.
+    """
+
+    def __init__(self, config: ExporterConfig, collector_manager: "MetricsCollectorManager"):
+        self.host = config.syslog_host
+        self.port = config.syslog_port
+        self.protocol = config.syslog_protocol
+        self.collector_manager = collector_manager
+        self.transport: asyncio.DatagramTransport | None = None
+        self.server: asyncio.AbstractServer | None = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def start(self) -> None:
+        """Bind the configured listeners"""
+        loop = asyncio.get_running_loop()
+        if self.protocol in ("udp", "both"):
+            self.transport, _ = await loop.create_datagram_endpoint(
+                lambda: _UdpProtocol(self), local_addr=(self.host, self.port)
+            )
+        if self.protocol in ("tcp", "both"):
+            self.server = await asyncio.start_server(self._handle_tcp, self.host, self.port)
+        self.logger.info(f"Syslog receiver listening on {self.host}:{self.port} ({self.protocol})")
+
+    async def close(self) -> None:
+        """Stop listening"""
+        if self.transport:
+            self.transport.close()
+            self.transport = None
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    async def _handle_tcp(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Read newline-delimited or octet-counted (RFC 6587) messages from one sender"""
+        try:
+            while True:
+                try:
+                    token = await reader.readuntil(b" ")
+                except asyncio.IncompleteReadError:
+                    break
+                if token[:-1].isdigit():
+                    # "<length> <message>" framing, the message may contain newlines
+                    length = int(token[:-1])
+                    if length > MAX_FRAME_BYTES:
+                        self.logger.debug(f"Dropping syslog sender with {length} byte frame")
+                        break
+                    self.handle_message(await reader.readexactly(length))
+                else:
+                    for line in (token + await reader.readline()).splitlines():
+                        self.handle_message(line)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError) as e:
+            self.logger.debug(f"Syslog TCP connection ended: {e}")
+        finally:
+            writer.close()
+
+    def handle_message(self, data: bytes) -> None:
+        """Parse one message and forward any recognised event"""
+        line = data[:MAX_LINE_BYTES].decode("utf-8", errors="replace").strip()
+        event = parse_syslog_line(line)
+        if event is None:
+            return
+        SYSLOG_EVENTS_TOTAL.labels(program=event.program, event=event.event).inc()
+        self.apply(event)
+
+    def apply(self, event: SyslogEvent) -> None:
+        """Update client presence or WAN status from an event"""
+        if event.mac:
+            if event.event in CLIENT_ONLINE_EVENTS:
+                self.collector_manager.apply_client_event(event.mac, True)
+            elif event.event in CLIENT_OFFLINE_EVENTS:
+                self.collector_manager.apply_client_event(event.mac, False)
+        elif event.program == "wan":
+            self.collector_manager.apply_wan_event(event.event not in WAN_DOWN_EVENTS)
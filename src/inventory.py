@@ -0,0 +1,189 @@
+"""Persistent client inventory in SQLite: full names and first/last seen per MAC"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clients (
+    mac TEXT PRIMARY KEY COLLATE NOCASE,
+    name TEXT NOT NULL COLLATE NOCASE,
+    connection_type TEXT NOT NULL,
+    band TEXT,
+    node TEXT NOT NULL,
+    online INTEGER NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS clients_name ON clients (name);
+CREATE INDEX IF NOT EXISTS clients_last_seen ON clients (last_seen);
+"""
+
+# first_seen is kept from the first insert; last_seen only moves while the client is online
+UPSERT = """
+INSERT INTO clients (mac, name, connection_type, band, node, online, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (mac) DO UPDATE SET
+    name = excluded.name,
+    connection_type = excluded.connection_type,
+    band = excluded.band,
+    node = excluded.node,
+    online = excluded.online,
+    last_seen = CASE WHEN excluded.online THEN excluded.last_seen ELSE clients.last_seen END
+"""
+
+COLUMNS = ("mac", "name", "connection_type", "band", "node", "online", "first_seen", "last_seen")
+
+# Unchanged online clients get their last_seen rewritten at most this often (seconds)
+LAST_SEEN_RESOLUTION = 60.0
+
+MAX_LIMIT = 10000
+
+
+class ClientInventory:
+    """
+    Every client ever seen, keyed by MAC. The WiFi collector queues each cycle's changes
+    and flush() writes them in a single transaction from a worker thread. WAL mode lets
+    queries (also from the server process in split mode) read while a cycle is written.
+    """
+
+    def __init__(self, path: str, readonly: bool = False):
+        self.path = Path(path)
+        self.readonly = readonly
+        self.connection: sqlite3.Connection | None = None
+        self._rows: dict[str, tuple] = {}
+        self._written: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def _connect(self) -> sqlite3.Connection | None:
+        if self.connection is None:
+            if self.readonly:
+                if not self.path.exists():
+                    return None
+                self.connection = sqlite3.connect(
+                    f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+                )
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self.connection = sqlite3.connect(self.path, check_same_thread=False)
+                self.connection.execute("PRAGMA journal_mode=WAL")
+                self.connection.execute("PRAGMA synchronous=NORMAL")
+                self.connection.executescript(SCHEMA)
+            self.connection.row_factory = sqlite3.Row
+        return self.connection
+
+    def observe(self, diff: Any, records: Any, now: float | None = None) -> None:
+        """Queue a cycle's client diff; unchanged online clients only refresh last_seen"""
+        now = time.time() if now is None else now
+        rows = self._rows
+        for record in diff.added:
+            rows[record.mac] = self._row(record, now)
+        for record, _, _ in diff.changed:
+            rows[record.mac] = self._row(record, now)
+        for record in diff.removed:
+            rows[record.mac] = self._row(record, now, online=False)
+        written = self._written
+        for record in records:
+            if (
+                record.online
+                and record.mac not in rows
+                and now - written.get(record.mac, 0.0) >= LAST_SEEN_RESOLUTION
+            ):
+                rows[record.mac] = self._row(record, now)
+
+    @staticmethod
+    def _row(record: Any, now: float, online: bool | None = None) -> tuple:
+        online = record.online if online is None else online
+        return (
+            record.mac,
+            record.full_name,
+            record.connection_type,
+            record.band,
+            record.node,
+            int(online),
+            now,
+            now,
+        )
+
+    async def flush(self) -> None:
+        """Write the queued rows in one transaction"""
+        if not self._rows:
+            return
+        rows, self._rows = list(self._rows.values()), {}
+        await asyncio.to_thread(self._write, rows)
+        for row in rows:
+            if row[5]:
+                self._written[row[0]] = row[-1]
+            else:
+                self._written.pop(row[0], None)
+
+    def _write(self, rows: list[tuple]) -> None:
+        start = time.perf_counter()
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(UPSERT, rows)
+        self.logger.debug(
+            f"Wrote {len(rows)} inventory rows in {(time.perf_counter() - start) * 1e3:.1f}ms"
+        )
+
+    def query(
+        self,
+        seen_since: float | None = None,
+        band: str | None = None,
+        node: str | None = None,
+        mac: str | None = None,
+        name: str | None = None,
+        online: bool | None = None,
+        limit: int = 1000,
+    ) -> list[dict[str, Any]]:
+        """Clients matching every given filter, most recently seen first (blocking)"""
+        clauses, params = [], []
+        if seen_since is not None:
+            clauses.append("last_seen >= ?")
+            params.append(seen_since)
+        if band:
+            clauses.append("band = ?")
+            params.append(band)
+        if node:
+            clauses.append("node = ?")
+            params.append(node)
+        if mac:
+            clauses.append("mac = ?")
+            params.append(mac)
+        if name:
+            # Prefix match, case-insensitive, served by the name index
+            clauses.append("name LIKE ? ESCAPE '\\'")
+            escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"{escaped}%")
+        if online is not None:
+            clauses.append("online = ?")
+            params.append(int(online))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT {', '.join(COLUMNS)} FROM clients {where} ORDER BY last_seen DESC LIMIT ?"
+        params.append(max(1, min(limit, MAX_LIMIT)))
+
+        with self._lock:
+            connection = self._connect()
+            if connection is None:
+                return []
+            try:
+                rows = connection.execute(sql, params).fetchall()
+            except sqlite3.OperationalError as e:
+                # Read-only side before the collector created the table
+                self.logger.debug(f"Inventory query failed: {e}")
+                return []
+        return [{**dict(row), "online": bool(row["online"])} for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
@@ -0,0 +1,96 @@
+"""Structured, level-guarded event logging for hot paths and the JSON log formatter"""
+
+import json
+import logging
+import time
+from typing import Any
+
+
+class _Event:
+    """Log message that is only rendered when a handler formats the record"""
+
+    __slots__ = ("fields", "name")
+
+    def __init__(self, name: str, fields: dict[str, Any]):
+        self.name = name
+        self.fields = fields
+
+    def __str__(self) -> str:
+        if not self.fields:
+            return self.name
+        return self.name + " " + " ".join(f"{key}={value}" for key, value in self.fields.items())
+
+
+class EventLogger:
+    """
+    Logs named events with keyword fields on top of a stdlib logger. The level is checked
+    before anything is built, callable field values are only called once the event is
+    emitted, and every=N keeps a repeating event to one line per N seconds (reporting how
+    many were suppressed). Message text is rendered by the handler, so with DEBUG disabled
+    a debug event costs one cached level check.
+    """
+
+    __slots__ = ("_last_emitted", "_suppressed", "logger")
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self._last_emitted: dict[str, float] = {}
+        self._suppressed: dict[str, int] = {}
+
+    def enabled(self, level: int = logging.DEBUG) -> bool:
+        """Guard for call sites that need work beyond the fields themselves"""
+        return self.logger.isEnabledFor(level)
+
+    def debug(self, event: str, /, every: float = 0, **fields: Any) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._emit(logging.DEBUG, event, every, fields)
+
+    def info(self, event: str, /, every: float = 0, **fields: Any) -> None:
+        if self.logger.isEnabledFor(logging.INFO):
+            self._emit(logging.INFO, event, every, fields)
+
+    def warning(self, event: str, /, every: float = 0, **fields: Any) -> None:
+        if self.logger.isEnabledFor(logging.WARNING):
+            self._emit(logging.WARNING, event, every, fields)
+
+    def _emit(self, level: int, event: str, every: float, fields: dict[str, Any]) -> None:
+        if every:
+            now = time.monotonic()
+            if now - self._last_emitted.get(event, -every) < every:
+                self._suppressed[event] = self._suppressed.get(event, 0) + 1
+                return
+            self._last_emitted[event] = now
+            suppressed = self._suppressed.pop(event, 0)
+            if suppressed:
+                fields["suppressed"] = suppressed
+
+        for key, value in fields.items():
+            if callable(value):
+                fields[key] = value()
+        # stacklevel=3 attributes the record to the collector line, not this module
+        self.logger.log(
+            level,
+            _Event(event, fields),
+            extra={"event": event, "fields": fields},
+            stacklevel=3,
+        )
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; events keep their fields as top-level keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        event = getattr(record, "event", None)
+        if event is not None:
+            entry["event"] = event
+            entry.update(record.fields)
+        else:
+            entry["message"] = record.getMessage()
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
@@ -4,13 +4,12 @@ import asyncio
 import contextlib
 import logging
 import sys
+import time
 
-from asusrouter import AsusRouter
-from asusrouter.connection_config import ARConnectionConfig, ARConnectionConfigKey
-
-from .collectors import MetricsCollectorManager
 from .config import ExporterConfig, setup_logging
-from .server import PrometheusServer
+from .metrics.prometheus_metrics import READY_STATUS, STARTUP_DURATION
+from .metrics.self_metrics import LoopLagMonitor, install_gc_timing
+from .output import RemoteWriteClient, SharedMemoryOutput, TextfileOutput, UnixSocketOutput
 
 logger = logging.getLogger(__name__)
 
@@ -21,35 +20,89 @@ class AsusExporter:
     def __init__(self, config: ExporterConfig):
         self.config = config
         self.router = None
+        self.source = None
         self.collector_manager = None
         self.server = None
+        self.outputs = []
         self.collection_task = None
+        self.port_poll_task = None
+        self.syslog = None
+        self.prober = None
+        self.history = None
+        self.loop_monitor = LoopLagMonitor()
+        self.initialized = False
+        self.collector_names = []
+        self._started_at = time.perf_counter()
 
     async def initialize(self):
-        """Initialize the exporter components"""
-        # Setup connection configuration with resilience (v1.19.0+)
-        connection_config = ARConnectionConfig()
-        connection_config.set(ARConnectionConfigKey.ALLOW_FALLBACK, self.config.allow_fallback)
-        connection_config.set(ARConnectionConfigKey.STRICT_SSL, self.config.strict_ssl)
-        connection_config.set(
-            ARConnectionConfigKey.ALLOW_UPGRADE_HTTP_TO_HTTPS,
-            self.config.allow_upgrade_http_to_https,
-        )
+        """Initialize the output side; the router stack is loaded after the server is bound"""
+        from .collectors.manager import resolve_collector_names
+
+        # Validate the collector filters before anything is bound or imported
+        self.collector_names = resolve_collector_names(self.config)
+
+        # Setup the scrape server or push outputs depending on the output mode
+        if self.config.output_mode == "http":
+            # aiohttp is only imported when the TCP scrape server is actually used
+            from .server import PrometheusServer
+
+            self.server = PrometheusServer(self.config)
+        elif self.config.output_mode == "remote_write":
+            if not self.config.remote_write_url:
+                raise ValueError("EXPORTER_REMOTE_WRITE_URL is required for remote_write output")
+            self.outputs.append(RemoteWriteClient(self.config))
+        elif self.config.output_mode == "textfile":
+            self.outputs.append(TextfileOutput(self.config))
+        elif self.config.output_mode == "unix":
+            self.outputs.append(UnixSocketOutput(self.config))
+        elif self.config.output_mode == "shm":
+            # Collector side of the split process mode; the server process reads the segment
+            self.outputs.append(SharedMemoryOutput(self.config, self._snapshot))
+        else:
+            raise ValueError(f"Unknown output mode: {self.config.output_mode}")
+
+        if self.config.history_enabled:
+            try:
+                from .history import HistoryArchive
+            except ImportError:
+                raise ValueError(
+                    "EXPORTER_HISTORY_ENABLED needs pyarrow: pip install .[history]"
+                ) from None
+            self.history = HistoryArchive(self.config)
+            if self.server:
+                self.server.history = self.history
+
+        self.initialized = True
+
+    @staticmethod
+    def _import_collection_stack(collector_names: list[str]):
+        """Import asusrouter and the enabled collector modules (runs in a worker thread)"""
+        import_start = time.perf_counter()
+        import asusrouter  # noqa: F401
+
+        STARTUP_DURATION.labels(phase="import_router").set(time.perf_counter() - import_start)
+
+        import_start = time.perf_counter()
+        from .collectors.manager import load_collector_class
+
+        for name in collector_names:
+            load_collector_class(name)
+        STARTUP_DURATION.labels(phase="import_collectors").set(time.perf_counter() - import_start)
+
+    def _initialize_collection(self):
+        """Build the router connection and collector manager from the imported modules"""
+        from .sources import build_data_source, create_router
 
         # Setup router connection with resilience
-        self.router = AsusRouter(
-            hostname=self.config.hostname,
-            username=self.config.username,
-            password=self.config.password,
-            use_ssl=self.config.use_ssl,
-            connection_config=connection_config,
-        )
+        self.router = create_router(self.config)
+
+        # Route each data type to HTTP, SSH or a fixture; the collectors only see the source
+        self.source = build_data_source(self.config, self.router)
 
         # Setup collector manager
-        self.collector_manager = MetricsCollectorManager(self.router)
+        from .collectors import MetricsCollectorManager
 
-        # Setup HTTP server
-        self.server = PrometheusServer(self.config, self.collector_manager)
+        self.collector_manager = MetricsCollectorManager(self.source, self.config)
 
         logger.info(f"Exporter initialized for router: {self.config.hostname}")
         logger.info(
@@ -58,21 +111,63 @@ class AsusExporter:
 
     async def start(self):
         """Start the exporter"""
-        if not self.collector_manager or not self.server:
+        if not self.initialized:
             await self.initialize()
 
         logger.info("Starting ASUS Router Prometheus Exporter v2.0")
         logger.info(f"Target router: {self.config.hostname}")
         logger.info(f"Collection interval: {self.config.collection_interval}s")
+        logger.info(f"Output mode: {self.config.output_mode}")
+
+        install_gc_timing()
+        await self.loop_monitor.start()
+
+        # Bind the HTTP server first so /livez answers while the router stack loads
+        if self.server:
+            await self.server.start_server()
+            STARTUP_DURATION.labels(phase="server_bind").set(self._elapsed())
+
+        # Heavy imports run in a worker thread to keep the event loop serving
+        await asyncio.to_thread(self._import_collection_stack, self.collector_names)
+        self._initialize_collection()
+        if self.server:
+            self.server.collector_manager = self.collector_manager
+
+        # Connect to router; failures are retried by the collection loop and show on /readyz
+        connect_start = time.perf_counter()
+        try:
+            await self.collector_manager.connect_router()
+            STARTUP_DURATION.labels(phase="router_connect").set(time.perf_counter() - connect_start)
+        except Exception:
+            logger.warning("Initial router connection failed, will retry in the collection loop")
+
+        for output in self.outputs:
+            await output.start()
+
+        if self.history:
+            await self.history.start()
+
+        if self.config.syslog_enabled:
+            from .ingest import SyslogReceiver
 
-        # Connect to router
-        await self.collector_manager.connect_router()
+            self.syslog = SyslogReceiver(self.config, self.collector_manager)
+            await self.syslog.start()
 
-        # Start HTTP server
-        await self.server.start_server()
+        if self.config.probe_targets:
+            from .probes import ProbeEngine
+
+            self.prober = ProbeEngine(
+                self.config.probe_targets,
+                self.config.probe_interval,
+                self.config.probe_timeout,
+                self.config.probe_concurrency,
+            )
+            await self.prober.start()
 
         # Start metrics collection loop
         self.collection_task = asyncio.create_task(self._metrics_collection_loop())
+        if self.config.port_poll_interval > 0:
+            self.port_poll_task = asyncio.create_task(self._port_poll_loop())
 
         logger.info("Exporter started successfully")
 
@@ -80,16 +175,35 @@ class AsusExporter:
         """Stop the exporter"""
         logger.info("Stopping exporter...")
 
-        if self.collection_task:
-            self.collection_task.cancel()
-            with contextlib.suppress(asyncio.CancelledError):
-                await self.collection_task
+        for task in (self.collection_task, self.port_poll_task):
+            if task:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+
+        if self.syslog:
+            await self.syslog.close()
+
+        if self.prober:
+            await self.prober.close()
+
+        await self.loop_monitor.close()
 
         if self.server:
             await self.server.stop_server()
 
-        if self.router:
-            await self.router.async_disconnect()
+        for output in self.outputs:
+            await output.close()
+
+        if self.history:
+            await self.history.close()
+
+        if self.collector_manager:
+            self.collector_manager.save_state()
+            await self.collector_manager.close()
+
+        if self.source:
+            await self.source.async_disconnect()
 
         logger.info("Exporter stopped")
 
@@ -97,7 +211,10 @@ class AsusExporter:
         """Main loop for collecting metrics"""
         while True:
             try:
-                await self.collector_manager.collect_all_metrics()
+                all_metrics = await self.collector_manager.collect_all_metrics()
+                self._record_readiness()
+                self._archive(all_metrics)
+                await self._publish_outputs()
                 await asyncio.sleep(self.config.collection_interval)
             except asyncio.CancelledError:
                 break
@@ -105,6 +222,52 @@ class AsusExporter:
                 logger.error(f"Error in metrics collection loop: {e}")
                 await asyncio.sleep(self.config.collection_interval * 2)  # Wait longer on error
 
+    async def _port_poll_loop(self):
+        """Poll PORTS alone at a shorter interval so short link flaps are not missed"""
+        while True:
+            try:
+                await asyncio.sleep(self.config.port_poll_interval)
+                await self.collector_manager.poll_ports()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in port poll loop: {e}")
+
+    def _snapshot(self) -> dict:
+        """Manager state published next to the exposition for the server process"""
+        if not self.collector_manager:
+            return {}
+        return self.collector_manager.get_snapshot()
+
+    def _elapsed(self) -> float:
+        """Seconds since the exporter was created"""
+        return time.perf_counter() - self._started_at
+
+    def _record_readiness(self):
+        """Track readiness and record time-to-first-metrics once"""
+        ready = self.collector_manager.has_collected and self.collector_manager.is_connected
+        if ready and READY_STATUS._value.get() == 0:
+            STARTUP_DURATION.labels(phase="first_metrics").set(self._elapsed())
+            logger.info(f"First metrics collected {self._elapsed():.2f}s after startup")
+        READY_STATUS.set(1 if ready else 0)
+
+    def _archive(self, all_metrics: dict):
+        """Append the cycle's metrics and client table to the history archive"""
+        if not self.history or not all_metrics:
+            return
+        try:
+            self.history.append(all_metrics, self.collector_manager.get_clients())
+        except Exception as e:
+            logger.error(f"Error appending to the history archive: {e}")
+
+    async def _publish_outputs(self):
+        """Push the latest snapshot to every configured output"""
+        for output in self.outputs:
+            try:
+                await output.publish()
+            except Exception as e:
+                logger.error(f"Error publishing to {output.__class__.__name__}: {e}")
+
     async def run_forever(self):
         """Run the exporter until interrupted"""
         try:
@@ -118,6 +281,25 @@ class AsusExporter:
             await self.stop()
 
 
+async def run_exporter(config: ExporterConfig):
+    """Run the exporter in the configured process layout"""
+    if config.process_mode == "single":
+        await AsusExporter(config).run_forever()
+    elif config.process_mode == "split":
+        from .supervisor import Supervisor
+
+        await Supervisor(config).run_forever()
+    elif config.process_mode == "collector":
+        config.output_mode = "shm"
+        await AsusExporter(config).run_forever()
+    elif config.process_mode == "server":
+        from .server.snapshot import SnapshotServer
+
+        await SnapshotServer(config).run_forever()
+    else:
+        raise ValueError(f"Unknown process mode: {config.process_mode}")
+
+
 async def main():
     """Main entry point"""
     try:
@@ -125,11 +307,10 @@ async def main():
         config = ExporterConfig.from_env()
 
         # Setup logging
-        setup_logging(config.log_level)
+        setup_logging(config.log_level, config.log_format)
 
         # Create and run exporter
-        exporter = AsusExporter(config)
-        await exporter.run_forever()
+        await run_exporter(config)
 
     except ValueError as e:
         print(f"Configuration error: {e}")
@@ -142,6 +323,7 @@ async def main():
         print("  EXPORTER_PORT=8000 (default)")
         print("  EXPORTER_COLLECTION_INTERVAL=15 (default)")
         print("  EXPORTER_LOG_LEVEL=INFO (default)")
+        print("  EXPORTER_OUTPUT_MODE=http (default, remote_write, textfile or unix)")
         print("\nExample:")
         print("  ASUS_PASSWORD=mypassword python3 -m src.main")
         sys.exit(1)
@@ -0,0 +1,215 @@
+"""
+Streaming EWMA baselines and z-scores for a few key series.
+
+Exponentially weighted mean and variance are kept per series (optionally per hour of
+day), so alert rules can compare a z-score with a threshold instead of evaluating
+avg_over_time/stddev_over_time over weeks of data.
+"""
+
+import json
+import logging
+import math
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from prometheus_client.metrics_core import GaugeMetricFamily, Metric
+
+logger = logging.getLogger(__name__)
+
+# Collected metric key -> exported source family; "temperature_<sensor>" is handled apart
+SOURCE_METRICS = {
+    "wan_rx_rate": "asus_wan_rx_rate_bytes_per_sec",
+    "wan_tx_rate": "asus_wan_tx_rate_bytes_per_sec",
+    "cpu_usage": "asus_cpu_usage_percent",
+}
+TEMPERATURE_PREFIX = "temperature_"
+TEMPERATURE_METRIC = "asus_temperature_celsius"
+
+# Samples a baseline needs before its z-score is trusted
+MIN_SAMPLES = 30
+
+# Persist the state every this many updates (and on shutdown)
+SAVE_EVERY = 20
+
+
+class EwmaState:
+    """Exponentially weighted mean and variance of one stream"""
+
+    __slots__ = ("count", "mean", "variance")
+
+    def __init__(self, mean: float = 0.0, variance: float = 0.0, count: int = 0):
+        self.mean = mean
+        self.variance = variance
+        self.count = count
+
+    def zscore(self, value: float) -> float:
+        """Deviation of a value from the baseline in standard deviations (0 while warming up)"""
+        stddev = math.sqrt(self.variance)
+        if self.count < MIN_SAMPLES or stddev == 0:
+            return 0.0
+        return (value - self.mean) / stddev
+
+    def update(self, value: float, alpha: float) -> None:
+        if self.count == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            increment = alpha * diff
+            self.mean += increment
+            self.variance = (1 - alpha) * (self.variance + diff * increment)
+        self.count += 1
+
+    def to_list(self) -> list[float]:
+        return [self.mean, self.variance, self.count]
+
+
+class _Series:
+    """Global and optional hour-of-day baselines of one series"""
+
+    __slots__ = ("hourly", "last_seen", "overall")
+
+    def __init__(self):
+        self.overall = EwmaState()
+        self.hourly: dict[int, EwmaState] = {}
+        self.last_seen: float | None = None
+
+
+class AnomalyDetector:
+    """Custom Prometheus collector exporting z-score, baseline and stddev per series"""
+
+    def __init__(self, half_life: float = 86400.0, seasonal: bool = False, state_path: str = ""):
+        self.half_life = half_life
+        self.seasonal = seasonal
+        self.state_path = Path(state_path) if state_path else None
+        self.series: dict[tuple[str, str], _Series] = {}
+        self._scores: dict[tuple[str, str], tuple[float, float, float]] = {}
+        self._updates = 0
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.load()
+
+    @staticmethod
+    def select(metrics: dict[str, Any]) -> dict[tuple[str, str], float]:
+        """Pick the tracked values out of one cycle's collected metrics"""
+        selected = {}
+        for key, value in metrics.items():
+            if key in SOURCE_METRICS:
+                series_key = (SOURCE_METRICS[key], "")
+            elif key.startswith(TEMPERATURE_PREFIX):
+                series_key = (TEMPERATURE_METRIC, key[len(TEMPERATURE_PREFIX) :])
+            else:
+                continue
+            try:
+                selected[series_key] = float(value)
+            except (TypeError, ValueError):
+                continue
+        return selected
+
+    def update(self, metrics: dict[str, Any], now: float | None = None) -> None:
+        """Score this cycle's values against the baselines, then fold them in"""
+        now = time.time() if now is None else now
+        hour = time.localtime(now).tm_hour
+
+        for series_key, value in self.select(metrics).items():
+            series = self.series.get(series_key)
+            if series is None:
+                series = self.series[series_key] = _Series()
+
+            # Weight by elapsed time so irregular cycles do not skew the baseline
+            elapsed = min(now - series.last_seen, self.half_life) if series.last_seen else 0.0
+            alpha = 1 - 2 ** (-elapsed / self.half_life)
+            series.last_seen = now
+
+            baseline = series.overall
+            if self.seasonal:
+                bucket = series.hourly.setdefault(hour, EwmaState())
+                if bucket.count >= MIN_SAMPLES:
+                    baseline = bucket
+                # Each bucket only sees one hour a day, so it forgets 24x faster in its own time
+                bucket.update(value, min(1.0, 1 - 2 ** (-elapsed * 24 / self.half_life)))
+
+            self._scores[series_key] = (
+                baseline.zscore(value),
+                baseline.mean,
+                math.sqrt(baseline.variance),
+            )
+            series.overall.update(value, alpha)
+
+        self._updates += 1
+        if self._updates % SAVE_EVERY == 0:
+            self.save()
+
+    def load(self) -> None:
+        """Restore persisted baselines, ignoring a missing or unreadable file"""
+        if not self.state_path:
+            return
+        try:
+            state = json.loads(self.state_path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable anomaly state {self.state_path}: {e}")
+            return
+
+        for entry in state.get("series", []):
+            series = _Series()
+            series.overall = EwmaState(*entry["overall"])
+            series.hourly = {int(h): EwmaState(*s) for h, s in entry.get("hourly", {}).items()}
+            series.last_seen = entry.get("last_seen")
+            self.series[(entry["metric"], entry["series"])] = series
+        self.logger.info(f"Restored anomaly baselines for {len(self.series)} series")
+
+    def save(self) -> None:
+        """Write the baselines atomically so they survive restarts"""
+        if not self.state_path:
+            return
+        state = {
+            "series": [
+                {
+                    "metric": metric,
+                    "series": name,
+                    "overall": series.overall.to_list(),
+                    "hourly": {str(h): s.to_list() for h, s in series.hourly.items()},
+                    "last_seen": series.last_seen,
+                }
+                for (metric, name), series in self.series.items()
+            ]
+        }
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(state))
+            tmp_path.replace(self.state_path)
+        except OSError as e:
+            self.logger.warning(f"Could not write anomaly state {self.state_path}: {e}")
+
+    def _families(self) -> list[GaugeMetricFamily]:
+        return [
+            GaugeMetricFamily(
+                "asus_anomaly_zscore",
+                "Deviation of the latest value from its EWMA baseline in standard deviations",
+                labels=["metric", "series"],
+            ),
+            GaugeMetricFamily(
+                "asus_anomaly_baseline",
+                "EWMA baseline (mean) the latest value was scored against",
+                labels=["metric", "series"],
+            ),
+            GaugeMetricFamily(
+                "asus_anomaly_stddev",
+                "EWMA standard deviation the latest value was scored against",
+                labels=["metric", "series"],
+            ),
+        ]
+
+    def collect(self) -> Iterator[Metric]:
+        zscore, baseline, stddev = self._families()
+        for (metric, name), (score, mean, deviation) in sorted(self._scores.items()):
+            zscore.add_metric([metric, name], score)
+            baseline.add_metric([metric, name], mean)
+            stddev.add_metric([metric, name], deviation)
+        yield from (zscore, baseline, stddev)
+
+    def describe(self) -> Iterator[Metric]:
+        yield from self._families()
@@ -0,0 +1,231 @@
+"""
+Per-band and per-node client signal/throughput distributions.
+
+The parsed CLIENTS table is packed into columns once per cycle and reduced to histograms,
+percentiles and threshold counts here, so dashboards no longer compute quantiles over
+thousands of per-client series. NumPy is used when installed (the "analytics" extra),
+with a pure-Python fallback that produces the same numbers.
+"""
+
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from prometheus_client.metrics_core import (
+    GaugeHistogramMetricFamily,
+    GaugeMetricFamily,
+    Metric,
+)
+
+RSSI_BUCKETS_DBM = (-90.0, -80.0, -75.0, -70.0, -67.0, -60.0, -50.0, -40.0, -30.0)
+RATE_BUCKETS_MBPS = (1.0, 6.0, 12.0, 24.0, 54.0, 100.0, 300.0, 600.0, 1200.0, 2400.0, 4800.0)
+QUANTILES = (0.1, 0.5, 0.9)
+
+LABELS = ["band", "node"]
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Linear-interpolated percentile, matching numpy.percentile's default method"""
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def pack_clients(records: Iterable[Any]) -> dict[str, list]:
+    """Flatten parsed client records (see collectors.clients) into columns of online clients"""
+    columns: dict[str, list] = {"band": [], "node": [], "rssi": [], "tx": [], "rx": []}
+    nan = float("nan")
+    for record in records:
+        if not record.online or record.band is None:
+            continue
+        columns["band"].append(record.band)
+        columns["node"].append(record.node)
+        rssi = record.rssi if record.band != "wired" else None
+        columns["rssi"].append(nan if rssi is None else rssi)
+        columns["tx"].append(nan if record.tx_rate is None else record.tx_rate)
+        columns["rx"].append(nan if record.rx_rate is None else record.rx_rate)
+    return columns
+
+
+class _Stats:
+    """Bucket counts, sum and percentiles of one group of values"""
+
+    __slots__ = ("below", "buckets", "count", "percentiles", "total")
+
+    def __init__(self, buckets, total, count, percentiles, below=0):
+        self.buckets = buckets
+        self.total = total
+        self.count = count
+        self.percentiles = percentiles
+        self.below = below
+
+
+def _stats_python(values: list[float], bounds: tuple, threshold: float | None) -> _Stats:
+    values = sorted(v for v in values if v == v)  # drop NaN
+    buckets = [bisect_right(values, bound) for bound in bounds]
+    percentiles = [_percentile(values, q) for q in QUANTILES] if values else []
+    below = bisect_right(values, threshold) if threshold is not None else 0
+    # Strictly below the threshold, so a client exactly at the threshold is not counted
+    if threshold is not None:
+        below -= values.count(threshold)
+    return _Stats(buckets, sum(values), len(values), percentiles, below)
+
+
+def _stats_numpy(np, values, bounds: tuple, threshold: float | None) -> _Stats:
+    values = np.sort(values[~np.isnan(values)])
+    buckets = np.searchsorted(values, bounds, side="right").tolist()
+    percentiles = (
+        np.percentile(values, [q * 100 for q in QUANTILES]).tolist() if values.size else []
+    )
+    below = int(np.count_nonzero(values < threshold)) if threshold is not None else 0
+    return _Stats(buckets, float(values.sum()), int(values.size), percentiles, below)
+
+
+class ClientDistributions:
+    """Custom Prometheus collector serving the distributions computed by the last update()"""
+
+    def __init__(self, rssi_threshold: float = -70.0):
+        self.rssi_threshold = rssi_threshold
+        self._families: list[Metric] = []
+
+    def update(self, records: Iterable[Any]) -> None:
+        """Pack the client records once and rebuild every distribution family"""
+        columns = pack_clients(records)
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+
+        families = self._empty_families()
+        rssi_hist, tx_hist, rx_hist, rssi_pct, rate_pct, below, counts = families
+
+        if np is not None and columns["band"]:
+            groups = self._groups_numpy(np, columns)
+        else:
+            groups = self._groups_python(columns)
+
+        for (band, node), group in sorted(groups.items()):
+            labels = [band, node]
+            counts.add_metric(labels, len(group["tx"]))
+            for family, key, bounds in (
+                (tx_hist, "tx", RATE_BUCKETS_MBPS),
+                (rx_hist, "rx", RATE_BUCKETS_MBPS),
+            ):
+                stats = group[f"{key}_stats"]
+                self._add_histogram(family, labels, bounds, stats)
+                for q, value in zip(QUANTILES, stats.percentiles, strict=False):
+                    rate_pct.add_metric([band, node, key, str(q)], value)
+
+            if band != "wired":
+                stats = group["rssi_stats"]
+                self._add_histogram(rssi_hist, labels, RSSI_BUCKETS_DBM, stats)
+                for q, value in zip(QUANTILES, stats.percentiles, strict=False):
+                    rssi_pct.add_metric([band, node, str(q)], value)
+                below.add_metric(labels, stats.below)
+
+        self._families = families
+
+    def _groups_numpy(self, np, columns: dict[str, list]) -> dict[tuple[str, str], dict]:
+        bands = np.array(columns["band"])
+        nodes = np.array(columns["node"])
+        rssi = np.array(columns["rssi"], dtype=np.float64)
+        tx = np.array(columns["tx"], dtype=np.float64)
+        rx = np.array(columns["rx"], dtype=np.float64)
+
+        # Factorize bands and nodes, then combine the codes into one group id per client
+        band_names, band_codes = np.unique(bands, return_inverse=True)
+        node_names, node_codes = np.unique(nodes, return_inverse=True)
+        group_ids = band_codes * len(node_names) + node_codes
+
+        groups = {}
+        for group_id in np.unique(group_ids).tolist():
+            band = str(band_names[group_id // len(node_names)])
+            node = str(node_names[group_id % len(node_names)])
+            mask = group_ids == group_id
+            groups[(band, node)] = {
+                "tx": tx[mask],
+                "tx_stats": _stats_numpy(np, tx[mask], RATE_BUCKETS_MBPS, None),
+                "rx_stats": _stats_numpy(np, rx[mask], RATE_BUCKETS_MBPS, None),
+                "rssi_stats": _stats_numpy(np, rssi[mask], RSSI_BUCKETS_DBM, self.rssi_threshold),
+            }
+        return groups
+
+    def _groups_python(self, columns: dict[str, list]) -> dict[tuple[str, str], dict]:
+        grouped: dict[tuple[str, str], dict[str, list]] = {}
+        for band, node, rssi, tx, rx in zip(
+            columns["band"],
+            columns["node"],
+            columns["rssi"],
+            columns["tx"],
+            columns["rx"],
+            strict=True,
+        ):
+            group = grouped.setdefault((band, node), {"rssi": [], "tx": [], "rx": []})
+            group["rssi"].append(rssi)
+            group["tx"].append(tx)
+            group["rx"].append(rx)
+
+        return {
+            key: {
+                "tx": group["tx"],
+                "tx_stats": _stats_python(group["tx"], RATE_BUCKETS_MBPS, None),
+                "rx_stats": _stats_python(group["rx"], RATE_BUCKETS_MBPS, None),
+                "rssi_stats": _stats_python(group["rssi"], RSSI_BUCKETS_DBM, self.rssi_threshold),
+            }
+            for key, group in grouped.items()
+        }
+
+    @staticmethod
+    def _add_histogram(family: GaugeHistogramMetricFamily, labels, bounds, stats: _Stats):
+        buckets = [(str(bound), count) for bound, count in zip(bounds, stats.buckets, strict=True)]
+        buckets.append(("+Inf", stats.count))
+        family.add_metric(labels, buckets, stats.total)
+
+    def _empty_families(self) -> list[Metric]:
+        # Snapshots of the current clients, not cumulative counts: buckets go down as clients
+        # leave, so gauge histograms (_gcount/_gsum) rather than counter-based histograms
+        return [
+            GaugeHistogramMetricFamily(
+                "asus_client_rssi_distribution_dbm",
+                "Distribution of online WiFi client RSSI in dBm",
+                labels=LABELS,
+            ),
+            GaugeHistogramMetricFamily(
+                "asus_client_tx_rate_distribution_mbps",
+                "Distribution of online client TX rates in Mbps",
+                labels=LABELS,
+            ),
+            GaugeHistogramMetricFamily(
+                "asus_client_rx_rate_distribution_mbps",
+                "Distribution of online client RX rates in Mbps",
+                labels=LABELS,
+            ),
+            GaugeMetricFamily(
+                "asus_client_rssi_percentile_dbm",
+                "Percentiles of online WiFi client RSSI in dBm",
+                labels=[*LABELS, "quantile"],
+            ),
+            GaugeMetricFamily(
+                "asus_client_rate_percentile_mbps",
+                "Percentiles of online client TX/RX rates in Mbps",
+                labels=[*LABELS, "direction", "quantile"],
+            ),
+            GaugeMetricFamily(
+                "asus_client_rssi_below_threshold",
+                f"Online WiFi clients with RSSI below the configured threshold "
+                f"({self.rssi_threshold} dBm)",
+                labels=LABELS,
+            ),
+            GaugeMetricFamily(
+                "asus_client_online_count",
+                "Online clients per band and node",
+                labels=LABELS,
+            ),
+        ]
+
+    def collect(self) -> Iterator[Metric]:
+        yield from self._families
+
+    def describe(self) -> Iterator[Metric]:
+        yield from self._empty_families()
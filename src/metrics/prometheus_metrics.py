@@ -1,8 +1,20 @@
 """
 Prometheus metrics definitions for ASUS Router Exporter
+
+Collector-owned families are created unregistered (registry=None) and only added to
+the default registry when their collector is enabled, see COLLECTOR_FAMILIES.
+Constructing them stays eager: the server, outputs and self-metrics need this module
+before the bind anyway, and building the unregistered objects costs a few milliseconds
+against the asusrouter and collector imports that are deferred.
 """
 
-from prometheus_client import Counter, Gauge, Histogram, Info
+import functools
+from collections.abc import Iterable
+from typing import Any
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, Info
+
+from .distributions import ClientDistributions
 
 # Collection timing
 collection_time = Histogram(
@@ -10,201 +22,302 @@ collection_time = Histogram(
 )
 
 # System metrics
-CPU_USAGE = Gauge("asus_cpu_usage_percent", "CPU usage percentage")
-LOAD_AVERAGE = Gauge("asus_load_average", "System load average", ["period"])
+CPU_USAGE = Gauge("asus_cpu_usage_percent", "CPU usage percentage", registry=None)
+LOAD_AVERAGE = Gauge("asus_load_average", "System load average", ["period"], registry=None)
 
 # Memory metrics
-RAM_USED = Gauge("asus_ram_used_bytes", "RAM used in bytes")
-RAM_FREE = Gauge("asus_ram_free_bytes", "RAM free in bytes")
-RAM_TOTAL = Gauge("asus_ram_total_bytes", "RAM total in bytes")
-RAM_USAGE_PERCENT = Gauge("asus_ram_usage_percent", "RAM usage percentage")
-RAM_BUFFERS = Gauge("asus_ram_buffers_bytes", "RAM buffers in bytes")
-RAM_CACHE = Gauge("asus_ram_cache_bytes", "RAM cache in bytes")
-RAM_SWAP1 = Gauge("asus_ram_swap1_bytes", "RAM swap1 in bytes")
-RAM_SWAP2 = Gauge("asus_ram_swap2_bytes", "RAM swap2 in bytes")
-NVRAM_USED = Gauge("asus_nvram_used_bytes", "NVRAM used in bytes")
-JFFS_FREE = Gauge("asus_jffs_free_megabytes", "JFFS free space in MB")
-JFFS_USED = Gauge("asus_jffs_used_megabytes", "JFFS used space in MB")
-JFFS_TOTAL = Gauge("asus_jffs_total_megabytes", "JFFS total space in MB")
+RAM_USED = Gauge("asus_ram_used_bytes", "RAM used in bytes", registry=None)
+RAM_FREE = Gauge("asus_ram_free_bytes", "RAM free in bytes", registry=None)
+RAM_TOTAL = Gauge("asus_ram_total_bytes", "RAM total in bytes", registry=None)
+RAM_USAGE_PERCENT = Gauge("asus_ram_usage_percent", "RAM usage percentage", registry=None)
+RAM_BUFFERS = Gauge("asus_ram_buffers_bytes", "RAM buffers in bytes", registry=None)
+RAM_CACHE = Gauge("asus_ram_cache_bytes", "RAM cache in bytes", registry=None)
+RAM_SWAP1 = Gauge("asus_ram_swap1_bytes", "RAM swap1 in bytes", registry=None)
+RAM_SWAP2 = Gauge("asus_ram_swap2_bytes", "RAM swap2 in bytes", registry=None)
+NVRAM_USED = Gauge("asus_nvram_used_bytes", "NVRAM used in bytes", registry=None)
+JFFS_FREE = Gauge("asus_jffs_free_megabytes", "JFFS free space in MB", registry=None)
+JFFS_USED = Gauge("asus_jffs_used_megabytes", "JFFS used space in MB", registry=None)
+JFFS_TOTAL = Gauge("asus_jffs_total_megabytes", "JFFS total space in MB", registry=None)
 
 # Network interface metrics - WAN
-WAN_RX_BYTES = Counter("asus_wan_rx_bytes_total", "WAN RX bytes total")
-WAN_TX_BYTES = Counter("asus_wan_tx_bytes_total", "WAN TX bytes total")
-WAN_RX_RATE = Gauge("asus_wan_rx_rate_bytes_per_sec", "WAN RX rate in bytes per second")
-WAN_TX_RATE = Gauge("asus_wan_tx_rate_bytes_per_sec", "WAN TX rate in bytes per second")
-WAN_STATUS = Gauge("asus_wan_status", "WAN connection status")
-WAN_IP_ADDRESS = Info("asus_wan_ip", "WAN IP address information")
-WAN_DNS_SERVERS = Info("asus_wan_dns", "WAN DNS servers information")
-WAN_UPTIME = Gauge("asus_wan_uptime_seconds", "WAN connection uptime in seconds")
+WAN_RX_BYTES = Counter("asus_wan_rx_bytes_total", "WAN RX bytes total", registry=None)
+WAN_TX_BYTES = Counter("asus_wan_tx_bytes_total", "WAN TX bytes total", registry=None)
+WAN_RX_RATE = Gauge(
+    "asus_wan_rx_rate_bytes_per_sec", "WAN RX rate in bytes per second", registry=None
+)
+WAN_TX_RATE = Gauge(
+    "asus_wan_tx_rate_bytes_per_sec", "WAN TX rate in bytes per second", registry=None
+)
+WAN_STATUS = Gauge("asus_wan_status", "WAN connection status", registry=None)
+WAN_IP_ADDRESS = Info("asus_wan_ip", "WAN IP address information", registry=None)
+WAN_DNS_SERVERS = Info("asus_wan_dns", "WAN DNS servers information", registry=None)
+WAN_UPTIME = Gauge("asus_wan_uptime_seconds", "WAN connection uptime in seconds", registry=None)
 
 # Network interface metrics - LAN/WiFi
 INTERFACE_RX_BYTES = Counter(
-    "asus_interface_rx_bytes_total", "Interface RX bytes total", ["interface"]
+    "asus_interface_rx_bytes_total", "Interface RX bytes total", ["interface"], registry=None
 )
 INTERFACE_TX_BYTES = Counter(
-    "asus_interface_tx_bytes_total", "Interface TX bytes total", ["interface"]
+    "asus_interface_tx_bytes_total", "Interface TX bytes total", ["interface"], registry=None
 )
 
 # Port metrics
-PORT_STATUS = Gauge("asus_port_status", "Port status (1=up, 0=down)", ["port_type", "port_id"])
+PORT_STATUS = Gauge(
+    "asus_port_status", "Port status (1=up, 0=down)", ["port_type", "port_id"], registry=None
+)
 PORT_LINK_RATE = Gauge(
-    "asus_port_link_rate_mbps", "Port link rate in Mbps", ["port_type", "port_id"]
+    "asus_port_link_rate_mbps", "Port link rate in Mbps", ["port_type", "port_id"], registry=None
 )
 PORT_MAX_RATE = Gauge(
     "asus_port_max_rate_mbps",
     "Port maximum rate in Mbps",
     ["node_mac", "port_type", "port_id"],
+    registry=None,
+)
+PORT_TRANSITIONS_TOTAL = Counter(
+    "asus_port_transitions_total",
+    "Port link transitions (up_to_down, down_to_up, rate_downgrade, rate_upgrade)",
+    ["node_mac", "port_type", "port_id", "transition"],
+    registry=None,
+)
+PORT_STATE_DURATION = Gauge(
+    "asus_port_state_duration_seconds",
+    "Seconds since the port last changed link state (or since exporter start)",
+    ["node_mac", "port_type", "port_id"],
+    registry=None,
 )
 PORT_CAPABILITIES = Gauge(
     "asus_port_capabilities",
     "Port capabilities",
     ["node_mac", "port_type", "port_id", "capability"],
+    registry=None,
 )
 
 # Temperature metrics
-TEMPERATURE = Gauge("asus_temperature_celsius", "Temperature in Celsius", ["sensor"])
+TEMPERATURE = Gauge("asus_temperature_celsius", "Temperature in Celsius", ["sensor"], registry=None)
 
 # WiFi client metrics
-WIFI_CLIENTS_TOTAL = Gauge("asus_wifi_clients_total", "Total number of WiFi clients")
+WIFI_CLIENTS_TOTAL = Gauge("asus_wifi_clients_total", "Total number of WiFi clients", registry=None)
 WIFI_CLIENTS_BY_BAND = Gauge(
-    "asus_wifi_clients_by_band", "Number of WiFi clients by band", ["band"]
+    "asus_wifi_clients_by_band", "Number of WiFi clients by band", ["band"], registry=None
+)
+WIFI_CLIENTS_ASSOCIATED = Gauge(
+    "asus_wifi_clients_associated", "WiFi clients associated", ["band"], registry=None
+)
+WIFI_CLIENTS_AUTHORIZED = Gauge(
+    "asus_wifi_clients_authorized", "WiFi clients authorized", ["band"], registry=None
 )
-WIFI_CLIENTS_ASSOCIATED = Gauge("asus_wifi_clients_associated", "WiFi clients associated", ["band"])
-WIFI_CLIENTS_AUTHORIZED = Gauge("asus_wifi_clients_authorized", "WiFi clients authorized", ["band"])
 WIFI_CLIENTS_AUTHENTICATED = Gauge(
-    "asus_wifi_clients_authenticated", "WiFi clients authenticated", ["band"]
+    "asus_wifi_clients_authenticated", "WiFi clients authenticated", ["band"], registry=None
 )
 
 # Client connection metrics
 CLIENT_COUNT_BY_TYPE = Gauge(
-    "asus_client_count_by_type", "Number of clients by connection type", ["type"]
+    "asus_client_count_by_type", "Number of clients by connection type", ["type"], registry=None
 )
 CLIENT_ONLINE = Gauge(
-    "asus_client_online", "Client online status", ["mac", "name", "connection_type"]
+    "asus_client_online", "Client online status", ["mac", "name", "connection_type"], registry=None
+)
+CLIENT_RSSI = Gauge(
+    "asus_client_rssi_dbm", "Client RSSI in dBm", ["mac", "name", "band"], registry=None
 )
-CLIENT_RSSI = Gauge("asus_client_rssi_dbm", "Client RSSI in dBm", ["mac", "name", "band"])
 CLIENT_TX_RATE = Gauge(
     "asus_client_tx_rate_mbps",
     "Client TX rate in Mbps",
     ["mac", "name", "connection_type"],
+    registry=None,
 )
 CLIENT_RX_RATE = Gauge(
     "asus_client_rx_rate_mbps",
     "Client RX rate in Mbps",
     ["mac", "name", "connection_type"],
+    registry=None,
 )
 CLIENT_INTERNET_STATE = Gauge(
     "asus_client_internet_state",
     "Client internet access state",
     ["mac", "name", "connection_type"],
+    registry=None,
+)
+CLIENT_VENDOR = Gauge(
+    "asus_client_vendor_info",
+    "Client vendor from the IEEE OUI registry (empty when unknown or randomized)",
+    ["mac", "vendor"],
+    registry=None,
 )
 
 # Connection metrics
 CONNECTION_STATUS = Gauge(
     "asus_connection_status", "Router connection status (1=connected, 0=disconnected)"
 )
-TOTAL_CONNECTIONS = Gauge("asus_connections_total", "Total network connections")
-ACTIVE_CONNECTIONS = Gauge("asus_connections_active", "Active network connections")
+TOTAL_CONNECTIONS = Gauge("asus_connections_total", "Total network connections", registry=None)
+ACTIVE_CONNECTIONS = Gauge("asus_connections_active", "Active network connections", registry=None)
 
 # System info
-ROUTER_INFO = Info("asus_router", "Router information")
-BOOTTIME = Gauge("asus_boot_timestamp_seconds", "Router boot timestamp")
+ROUTER_INFO = Info("asus_router", "Router information", registry=None)
+BOOTTIME = Gauge("asus_boot_timestamp_seconds", "Router boot timestamp", registry=None)
 
 # Firmware info
-FIRMWARE_INFO = Info("asus_firmware", "Firmware information")
+FIRMWARE_INFO = Info("asus_firmware", "Firmware information", registry=None)
 FIRMWARE_UPDATE_AVAILABLE = Gauge(
-    "asus_firmware_update_available", "Firmware update available (1=yes, 0=no)"
+    "asus_firmware_update_available", "Firmware update available (1=yes, 0=no)", registry=None
 )
-FIRMWARE_BUILD_INFO = Info("asus_firmware_build", "Firmware build information")
-FIRMWARE_RELEASE_NOTES = Info("asus_firmware_notes", "Firmware release notes")
+FIRMWARE_BUILD_INFO = Info("asus_firmware_build", "Firmware build information", registry=None)
+FIRMWARE_RELEASE_NOTES = Info("asus_firmware_notes", "Firmware release notes", registry=None)
 
 # VPN metrics
-OPENVPN_CLIENT_STATUS = Gauge("asus_openvpn_client_status", "OpenVPN client status", ["client_id"])
-OPENVPN_SERVER_STATUS = Gauge("asus_openvpn_server_status", "OpenVPN server status", ["server_id"])
+OPENVPN_CLIENT_STATUS = Gauge(
+    "asus_openvpn_client_status", "OpenVPN client status", ["client_id"], registry=None
+)
+OPENVPN_SERVER_STATUS = Gauge(
+    "asus_openvpn_server_status", "OpenVPN server status", ["server_id"], registry=None
+)
 WIREGUARD_CLIENT_STATUS = Gauge(
-    "asus_wireguard_client_status", "WireGuard client status", ["client_id"]
+    "asus_wireguard_client_status", "WireGuard client status", ["client_id"], registry=None
 )
 WIREGUARD_SERVER_STATUS = Gauge(
-    "asus_wireguard_server_status", "WireGuard server status", ["server_id"]
+    "asus_wireguard_server_status", "WireGuard server status", ["server_id"], registry=None
 )
 
 # VPNC (VPN Client) additional metrics
-VPNC_CLIENT_COUNT = Gauge("asus_vpnc_client_count", "Number of configured VPN clients")
+VPNC_CLIENT_COUNT = Gauge(
+    "asus_vpnc_client_count", "Number of configured VPN clients", registry=None
+)
 VPNC_CLIENT_UPTIME = Gauge(
-    "asus_vpnc_client_uptime_seconds", "VPN client uptime in seconds", ["client_id"]
+    "asus_vpnc_client_uptime_seconds", "VPN client uptime in seconds", ["client_id"], registry=None
 )
 VPNC_CLIENT_TRAFFIC_RX = Counter(
-    "asus_vpnc_client_rx_bytes_total", "VPN client RX bytes total", ["client_id"]
+    "asus_vpnc_client_rx_bytes_total", "VPN client RX bytes total", ["client_id"], registry=None
 )
 VPNC_CLIENT_TRAFFIC_TX = Counter(
-    "asus_vpnc_client_tx_bytes_total", "VPN client TX bytes total", ["client_id"]
+    "asus_vpnc_client_tx_bytes_total", "VPN client TX bytes total", ["client_id"], registry=None
 )
 
 # LED and Aura metrics
-LED_STATUS = Gauge("asus_led_status", "LED status (1=on, 0=off)")
-AURA_STATUS = Gauge("asus_aura_status", "Aura lighting status")
+LED_STATUS = Gauge("asus_led_status", "LED status (1=on, 0=off)", registry=None)
+AURA_STATUS = Gauge("asus_aura_status", "Aura lighting status", registry=None)
 
 # Speedtest metrics
-SPEEDTEST_DOWNLOAD_MBPS = Gauge("asus_speedtest_download_mbps", "Speedtest download speed in Mbps")
-SPEEDTEST_UPLOAD_MBPS = Gauge("asus_speedtest_upload_mbps", "Speedtest upload speed in Mbps")
-SPEEDTEST_PING_MS = Gauge("asus_speedtest_ping_ms", "Speedtest ping in milliseconds")
-SPEEDTEST_TIMESTAMP = Gauge("asus_speedtest_timestamp_seconds", "Speedtest last run timestamp")
+SPEEDTEST_DOWNLOAD_MBPS = Gauge(
+    "asus_speedtest_download_mbps", "Speedtest download speed in Mbps", registry=None
+)
+SPEEDTEST_UPLOAD_MBPS = Gauge(
+    "asus_speedtest_upload_mbps", "Speedtest upload speed in Mbps", registry=None
+)
+SPEEDTEST_PING_MS = Gauge("asus_speedtest_ping_ms", "Speedtest ping in milliseconds", registry=None)
+SPEEDTEST_TIMESTAMP = Gauge(
+    "asus_speedtest_timestamp_seconds", "Speedtest last run timestamp", registry=None
+)
 
 # Node information
-NODE_STATUS = Gauge("asus_node_status", "Node status information", ["node_mac", "attribute"])
+NODE_STATUS = Gauge(
+    "asus_node_status", "Node status information", ["node_mac", "attribute"], registry=None
+)
 
 # AiMesh metrics
-AIMESH_NODE_COUNT = Gauge("asus_aimesh_node_count", "Number of AiMesh nodes")
+AIMESH_NODE_COUNT = Gauge("asus_aimesh_node_count", "Number of AiMesh nodes", registry=None)
 AIMESH_NODE_STATUS = Gauge(
-    "asus_aimesh_node_status", "AiMesh node status", ["node_mac", "node_model"]
+    "asus_aimesh_node_status", "AiMesh node status", ["node_mac", "node_model"], registry=None
+)
+
+# AiMesh satellites polled directly, each with its own session (aimesh collector)
+AIMESH_NODE_UP = Gauge(
+    "asus_aimesh_node_up",
+    "Whether the last direct poll of the AiMesh node succeeded",
+    ["node_mac"],
+    registry=None,
+)
+AIMESH_NODE_POLL_DURATION = Gauge(
+    "asus_aimesh_node_poll_duration_seconds",
+    "Duration of the last direct poll of the AiMesh node",
+    ["node_mac"],
+    registry=None,
+)
+AIMESH_NODE_CPU_USAGE = Gauge(
+    "asus_aimesh_node_cpu_usage_percent", "AiMesh node CPU usage", ["node_mac"], registry=None
+)
+AIMESH_NODE_RAM_USAGE = Gauge(
+    "asus_aimesh_node_ram_usage_percent", "AiMesh node RAM usage", ["node_mac"], registry=None
+)
+AIMESH_NODE_TEMPERATURE = Gauge(
+    "asus_aimesh_node_temperature_celsius",
+    "AiMesh node temperature in Celsius",
+    ["node_mac", "sensor"],
+    registry=None,
+)
+AIMESH_NODE_PORT_STATUS = Gauge(
+    "asus_aimesh_node_port_status",
+    "AiMesh node port status (1=up, 0=down)",
+    ["node_mac", "port_type", "port_id"],
+    registry=None,
+)
+AIMESH_NODE_PORT_LINK_RATE = Gauge(
+    "asus_aimesh_node_port_link_rate_mbps",
+    "AiMesh node port link rate in Mbps",
+    ["node_mac", "port_type", "port_id"],
+    registry=None,
+)
+AIMESH_NODE_CLIENTS = Gauge(
+    "asus_aimesh_node_clients",
+    "Online clients reported by the AiMesh node itself",
+    ["node_mac", "connection_type"],
+    registry=None,
 )
 
 # DSL metrics (for DSL modems)
-DSL_RATE_DOWN = Gauge("asus_dsl_rate_down_kbps", "DSL download rate in kbps")
-DSL_RATE_UP = Gauge("asus_dsl_rate_up_kbps", "DSL upload rate in kbps")
-DSL_SNR_DOWN = Gauge("asus_dsl_snr_down_db", "DSL downstream SNR in dB")
-DSL_SNR_UP = Gauge("asus_dsl_snr_up_db", "DSL upstream SNR in dB")
+DSL_RATE_DOWN = Gauge("asus_dsl_rate_down_kbps", "DSL download rate in kbps", registry=None)
+DSL_RATE_UP = Gauge("asus_dsl_rate_up_kbps", "DSL upload rate in kbps", registry=None)
+DSL_SNR_DOWN = Gauge("asus_dsl_snr_down_db", "DSL downstream SNR in dB", registry=None)
+DSL_SNR_UP = Gauge("asus_dsl_snr_up_db", "DSL upstream SNR in dB", registry=None)
 
 # Guest WLAN metrics
-GWLAN_STATUS = Gauge("asus_gwlan_status", "Guest WLAN status", ["band", "guest_id"])
+GWLAN_STATUS = Gauge("asus_gwlan_status", "Guest WLAN status", ["band", "guest_id"], registry=None)
 GWLAN_CLIENT_COUNT = Gauge(
-    "asus_gwlan_client_count", "Guest WLAN client count", ["band", "guest_id"]
+    "asus_gwlan_client_count", "Guest WLAN client count", ["band", "guest_id"], registry=None
 )
 
 # WLAN (main WiFi) metrics
-WLAN_STATUS = Gauge("asus_wlan_status", "WLAN status", ["band"])
-WLAN_CHANNEL = Gauge("asus_wlan_channel", "WLAN channel", ["band"])
-WLAN_TXPOWER = Gauge("asus_wlan_txpower_dbm", "WLAN transmit power in dBm", ["band"])
-WLAN_BANDWIDTH = Gauge("asus_wlan_bandwidth_mhz", "WLAN bandwidth in MHz", ["band"])
+WLAN_STATUS = Gauge("asus_wlan_status", "WLAN status", ["band"], registry=None)
+WLAN_CHANNEL = Gauge("asus_wlan_channel", "WLAN channel", ["band"], registry=None)
+WLAN_TXPOWER = Gauge("asus_wlan_txpower_dbm", "WLAN transmit power in dBm", ["band"], registry=None)
+WLAN_BANDWIDTH = Gauge("asus_wlan_bandwidth_mhz", "WLAN bandwidth in MHz", ["band"], registry=None)
 
 # Parental Control metrics
-PARENTAL_CONTROL_ENABLED = Gauge("asus_parental_control_enabled", "Parental control enabled")
+PARENTAL_CONTROL_ENABLED = Gauge(
+    "asus_parental_control_enabled", "Parental control enabled", registry=None
+)
 PARENTAL_CONTROL_RULES = Gauge(
-    "asus_parental_control_rules_count", "Number of parental control rules"
+    "asus_parental_control_rules_count", "Number of parental control rules", registry=None
 )
 PARENTAL_CONTROL_BLOCKED_CLIENTS = Gauge(
-    "asus_parental_control_blocked_clients", "Number of blocked clients"
+    "asus_parental_control_blocked_clients", "Number of blocked clients", registry=None
 )
 
 # Port Forwarding metrics
-PORT_FORWARDING_ENABLED = Gauge("asus_port_forwarding_enabled", "Port forwarding enabled")
-PORT_FORWARDING_RULES = Gauge("asus_port_forwarding_rules_count", "Number of port forwarding rules")
+PORT_FORWARDING_ENABLED = Gauge(
+    "asus_port_forwarding_enabled", "Port forwarding enabled", registry=None
+)
+PORT_FORWARDING_RULES = Gauge(
+    "asus_port_forwarding_rules_count", "Number of port forwarding rules", registry=None
+)
 
 # Network Ping metrics
 PING_RESPONSE_TIME = Gauge(
-    "asus_ping_response_time_ms", "Ping response time in milliseconds", ["target"]
+    "asus_ping_response_time_ms", "Ping response time in milliseconds", ["target"], registry=None
+)
+PING_PACKET_LOSS = Gauge(
+    "asus_ping_packet_loss_percent", "Ping packet loss percentage", ["target"], registry=None
 )
-PING_PACKET_LOSS = Gauge("asus_ping_packet_loss_percent", "Ping packet loss percentage", ["target"])
 
 # System flags and capabilities
-SYSTEM_FLAGS = Info("asus_system_flags", "System flags and capabilities")
+SYSTEM_FLAGS = Info("asus_system_flags", "System flags and capabilities", registry=None)
 
 # Device map information
-DEVICE_MAP_INFO = Info("asus_device_map", "Device map information")
+DEVICE_MAP_INFO = Info("asus_device_map", "Device map information", registry=None)
 
 # Enhanced system information
-SYSTEM_MODEL_INFO = Info("asus_system_model", "System model information")
-SYSTEM_SERIAL_INFO = Info("asus_system_serial", "System serial information")
+SYSTEM_MODEL_INFO = Info("asus_system_model", "System model information", registry=None)
+SYSTEM_SERIAL_INFO = Info("asus_system_serial", "System serial information", registry=None)
 
 # Collection metrics
 LAST_COLLECTION_TIMESTAMP = Gauge(
@@ -213,3 +326,375 @@ LAST_COLLECTION_TIMESTAMP = Gauge(
 COLLECTION_ERRORS_TOTAL = Counter(
     "asus_collection_errors_total", "Total collection errors", ["error_type"]
 )
+
+# Remote write metrics
+REMOTE_WRITE_SAMPLES_TOTAL = Counter(
+    "asus_remote_write_samples_total", "Samples delivered to the remote write endpoint"
+)
+REMOTE_WRITE_REQUESTS_TOTAL = Counter(
+    "asus_remote_write_requests_total", "Remote write requests sent", ["status"]
+)
+REMOTE_WRITE_WAL_BYTES = Gauge(
+    "asus_remote_write_wal_bytes", "Bytes held in the remote write write-ahead log"
+)
+REMOTE_WRITE_WAL_SEGMENTS = Gauge(
+    "asus_remote_write_wal_segments", "Segments pending in the remote write write-ahead log"
+)
+REMOTE_WRITE_WAL_DROPPED_TOTAL = Counter(
+    "asus_remote_write_wal_dropped_segments_total",
+    "WAL segments discarded because the log was full or the receiver rejected them",
+)
+
+# History archive metrics
+HISTORY_BYTES = Gauge("asus_history_bytes", "Bytes held in the history archive", ["table"])
+HISTORY_SEGMENTS = Gauge("asus_history_segments", "Segments in the history archive", ["table"])
+
+# Startup metrics
+STARTUP_DURATION = Gauge(
+    "asus_exporter_startup_duration_seconds",
+    "Time spent in each startup phase (imports, server bind, router login, first metrics)",
+    ["phase"],
+)
+READY_STATUS = Gauge(
+    "asus_exporter_ready", "Exporter readiness (1=first collection completed, 0=not ready)"
+)
+
+# Exporter self-observability
+EVENT_LOOP_LAG = Histogram(
+    "asus_exporter_event_loop_lag_seconds",
+    "How late the event loop woke a sleeping monitor task",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+GC_PAUSE = Histogram(
+    "asus_exporter_gc_pause_seconds",
+    "Duration of garbage collector runs per generation",
+    ["generation"],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+EXPOSITION_BYTES = Gauge(
+    "asus_exporter_exposition_bytes", "Size of the last rendered metrics exposition"
+)
+EXPOSITION_RENDER_SECONDS = Histogram(
+    "asus_exporter_exposition_render_seconds",
+    "Time to render the metrics exposition",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+ROUTER_REQUESTS_TOTAL = Counter(
+    "asus_exporter_router_requests_total",
+    "HTTP requests made to the router web interface per endpoint",
+    ["host", "endpoint", "status"],
+)
+ROUTER_RESPONSE_BYTES_TOTAL = Counter(
+    "asus_exporter_router_response_bytes_total",
+    "Response bytes received from the router web interface per endpoint",
+    ["host", "endpoint"],
+)
+
+# Capability probing
+CAPABILITY_SUPPORTED = Gauge(
+    "asus_capability_supported",
+    "Whether the router model supports an AsusData type (1=yes, 0=skipped)",
+    ["data_type"],
+)
+
+# Syslog receiver and push ingestion
+SYSLOG_EVENTS_TOTAL = Counter(
+    "asus_syslog_events_total",
+    "Router syslog events recognised by the syslog receiver",
+    ["program", "event"],
+)
+INGEST_SAMPLES_TOTAL = Counter(
+    "asus_ingest_samples_total",
+    "Samples pushed by a router-side agent to /api/ingest",
+    ["measurement"],
+)
+# Pushed /proc/net/dev counters keep their own families: kernel interface names differ from
+# asusrouter's keys, and two sources writing one counter would look like counter resets.
+# Registered by PushIngestor, so they only appear with ingestion enabled.
+PUSH_INTERFACE_RX_BYTES = Counter(
+    "asus_push_interface_rx_bytes_total",
+    "Interface RX bytes pushed by the router-side agent",
+    ["interface"],
+    registry=None,
+)
+PUSH_INTERFACE_TX_BYTES = Counter(
+    "asus_push_interface_tx_bytes_total",
+    "Interface TX bytes pushed by the router-side agent",
+    ["interface"],
+    registry=None,
+)
+PUSH_WAN_RX_BYTES = Counter(
+    "asus_push_wan_rx_bytes_total", "WAN RX bytes pushed by the router-side agent", registry=None
+)
+PUSH_WAN_TX_BYTES = Counter(
+    "asus_push_wan_tx_bytes_total", "WAN TX bytes pushed by the router-side agent", registry=None
+)
+PUSH_WAN_RX_RATE = Gauge(
+    "asus_push_wan_rx_rate_bytes_per_sec",
+    "WAN RX rate derived from pushed counters",
+    registry=None,
+)
+PUSH_WAN_TX_RATE = Gauge(
+    "asus_push_wan_tx_rate_bytes_per_sec",
+    "WAN TX rate derived from pushed counters",
+    registry=None,
+)
+PUSH_FAMILIES = [
+    PUSH_INTERFACE_RX_BYTES,
+    PUSH_INTERFACE_TX_BYTES,
+    PUSH_WAN_RX_BYTES,
+    PUSH_WAN_TX_BYTES,
+    PUSH_WAN_RX_RATE,
+    PUSH_WAN_TX_RATE,
+]
+
+# Active probes run by the exporter itself (TCP connect, HTTP, DNS)
+PROBE_DURATION = Histogram(
+    "asus_probe_duration_seconds",
+    "Duration of successful active probes",
+    ["probe_type", "target"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+PROBES_TOTAL = Counter(
+    "asus_probes_total",
+    "Active probes by result (success, timeout, error)",
+    ["probe_type", "target", "result"],
+)
+
+# Client presence sessions, derived from isOnline/band/node changes between cycles
+CLIENT_CONNECTS_TOTAL = Counter(
+    "asus_client_connects_total",
+    "Client connect events per band and AiMesh node",
+    ["band", "node"],
+    registry=None,
+)
+CLIENT_DISCONNECTS_TOTAL = Counter(
+    "asus_client_disconnects_total",
+    "Client disconnect events per band and AiMesh node",
+    ["band", "node"],
+    registry=None,
+)
+CLIENT_ROAMS_TOTAL = Counter(
+    "asus_client_roams_total",
+    "Clients moving to another band or AiMesh node while online, by destination",
+    ["band", "node"],
+    registry=None,
+)
+CLIENT_SESSION_DURATION = Histogram(
+    "asus_client_session_duration_seconds",
+    "Duration of completed client sessions",
+    ["band"],
+    buckets=(60, 300, 900, 1800, 3600, 4 * 3600, 12 * 3600, 86400, 3 * 86400, 7 * 86400),
+    registry=None,
+)
+
+# Per-band/per-node client distributions, rebuilt from the CLIENTS table once per cycle
+CLIENT_DISTRIBUTIONS = ClientDistributions()
+
+# Metric families owned by each collector, registered only when the collector is loaded
+COLLECTOR_FAMILIES = {
+    "system": [
+        CPU_USAGE,
+        LOAD_AVERAGE,
+        RAM_USED,
+        RAM_FREE,
+        RAM_TOTAL,
+        RAM_USAGE_PERCENT,
+        RAM_BUFFERS,
+        RAM_CACHE,
+        RAM_SWAP1,
+        RAM_SWAP2,
+        NVRAM_USED,
+        JFFS_FREE,
+        JFFS_USED,
+        JFFS_TOTAL,
+        TOTAL_CONNECTIONS,
+        ACTIVE_CONNECTIONS,
+    ],
+    "network": [
+        WAN_RX_BYTES,
+        WAN_TX_BYTES,
+        WAN_RX_RATE,
+        WAN_TX_RATE,
+        WAN_STATUS,
+        WAN_IP_ADDRESS,
+        WAN_DNS_SERVERS,
+        WAN_UPTIME,
+        INTERFACE_RX_BYTES,
+        INTERFACE_TX_BYTES,
+    ],
+    "wifi": [
+        WIFI_CLIENTS_TOTAL,
+        WIFI_CLIENTS_BY_BAND,
+        WIFI_CLIENTS_ASSOCIATED,
+        WIFI_CLIENTS_AUTHORIZED,
+        WIFI_CLIENTS_AUTHENTICATED,
+        CLIENT_COUNT_BY_TYPE,
+        CLIENT_ONLINE,
+        CLIENT_RSSI,
+        CLIENT_TX_RATE,
+        CLIENT_RX_RATE,
+        CLIENT_INTERNET_STATE,
+        CLIENT_VENDOR,
+        CLIENT_DISTRIBUTIONS,
+        CLIENT_CONNECTS_TOTAL,
+        CLIENT_DISCONNECTS_TOTAL,
+        CLIENT_ROAMS_TOTAL,
+        CLIENT_SESSION_DURATION,
+        GWLAN_STATUS,
+        GWLAN_CLIENT_COUNT,
+        WLAN_STATUS,
+        WLAN_CHANNEL,
+        WLAN_TXPOWER,
+        WLAN_BANDWIDTH,
+    ],
+    "hardware": [
+        PORT_STATUS,
+        PORT_LINK_RATE,
+        PORT_MAX_RATE,
+        PORT_CAPABILITIES,
+        PORT_TRANSITIONS_TOTAL,
+        PORT_STATE_DURATION,
+        TEMPERATURE,
+        NODE_STATUS,
+    ],
+    "firmware": [
+        ROUTER_INFO,
+        BOOTTIME,
+        FIRMWARE_INFO,
+        FIRMWARE_UPDATE_AVAILABLE,
+        FIRMWARE_BUILD_INFO,
+        FIRMWARE_RELEASE_NOTES,
+        SYSTEM_FLAGS,
+        DEVICE_MAP_INFO,
+        SYSTEM_MODEL_INFO,
+        SYSTEM_SERIAL_INFO,
+    ],
+    "vpn": [
+        OPENVPN_CLIENT_STATUS,
+        OPENVPN_SERVER_STATUS,
+        WIREGUARD_CLIENT_STATUS,
+        WIREGUARD_SERVER_STATUS,
+        VPNC_CLIENT_COUNT,
+        VPNC_CLIENT_UPTIME,
+        VPNC_CLIENT_TRAFFIC_RX,
+        VPNC_CLIENT_TRAFFIC_TX,
+    ],
+    "services": [
+        LED_STATUS,
+        AURA_STATUS,
+        SPEEDTEST_DOWNLOAD_MBPS,
+        SPEEDTEST_UPLOAD_MBPS,
+        SPEEDTEST_PING_MS,
+        SPEEDTEST_TIMESTAMP,
+        AIMESH_NODE_COUNT,
+        AIMESH_NODE_STATUS,
+        DSL_RATE_DOWN,
+        DSL_RATE_UP,
+        DSL_SNR_DOWN,
+        DSL_SNR_UP,
+        PARENTAL_CONTROL_ENABLED,
+        PARENTAL_CONTROL_RULES,
+        PARENTAL_CONTROL_BLOCKED_CLIENTS,
+        PORT_FORWARDING_ENABLED,
+        PORT_FORWARDING_RULES,
+        PING_RESPONSE_TIME,
+        PING_PACKET_LOSS,
+    ],
+    "aimesh": [
+        AIMESH_NODE_UP,
+        AIMESH_NODE_POLL_DURATION,
+        AIMESH_NODE_CPU_USAGE,
+        AIMESH_NODE_RAM_USAGE,
+        AIMESH_NODE_TEMPERATURE,
+        AIMESH_NODE_PORT_STATUS,
+        AIMESH_NODE_PORT_LINK_RATE,
+        AIMESH_NODE_CLIENTS,
+    ],
+}
+
+_registered_families: set[int] = set()
+
+
+def family_names(family: Any) -> list[str]:
+    """Exposition names of a family; custom collectors may expose several"""
+    if hasattr(family, "_name"):
+        return [family._name]
+    return [metric.name for metric in family.describe()]
+
+
+def family_name(family: Any) -> str:
+    """Exposition name of a metric family (counters without "_total", info without "_info")"""
+    return family_names(family)[0]
+
+
+def family_matches(family: Any, names: set[str]) -> bool:
+    """Whether a family is named in a set, accepting the _total/_info sample suffixes too"""
+    return any(names & {name, f"{name}_total", f"{name}_info"} for name in family_names(family))
+
+
+def register_collector_families(
+    collector_name: str,
+    registry: CollectorRegistry = REGISTRY,
+    allowed: set[str] | None = None,
+    denied: set[str] | None = None,
+):
+    """Register a collector's metric families, honouring family allow/deny lists"""
+    for family in COLLECTOR_FAMILIES.get(collector_name, []):
+        if denied and family_matches(family, denied):
+            continue
+        if allowed and not family_matches(family, allowed):
+            continue
+        if id(family) not in _registered_families:
+            registry.register(family)
+            _registered_families.add(id(family))
+
+
+def unregister_collector_families(collector_name: str, registry: CollectorRegistry = REGISTRY):
+    """Remove a collector's metric families from the exposition"""
+    for family in COLLECTOR_FAMILIES.get(collector_name, []):
+        if id(family) in _registered_families:
+            registry.unregister(family)
+            _registered_families.discard(id(family))
+
+
+# collect[] name for every family no collector owns: connection state, self-monitoring, process
+EXPORTER_GROUP = "exporter"
+
+
+def check_collector_names(names: Iterable[str]) -> None:
+    """Raise ValueError for names that are neither a collector nor the exporter group"""
+    unknown = set(names) - set(COLLECTOR_FAMILIES) - {EXPORTER_GROUP}
+    if unknown:
+        raise ValueError(f"Unknown collectors: {', '.join(sorted(unknown))}")
+
+
+@functools.cache
+def family_owners() -> dict[str, str]:
+    """Exposition family name (with _total/_info suffixes) -> owning collector"""
+    return {
+        f"{name}{suffix}": collector_name
+        for collector_name, families in COLLECTOR_FAMILIES.items()
+        for family in families
+        for name in family_names(family)
+        for suffix in ("", "_total", "_info")
+    }
+
+
+def select_families(names: Iterable[str], registry: CollectorRegistry = REGISTRY) -> list[Any]:
+    """Registered families of the named collectors, for rendering only part of the registry"""
+    names = set(names)
+    check_collector_names(names)
+    selected = {
+        id(family): family
+        for collector_name, families in COLLECTOR_FAMILIES.items()
+        if collector_name in names
+        for family in families
+        if id(family) in _registered_families
+    }
+    if EXPORTER_GROUP in names:
+        owned = {id(family) for families in COLLECTOR_FAMILIES.values() for family in families}
+        with registry._lock:
+            others = [c for c in registry._collector_to_names if id(c) not in owned]
+        selected.update((id(collector), collector) for collector in others)
+    return list(selected.values())
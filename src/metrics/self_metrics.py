@@ -0,0 +1,186 @@
+"""The exporter's own health: event loop lag, GC pauses, exposition size and series counts"""
+
+import asyncio
+import gc
+import time
+from collections.abc import Iterator
+from typing import Any
+
+from prometheus_client import REGISTRY, CollectorRegistry, generate_latest
+from prometheus_client.metrics_core import GaugeMetricFamily, Metric
+
+from .prometheus_metrics import (
+    EVENT_LOOP_LAG,
+    EXPORTER_GROUP,
+    EXPOSITION_BYTES,
+    EXPOSITION_RENDER_SECONDS,
+    GC_PAUSE,
+    family_owners,
+)
+
+# How often the lag monitor wakes up
+LOOP_LAG_INTERVAL = 0.5
+
+# Minimum seconds between two per-family analyses of a rendered exposition
+SERIES_REFRESH_INTERVAL = 60.0
+
+
+def analyze_exposition(data: bytes) -> dict[str, list[int]]:
+    """Family name -> [series, bytes] of a text exposition, HELP/TYPE lines included"""
+    stats: dict[str, list[int]] = {}
+    current = [0, 0]
+    for line in data.split(b"\n"):
+        if not line:
+            continue
+        if line.startswith(b"# HELP "):
+            name = line[7:].split(b" ", 1)[0].decode()
+            # Counters and histograms render their *_created samples as a separate family
+            if name.endswith("_created"):
+                base = name.removesuffix("_created")
+                name = f"{base}_total" if f"{base}_total" in stats else base
+            current = stats.setdefault(name, [0, 0])
+        elif not line.startswith(b"#"):
+            current[0] += 1
+        current[1] += len(line) + 1
+    return stats
+
+
+class SeriesCountCollector:
+    """Exports the series count per family seen in the latest analysed exposition"""
+
+    def __init__(self):
+        self.stats: dict[str, list[int]] = {}
+        self.analyzed_at = 0.0
+
+    def update(self, data: bytes, now: float) -> None:
+        self.stats = analyze_exposition(data)
+        self.analyzed_at = now
+
+    def collect(self) -> Iterator[Metric]:
+        family = GaugeMetricFamily(
+            "asus_exporter_series",
+            "Series per metric family in the last analysed exposition",
+            labels=["family"],
+        )
+        for name, (series, _) in sorted(self.stats.items()):
+            family.add_metric([name], series)
+        yield family
+
+
+SERIES_COUNTS = SeriesCountCollector()
+REGISTRY.register(SERIES_COUNTS)
+
+
+def render_exposition(registry: CollectorRegistry = REGISTRY) -> bytes:
+    """generate_latest() that records its own duration and size"""
+    start = time.perf_counter()
+    data = generate_latest(registry)
+    EXPOSITION_RENDER_SECONDS.observe(time.perf_counter() - start)
+    EXPOSITION_BYTES.set(len(data))
+    # The per-family scan is a Python loop over every line, so it runs at most once a minute
+    now = time.monotonic()
+    if registry is REGISTRY and now - SERIES_COUNTS.analyzed_at >= SERIES_REFRESH_INTERVAL:
+        SERIES_COUNTS.update(data, now)
+    return data
+
+
+class _Selection:
+    """Stands in for a registry in generate_latest, collecting only the given families"""
+
+    def __init__(self, families: list[Any]):
+        self.families = families
+
+    def collect(self) -> Iterator[Metric]:
+        for family in self.families:
+            yield from family.collect()
+
+
+def render_families(families: list[Any]) -> bytes:
+    """Exposition of some families only; not recorded as a full render"""
+    return generate_latest(_Selection(families))
+
+
+def filter_exposition(data: bytes | memoryview, collectors: set[str]) -> bytes:
+    """
+    The family blocks of an already rendered exposition that belong to the given
+    collectors (EXPORTER_GROUP for unowned families). Blocks are found by their HELP
+    lines, so the cost grows with the number of families rather than series.
+    """
+    data = bytes(data)
+    owners = family_owners()
+    parts = []
+    start = 0
+    while start < len(data):
+        end = data.find(b"\n# HELP ", start)
+        end = len(data) if end < 0 else end + 1
+        name = data[start + 7 : data.find(b" ", start + 7)].decode()
+        owner = owners.get(name) or owners.get(name.removesuffix("_created"), EXPORTER_GROUP)
+        if owner in collectors:
+            parts.append(data[start:end])
+        start = end
+    return b"".join(parts)
+
+
+def format_cardinality(data: bytes, sort_by: str = "series", limit: int = 50) -> str:
+    """A text table of families ranked by series or bytes, for /debug/cardinality"""
+    stats = analyze_exposition(data)
+    total_series = sum(series for series, _ in stats.values()) or 1
+    total_bytes = sum(size for _, size in stats.values()) or 1
+    column = 0 if sort_by == "series" else 1
+    ranked = sorted(stats.items(), key=lambda item: item[1][column], reverse=True)[:limit]
+
+    lines = [
+        f"{len(stats)} families, {total_series} series, {total_bytes} bytes",
+        "",
+        f"{'family':<60} {'series':>8} {'%':>6} {'bytes':>10} {'%':>6}",
+    ]
+    for name, (series, size) in ranked:
+        lines.append(
+            f"{name:<60} {series:>8} {series / total_series:>6.1%} "
+            f"{size:>10} {size / total_bytes:>6.1%}"
+        )
+    return "\n".join(lines) + "\n"
+
+
+_gc_started: dict[int, float] = {}
+
+
+def _gc_callback(phase: str, info: dict) -> None:
+    if phase == "start":
+        _gc_started[info["generation"]] = time.perf_counter()
+    else:
+        started = _gc_started.pop(info["generation"], None)
+        if started is not None:
+            GC_PAUSE.labels(generation=str(info["generation"])).observe(
+                time.perf_counter() - started
+            )
+
+
+def install_gc_timing() -> None:
+    """Time every collector run through gc.callbacks (idempotent)"""
+    if _gc_callback not in gc.callbacks:
+        gc.callbacks.append(_gc_callback)
+
+
+class LoopLagMonitor:
+    """Sleeps a fixed interval and records how much later than asked the loop woke it"""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL):
+        self.interval = interval
+        self.task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self.task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            EVENT_LOOP_LAG.observe(max(loop.time() - start - self.interval, 0.0))
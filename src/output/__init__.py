@@ -0,0 +1,13 @@
+"""Output package for publishing metrics without the aiohttp scrape server"""
+
+from .remote_write import RemoteWriteClient
+from .shm import SharedMemoryOutput, SnapshotBuffer
+from .textfile import TextfileOutput, UnixSocketOutput
+
+__all__ = [
+    "RemoteWriteClient",
+    "SharedMemoryOutput",
+    "SnapshotBuffer",
+    "TextfileOutput",
+    "UnixSocketOutput",
+]
@@ -0,0 +1,293 @@
+"""Prometheus remote_write client with an on-disk store-and-forward WAL"""
+
+import asyncio
+import logging
+import os
+import struct
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from prometheus_client import REGISTRY, CollectorRegistry
+
+from ..config import ExporterConfig
+from ..metrics.prometheus_metrics import (
+    REMOTE_WRITE_REQUESTS_TOTAL,
+    REMOTE_WRITE_SAMPLES_TOTAL,
+    REMOTE_WRITE_WAL_BYTES,
+    REMOTE_WRITE_WAL_DROPPED_TOTAL,
+    REMOTE_WRITE_WAL_SEGMENTS,
+)
+
+if TYPE_CHECKING:
+    import aiohttp
+
+try:
+    import cramjam
+except ImportError:  # pragma: no cover - optional speedup
+    cramjam = None
+
+logger = logging.getLogger(__name__)
+
+# Families whose "_created" samples are bookkeeping only and not worth shipping
+_CREATED_SAMPLE_TYPES = {"counter", "histogram", "summary", "gaugehistogram"}
+
+
+def _varint(value: int) -> bytes:
+    """Encode a non-negative integer as a protobuf varint"""
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _length_delimited(field_number: int, payload: bytes) -> bytes:
+    """Encode a length-delimited protobuf field (strings and embedded messages)"""
+    return _varint((field_number << 3) | 2) + _varint(len(payload)) + payload
+
+
+def encode_write_request(series: list[tuple[list[tuple[str, str]], float, int]]) -> bytes:
+    """
+    Encode a prometheus.WriteRequest protobuf message.
+    Each series is (sorted labels, value, timestamp in milliseconds) with one sample.
+    """
+    body = bytearray()
+    for labels, value, timestamp_ms in series:
+        timeseries = bytearray()
+        for name, label_value in labels:
+            label = _length_delimited(1, name.encode()) + _length_delimited(2, label_value.encode())
+            timeseries += _length_delimited(1, label)
+        sample = b"\x09" + struct.pack("<d", value) + b"\x10" + _varint(timestamp_ms)
+        timeseries += _length_delimited(2, sample)
+        body += _length_delimited(1, bytes(timeseries))
+    return bytes(body)
+
+
+def snappy_compress(data: bytes) -> bytes:
+    """
+    Compress data with the snappy block format required by remote_write.
+    Uses cramjam when installed, otherwise emits a valid literal-only snappy block.
+    """
+    if cramjam is not None:
+        return bytes(cramjam.snappy.compress_raw(data))
+
+    out = bytearray(_varint(len(data)))
+    for offset in range(0, len(data), 65536):
+        chunk = data[offset : offset + 65536]
+        length = len(chunk) - 1
+        if length < 60:
+            out.append(length << 2)
+        elif length < 256:
+            out.append(60 << 2)
+            out.append(length)
+        else:
+            out.append(61 << 2)
+            out += struct.pack("<H", length)
+        out += chunk
+    return bytes(out)
+
+
+def collect_series(
+    registry: CollectorRegistry, timestamp_ms: int, extra_labels: dict[str, str]
+) -> list[tuple[list[tuple[str, str]], float, int]]:
+    """Snapshot every sample in the registry as remote_write series"""
+    series = []
+    for family in registry.collect():
+        skip_created = family.type in _CREATED_SAMPLE_TYPES
+        for sample in family.samples:
+            if skip_created and sample.name.endswith("_created"):
+                continue
+            labels = {**extra_labels, **sample.labels, "__name__": sample.name}
+            sample_ts = (
+                int(sample.timestamp * 1000) if sample.timestamp is not None else timestamp_ms
+            )
+            series.append((sorted(labels.items()), float(sample.value), sample_ts))
+    return series
+
+
+class WriteAheadLog:
+    """Bounded directory of compressed WriteRequest segments, replayed oldest first"""
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        existing = self.segments()
+        self._next_seq = int(existing[-1].name.split("-")[0]) + 1 if existing else 0
+        self._update_gauges()
+
+    def segments(self) -> list[Path]:
+        """Return pending segments ordered from oldest to newest"""
+        return sorted(self.directory.glob("*.seg"))
+
+    def append(self, payload: bytes, sample_count: int) -> Path:
+        """Persist a payload atomically and enforce the size bound"""
+        segment = self.directory / f"{self._next_seq:020d}-{sample_count}.seg"
+        self._next_seq += 1
+        tmp_path = segment.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, segment)
+
+        segments = self.segments()
+        total = sum(s.stat().st_size for s in segments)
+        while total > self.max_bytes and len(segments) > 1:
+            oldest = segments.pop(0)
+            total -= oldest.stat().st_size
+            oldest.unlink(missing_ok=True)
+            REMOTE_WRITE_WAL_DROPPED_TOTAL.inc()
+            logger.warning(f"Remote write WAL full, dropped oldest segment {oldest.name}")
+
+        self._update_gauges()
+        return segment
+
+    def remove(self, segment: Path) -> None:
+        """Delete a segment once it has been delivered or rejected"""
+        segment.unlink(missing_ok=True)
+        self._update_gauges()
+
+    @staticmethod
+    def sample_count(segment: Path) -> int:
+        """Number of samples encoded in a segment, taken from its file name"""
+        try:
+            return int(segment.stem.split("-")[1])
+        except (IndexError, ValueError):
+            return 0
+
+    def _update_gauges(self) -> None:
+        segments = self.segments()
+        REMOTE_WRITE_WAL_SEGMENTS.set(len(segments))
+        REMOTE_WRITE_WAL_BYTES.set(sum(s.stat().st_size for s in segments))
+
+
+class RemoteWriteClient:
+    """Pushes each collection cycle to a Prometheus remote_write endpoint"""
+
+    def __init__(self, config: ExporterConfig, registry: CollectorRegistry = REGISTRY):
+        self.config = config
+        self.registry = registry
+        self.wal = WriteAheadLog(config.remote_write_wal_dir, config.remote_write_wal_max_bytes)
+        self.extra_labels = {"job": "asus_router", "instance": config.hostname}
+        self.session: aiohttp.ClientSession | None = None
+        self.pending = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def start(self) -> None:
+        """Start the delivery task, replaying anything left in the WAL by a previous run"""
+        if self.wal.segments():
+            self.logger.info(f"Replaying {len(self.wal.segments())} WAL segments")
+            self.pending.set()
+        self.task = asyncio.create_task(self._deliver())
+
+    async def publish(self) -> None:
+        """Snapshot the registry into the WAL and wake the delivery task"""
+        timestamp_ms = int(time.time() * 1000)
+        series = collect_series(self.registry, timestamp_ms, self.extra_labels)
+        batch_size = max(1, self.config.remote_write_batch_size)
+
+        for start in range(0, len(series), batch_size):
+            batch = series[start : start + batch_size]
+            self.wal.append(snappy_compress(encode_write_request(batch)), len(batch))
+
+        self.pending.set()
+
+    async def _deliver(self) -> None:
+        """Drain the WAL whenever new segments arrive, so an outage never stalls collection"""
+        while True:
+            await self.pending.wait()
+            self.pending.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                # Segments stay queued and are retried after the next cycle
+                self.logger.error(f"Remote write delivery failed: {e}")
+
+    async def flush(self) -> None:
+        """Send pending segments in order, stopping at the first retryable failure"""
+        for segment in self.wal.segments():
+            try:
+                payload = segment.read_bytes()
+            except FileNotFoundError:
+                continue
+
+            delivered = await self._send_with_retry(payload)
+            if delivered is None:
+                # Receiver rejected the payload outright, replaying it will never succeed
+                REMOTE_WRITE_WAL_DROPPED_TOTAL.inc()
+                self.wal.remove(segment)
+            elif delivered:
+                REMOTE_WRITE_SAMPLES_TOTAL.inc(self.wal.sample_count(segment))
+                self.wal.remove(segment)
+            else:
+                self.logger.warning(
+                    f"Remote write endpoint unavailable, {len(self.wal.segments())} segments queued"
+                )
+                break
+
+    async def _send_with_retry(self, payload: bytes) -> bool | None:
+        """
+        POST a payload with exponential backoff.
+        Returns True on success, False if retries ran out, None if the payload was rejected.
+        """
+        # Imported here so the textfile/unix output modes never load aiohttp
+        import aiohttp
+
+        for attempt in range(self.config.remote_write_max_retries + 1):
+            if attempt:
+                await asyncio.sleep(min(0.5 * 2 ** (attempt - 1), 30))
+            try:
+                status = await self._post(payload)
+            except (aiohttp.ClientError, TimeoutError) as e:
+                self.logger.debug(f"Remote write attempt {attempt + 1} failed: {e}")
+                REMOTE_WRITE_REQUESTS_TOTAL.labels(status="retry").inc()
+                continue
+
+            if 200 <= status < 300:
+                REMOTE_WRITE_REQUESTS_TOTAL.labels(status="success").inc()
+                return True
+            if status == 429 or status >= 500:
+                REMOTE_WRITE_REQUESTS_TOTAL.labels(status="retry").inc()
+                continue
+
+            self.logger.error(f"Remote write endpoint rejected payload with HTTP {status}")
+            REMOTE_WRITE_REQUESTS_TOTAL.labels(status="rejected").inc()
+            return None
+        return False
+
+    async def _post(self, payload: bytes) -> int:
+        """Send a single compressed WriteRequest and return the HTTP status"""
+        import aiohttp
+
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.config.remote_write_timeout)
+            )
+
+        headers = {
+            "Content-Encoding": "snappy",
+            "Content-Type": "application/x-protobuf",
+            "User-Agent": "asus-router-exporter",
+            "X-Prometheus-Remote-Write-Version": "0.1.0",
+        }
+        if self.config.remote_write_bearer_token:
+            headers["Authorization"] = f"Bearer {self.config.remote_write_bearer_token}"
+
+        async with self.session.post(
+            self.config.remote_write_url, data=payload, headers=headers
+        ) as response:
+            return response.status
+
+    async def close(self) -> None:
+        """Stop delivery and close the HTTP session; undelivered segments stay in the WAL"""
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+        if self.session:
+            await self.session.close()
+            self.session = None
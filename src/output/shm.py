@@ -0,0 +1,176 @@
+"""Shared memory double buffer carrying each cycle's exposition and JSON snapshot to a server process"""
+
+import contextlib
+import json
+import logging
+import struct
+import time
+from collections.abc import Callable
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, NamedTuple
+
+from prometheus_client import REGISTRY, CollectorRegistry
+
+from ..config import ExporterConfig
+from ..metrics.self_metrics import render_exposition
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ASX1"
+
+# magic, sequence (odd while a write is in progress), active slot, slot capacity
+HEADER = struct.Struct("<4sxxxxQI4xQ")
+# exposition length, snapshot length, publish time
+SLOT_HEADER = struct.Struct("<QQd")
+
+
+class Snapshot(NamedTuple):
+    """One published cycle; the views point straight into shared memory"""
+
+    sequence: int
+    published_at: float
+    exposition: memoryview
+    snapshot: memoryview
+
+
+def _untrack(segment: shared_memory.SharedMemory) -> None:
+    """Keep the resource tracker from unlinking the segment when this process exits"""
+    resource_tracker.unregister(segment._name, "shared_memory")
+
+
+class SnapshotBuffer:
+    """
+    Two slots behind a header. The writer fills the slot that is not active, then flips
+    the active slot and bumps the sequence, so readers never see a half-written slot. A
+    slot is only rewritten two publishes after it was active, which leaves a reader one
+    full collection interval to send a response straight from shared memory.
+    """
+
+    def __init__(self, segment: shared_memory.SharedMemory):
+        self.segment = segment
+        self.buffer = segment.buf
+
+    @classmethod
+    def create(cls, name: str, size: int) -> "SnapshotBuffer":
+        """Create the segment, or reuse one left by a previous collector process"""
+        try:
+            segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            segment = shared_memory.SharedMemory(name=name)
+            if segment.size < size:
+                # Too small for the configured size: replace it (readers reattach when stale)
+                segment.close()
+                segment.unlink()
+                segment = shared_memory.SharedMemory(name=name, create=True, size=size)
+            elif bytes(segment.buf[:4]) == MAGIC:
+                _untrack(segment)
+                return cls(segment)
+        _untrack(segment)
+        HEADER.pack_into(segment.buf, 0, MAGIC, 0, 0, (size - HEADER.size) // 2)
+        return cls(segment)
+
+    @classmethod
+    def attach(cls, name: str) -> "SnapshotBuffer":
+        """Open an existing segment for reading (FileNotFoundError until a writer created it)"""
+        segment = shared_memory.SharedMemory(name=name)
+        _untrack(segment)
+        if bytes(segment.buf[:4]) != MAGIC:
+            segment.close()
+            raise ValueError(f"Shared memory segment '{name}' is not an exporter snapshot buffer")
+        return cls(segment)
+
+    def _slot_offset(self, slot: int, capacity: int) -> int:
+        return HEADER.size + slot * capacity
+
+    def write(self, exposition: bytes, snapshot: bytes, now: float | None = None) -> int:
+        """Publish one cycle into the inactive slot and return the new sequence"""
+        _, sequence, active, capacity = HEADER.unpack_from(self.buffer, 0)
+        needed = SLOT_HEADER.size + len(exposition) + len(snapshot)
+        if needed > capacity:
+            raise ValueError(
+                f"Snapshot of {needed} bytes does not fit a {capacity} byte slot, "
+                "raise EXPORTER_SHM_SIZE"
+            )
+        slot = 1 - active
+        offset = self._slot_offset(slot, capacity)
+        # Odd sequence: a write is in progress (the active slot stays readable meanwhile)
+        HEADER.pack_into(self.buffer, 0, MAGIC, sequence + 1, active, capacity)
+        SLOT_HEADER.pack_into(
+            self.buffer, offset, len(exposition), len(snapshot), now or time.time()
+        )
+        start = offset + SLOT_HEADER.size
+        self.buffer[start : start + len(exposition)] = exposition
+        start += len(exposition)
+        self.buffer[start : start + len(snapshot)] = snapshot
+        HEADER.pack_into(self.buffer, 0, MAGIC, sequence + 2, slot, capacity)
+        return sequence + 2
+
+    def read(self) -> Snapshot | None:
+        """The active slot, or None before the first publish"""
+        while True:
+            _, sequence, active, capacity = HEADER.unpack_from(self.buffer, 0)
+            if sequence < 2:
+                return None
+            offset = self._slot_offset(active, capacity)
+            exposition_length, snapshot_length, published_at = SLOT_HEADER.unpack_from(
+                self.buffer, offset
+            )
+            start = offset + SLOT_HEADER.size
+            exposition = self.buffer[start : start + exposition_length]
+            snapshot = self.buffer[
+                start + exposition_length : start + exposition_length + snapshot_length
+            ]
+            # The active slot cannot have been rewritten unless the sequence moved twice
+            if HEADER.unpack_from(self.buffer, 0)[1] <= sequence + 1:
+                return Snapshot(sequence, published_at, exposition, snapshot)
+            exposition.release()
+            snapshot.release()
+
+    def close(self) -> None:
+        """Unmap the segment; with responses still holding views it is unmapped once they finish"""
+        self.buffer = None
+        try:
+            self.segment.close()
+        except BufferError:
+            # The mapping now lives on in the views and is unmapped with the last of them
+            self.segment._mmap = None
+
+    def unlink(self) -> None:
+        """Remove the segment name; mappings stay valid until closed"""
+        # Re-registered so unlink() does not warn about an untracked name
+        resource_tracker.register(self.segment._name, "shared_memory")
+        with contextlib.suppress(FileNotFoundError):
+            self.segment.unlink()
+
+
+class SharedMemoryOutput:
+    """Publishes the exposition and a JSON state snapshot for the server process each cycle"""
+
+    def __init__(
+        self,
+        config: ExporterConfig,
+        snapshot: Callable[[], dict[str, Any]],
+        registry: CollectorRegistry = REGISTRY,
+    ):
+        self.name = config.shm_name
+        self.size = config.shm_size
+        self.snapshot = snapshot
+        self.registry = registry
+        self.buffer: SnapshotBuffer | None = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def start(self) -> None:
+        """Create or reuse the shared memory segment"""
+        self.buffer = SnapshotBuffer.create(self.name, self.size)
+        self.logger.info(f"Publishing snapshots to shared memory '{self.name}' ({self.size} bytes)")
+
+    async def publish(self) -> None:
+        """Render once per cycle into the inactive slot"""
+        snapshot = json.dumps(self.snapshot(), default=str).encode()
+        self.buffer.write(render_exposition(self.registry), snapshot)
+
+    async def close(self) -> None:
+        """Unmap the segment but keep it, so a server keeps serving the last snapshot"""
+        if self.buffer:
+            self.buffer.close()
+            self.buffer = None
@@ -0,0 +1,129 @@
+"""File and Unix socket outputs for co-locating with node_exporter"""
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import os
+from pathlib import Path
+
+from prometheus_client import (
+    GC_COLLECTOR,
+    PLATFORM_COLLECTOR,
+    PROCESS_COLLECTOR,
+    REGISTRY,
+    CollectorRegistry,
+)
+
+from ..config import ExporterConfig
+from ..metrics.prometheus_metrics import COLLECTOR_FAMILIES, EXPORTER_GROUP, select_families
+from ..metrics.self_metrics import render_exposition, render_families
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# node_exporter exports its own process_* families; duplicates would fail its scrape
+RUNTIME_COLLECTORS = (PROCESS_COLLECTOR, PLATFORM_COLLECTOR, GC_COLLECTOR)
+
+
+class TextfileOutput:
+    """Writes each cycle's exposition to a .prom file for node_exporter's textfile collector"""
+
+    def __init__(self, config: ExporterConfig, registry: CollectorRegistry = REGISTRY):
+        self.path = Path(config.textfile_path)
+        self.diff_write = config.textfile_diff_write
+        self.registry = registry
+        self._last_digest: bytes | None = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def start(self) -> None:
+        """Make sure the textfile directory exists"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger.info(f"Writing metrics to textfile: {self.path}")
+
+    async def publish(self) -> None:
+        """Atomically replace the .prom file with the collector and exporter families"""
+        router = render_families(select_families(COLLECTOR_FAMILIES, self.registry))
+
+        digest = None
+        if self.diff_write:
+            # Skip the write (and the flash wear) while the router-derived families are
+            # unchanged; the exporter's own families change every cycle and are not hashed
+            digest = hashlib.blake2b(router, digest_size=16).digest()
+            if digest == self._last_digest:
+                return
+
+        exporter = [
+            family
+            for family in select_families([EXPORTER_GROUP], self.registry)
+            if family not in RUNTIME_COLLECTORS
+        ]
+        data = router + render_families(exporter)
+
+        # node_exporter only reads *.prom, so the temporary file is never picked up half-written
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        # Only remembered once the file is in place, so a failed write is retried next cycle
+        self._last_digest = digest
+
+    async def close(self) -> None:
+        """Nothing to release; the last file stays for node_exporter"""
+
+
+class UnixSocketOutput:
+    """Serves the latest exposition over a Unix domain socket instead of a TCP listener"""
+
+    def __init__(self, config: ExporterConfig, registry: CollectorRegistry = REGISTRY):
+        self.path = Path(config.unix_socket_path)
+        self.registry = registry
+        self.server: asyncio.AbstractServer | None = None
+        self._body = b""
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def start(self) -> None:
+        """Bind the Unix socket, replacing a stale socket file from a previous run"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()
+        self._body = render_exposition(self.registry)
+        self.server = await asyncio.start_unix_server(self._handle, path=str(self.path))
+        os.chmod(self.path, 0o660)
+        self.logger.info(f"Metrics available on unix socket: {self.path}")
+
+    async def publish(self) -> None:
+        """Render once per cycle so requests are served from the cached body"""
+        self._body = render_exposition(self.registry)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer any HTTP request on the socket with the cached exposition"""
+        try:
+            await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+            body = self._body
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                + f"Content-Type: {CONTENT_TYPE}\r\n".encode()
+                + f"Content-Length: {len(body)}\r\n".encode()
+                + b"Connection: close\r\n\r\n"
+                + body
+            )
+            await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, TimeoutError) as e:
+            self.logger.debug(f"Dropped malformed unix socket request: {e}")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def close(self) -> None:
+        """Stop serving and remove the socket file"""
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        with contextlib.suppress(FileNotFoundError):
+            self.path.unlink()
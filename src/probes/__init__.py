@@ -0,0 +1,5 @@
+"""Active probes run by the exporter: TCP connect, HTTP and DNS latency and loss"""
+
+from .engine import ProbeEngine, ProbeTarget, parse_probe_target
+
+__all__ = ["ProbeEngine", "ProbeTarget", "parse_probe_target"]
@@ -0,0 +1,65 @@
+"""Minimal DNS-over-UDP query, enough to time a resolver without the getaddrinfo thread pool"""
+
+import asyncio
+import random
+import struct
+
+DNS_PORT = 53
+RESOLV_CONF = "/etc/resolv.conf"
+
+# Response codes that still mean the resolver answered (NOERROR, NXDOMAIN)
+ANSWERED_RCODES = {0, 3}
+
+
+def system_nameserver(path: str = RESOLV_CONF) -> str:
+    """First nameserver of resolv.conf, or localhost when there is none"""
+    try:
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == "nameserver":
+                    return parts[1]
+    except OSError:
+        pass
+    return "127.0.0.1"
+
+
+def build_query(name: str, query_id: int) -> bytes:
+    """A recursive A query for a name"""
+    header = struct.pack("!HHHHHH", query_id, 0x0100, 1, 0, 0, 0)
+    labels = b"".join(
+        bytes([len(label)]) + label.encode("idna") for label in name.strip(".").split(".")
+    )
+    return header + labels + b"\x00" + struct.pack("!HH", 1, 1)
+
+
+class _DnsProtocol(asyncio.DatagramProtocol):
+    def __init__(self, query_id: int, answer: asyncio.Future):
+        self.query_id = query_id
+        self.answer = answer
+
+    def datagram_received(self, data: bytes, _addr) -> None:
+        # Ignore stray datagrams; only the reply to our ID completes the query
+        if len(data) >= 4 and not self.answer.done():
+            query_id, flags = struct.unpack("!HH", data[:4])
+            if query_id == self.query_id and flags & 0x8000:
+                self.answer.set_result(flags & 0x000F)
+
+    def error_received(self, exc: Exception) -> None:
+        if not self.answer.done():
+            self.answer.set_exception(exc)
+
+
+async def query(server: str, name: str, port: int = DNS_PORT) -> int:
+    """Send one query and return the response code; the caller applies the timeout"""
+    loop = asyncio.get_running_loop()
+    query_id = random.randrange(0x10000)
+    answer = loop.create_future()
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: _DnsProtocol(query_id, answer), remote_addr=(server, port)
+    )
+    try:
+        transport.sendto(build_query(name, query_id))
+        return await answer
+    finally:
+        transport.close()
@@ -0,0 +1,153 @@
+"""Asyncio engine running TCP-connect, HTTP and DNS probes on a jittered schedule"""
+
+import asyncio
+import logging
+import random
+import time
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+from ..metrics.prometheus_metrics import PROBE_DURATION, PROBES_TOTAL
+from . import dns
+
+logger = logging.getLogger(__name__)
+
+PROBE_TYPES = ("tcp", "http", "dns")
+
+# Each wait between probes of a target is the interval +/- this fraction
+JITTER = 0.1
+
+# HTTP probes read at most this much of the body, enough to include the first bytes
+HTTP_READ_BYTES = 64 * 1024
+
+
+class ProbeTarget(NamedTuple):
+    """A parsed target; spec is the configured string and the target label"""
+
+    probe_type: str
+    spec: str
+    host: str
+    port: int
+    path: str = ""
+
+
+def parse_probe_target(spec: str) -> ProbeTarget:
+    """
+    Parse "tcp://host:port", "http(s)://host/path" or "dns://server[:port]/name"
+    ("dns:///name" uses the first resolv.conf nameserver).
+    """
+    parts = urlsplit(spec)
+    scheme = parts.scheme.lower()
+    try:
+        port = parts.port
+    except ValueError:
+        raise ValueError(f"Invalid port in probe target '{spec}'") from None
+
+    if scheme == "tcp":
+        if not parts.hostname or port is None:
+            raise ValueError(f"TCP probe target '{spec}' needs tcp://host:port")
+        return ProbeTarget("tcp", spec, parts.hostname, port)
+    if scheme in ("http", "https"):
+        if not parts.hostname:
+            raise ValueError(f"HTTP probe target '{spec}' has no host")
+        return ProbeTarget("http", spec, parts.hostname, port or 0)
+    if scheme == "dns":
+        name = parts.path.strip("/")
+        if not name:
+            raise ValueError(f"DNS probe target '{spec}' needs dns://[server]/name")
+        server = parts.hostname or dns.system_nameserver()
+        return ProbeTarget("dns", spec, server, port or dns.DNS_PORT, name)
+    raise ValueError(f"Unknown probe type in '{spec}', expected one of {', '.join(PROBE_TYPES)}")
+
+
+class ProbeEngine:
+    """
+    Runs one lightweight task per target. Start times are spread over an interval and
+    every wait is jittered, so hundreds of targets never fire in lockstep. A semaphore
+    caps how many probes are in flight at once. Successful probe durations go into a
+    histogram and every outcome is counted, so latency and loss come from
+    rate()/histogram_quantile() instead of a last-value gauge.
+    """
+
+    def __init__(
+        self,
+        targets: list[str],
+        interval: float = 15.0,
+        timeout: float = 5.0,
+        concurrency: int = 256,
+    ):
+        self.targets = [parse_probe_target(spec) for spec in targets]
+        self.interval = interval
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self._tasks: list[asyncio.Task] = []
+        self._semaphore: asyncio.Semaphore | None = None
+        self._session = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def start(self) -> None:
+        """Start a probe loop per target"""
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        if any(target.probe_type == "http" for target in self.targets):
+            import aiohttp
+
+            # A fresh connection per probe, so the timing includes connect (and TLS)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.concurrency, force_close=True)
+            )
+        self._tasks = [asyncio.create_task(self._run(target)) for target in self.targets]
+        self.logger.info(
+            f"Probing {len(self.targets)} targets every {self.interval}s "
+            f"(timeout {self.timeout}s, concurrency {self.concurrency})"
+        )
+
+    async def close(self) -> None:
+        """Stop all probe loops"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    async def _run(self, target: ProbeTarget) -> None:
+        await asyncio.sleep(random.uniform(0, self.interval))
+        while True:
+            await self.probe(target)
+            await asyncio.sleep(self.interval * random.uniform(1 - JITTER, 1 + JITTER))
+
+    async def probe(self, target: ProbeTarget) -> str:
+        """Run one probe, record it and return its result"""
+        async with self._semaphore:
+            # Timed after acquiring the semaphore so queueing does not count as latency
+            start = time.perf_counter()
+            try:
+                async with asyncio.timeout(self.timeout):
+                    await getattr(self, f"_probe_{target.probe_type}")(target)
+                result = "success"
+                PROBE_DURATION.labels(probe_type=target.probe_type, target=target.spec).observe(
+                    time.perf_counter() - start
+                )
+            except TimeoutError:
+                result = "timeout"
+            except Exception as e:
+                result = "error"
+                self.logger.debug(f"Probe {target.spec} failed: {e!r}")
+        PROBES_TOTAL.labels(probe_type=target.probe_type, target=target.spec, result=result).inc()
+        return result
+
+    async def _probe_tcp(self, target: ProbeTarget) -> None:
+        _, writer = await asyncio.open_connection(target.host, target.port)
+        writer.close()
+
+    async def _probe_http(self, target: ProbeTarget) -> None:
+        async with self._session.get(target.spec, allow_redirects=False) as response:
+            await response.content.read(HTTP_READ_BYTES)
+            if response.status >= 400:
+                raise ValueError(f"HTTP {response.status}")
+
+    async def _probe_dns(self, target: ProbeTarget) -> None:
+        rcode = await dns.query(target.host, target.path, target.port)
+        if rcode not in dns.ANSWERED_RCODES:
+            raise ValueError(f"DNS response code {rcode}")
@@ -0,0 +1,124 @@
+"""On-demand cProfile, stack sampling and tracemalloc for the /debug endpoints"""
+
+import asyncio
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MAX_PROFILE_SECONDS = 60
+
+# Stack sampling period for collapsed-stack profiles
+SAMPLE_INTERVAL = 0.005
+
+# Frames kept per allocation while tracemalloc is running
+HEAP_FRAMES = 10
+
+HEAP_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+class ProfileBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running"""
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{Path(code.co_filename).stem}:{code.co_qualname}"
+
+
+class Profiler:
+    """Runs one profile at a time and keeps the previous heap snapshot for diffs"""
+
+    def __init__(self):
+        self.busy = False
+        self._previous_snapshot: tracemalloc.Snapshot | None = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def profile(self, seconds: float, output: str = "pstats", limit: int = 50) -> str:
+        """Profile the event loop thread for some seconds while it keeps serving"""
+        if self.busy:
+            raise ProfileBusyError("a profile is already running")
+        self.busy = True
+        try:
+            if output == "collapsed":
+                return await self._sample(seconds)
+            return await self._cprofile(seconds, limit)
+        finally:
+            self.busy = False
+
+    async def _cprofile(self, seconds: float, limit: int) -> str:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            profiler.disable()
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+    async def _sample(self, seconds: float) -> str:
+        """Collapsed stacks ("a;b;c count") of the loop thread, for flamegraph.pl/speedscope"""
+        thread_id = threading.get_ident()
+        stacks: Counter[str] = Counter()
+        stop = threading.Event()
+
+        def sample() -> None:
+            while not stop.wait(SAMPLE_INTERVAL):
+                frame = sys._current_frames().get(thread_id)
+                names = []
+                while frame is not None:
+                    names.append(_frame_name(frame))
+                    frame = frame.f_back
+                stacks[";".join(reversed(names))] += 1
+
+        sampler = threading.Thread(target=sample, name="debug-profile-sampler", daemon=True)
+        sampler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            stop.set()
+            await asyncio.to_thread(sampler.join)
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+    def heap(self, limit: int = 25, group_by: str = "lineno") -> str:
+        """Top allocations and the change since the previous call (starts tracing if needed)"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(HEAP_FRAMES)
+            self._previous_snapshot = None
+            self.logger.info("tracemalloc started by /debug/heap")
+            return "tracemalloc started; request again to see allocations since now\n"
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(HEAP_FILTERS)
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [
+            f"Traced memory: {current / 1024:.1f} KiB (peak {peak / 1024:.1f} KiB)",
+            "",
+            f"Top {limit} allocations by {group_by}:",
+        ]
+        lines += [str(stat) for stat in snapshot.statistics(group_by)[:limit]]
+        if self._previous_snapshot is not None:
+            lines += ["", f"Top {limit} changes since the previous snapshot:"]
+            lines += [
+                str(stat) for stat in snapshot.compare_to(self._previous_snapshot, group_by)[:limit]
+            ]
+        self._previous_snapshot = snapshot
+        return "\n".join(lines) + "\n"
+
+    def stop_heap(self) -> str:
+        """Stop tracemalloc and drop the kept snapshot"""
+        tracemalloc.stop()
+        self._previous_snapshot = None
+        return "tracemalloc stopped\n"
@@ -1,12 +1,16 @@
 """HTTP server for Prometheus metrics endpoint"""
 
+import asyncio
+import hmac
 import logging
+import time
 
-from aiohttp import web
-from prometheus_client import generate_latest
+from aiohttp import ClientPayloadError, web
 
 from ..collectors.manager import MetricsCollectorManager
 from ..config import ExporterConfig
+from ..metrics.prometheus_metrics import check_collector_names, select_families
+from ..metrics.self_metrics import render_exposition, render_families
 
 logger = logging.getLogger(__name__)
 
@@ -14,29 +18,89 @@ logger = logging.getLogger(__name__)
 class PrometheusServer:
     """HTTP server for serving Prometheus metrics"""
 
-    def __init__(self, config: ExporterConfig, collector_manager: MetricsCollectorManager):
+    def __init__(
+        self, config: ExporterConfig, collector_manager: MetricsCollectorManager | None = None
+    ):
+        for group, collectors in config.scrape_groups.items():
+            try:
+                check_collector_names(collectors)
+            except ValueError as e:
+                raise ValueError(f"Scrape group {group}: {e}") from None
         self.config = config
         self.collector_manager = collector_manager
         self.app = None
         self.runner = None
         self.site = None
+        self.ingestor = None
+        if config.ingest_key:
+            from ..ingest.push import PushIngestor
 
-    async def metrics_handler(self, _request):
-        """HTTP handler for Prometheus metrics endpoint"""
+            self.ingestor = PushIngestor()
+        # Set by the exporter when the history archive is enabled
+        self.history = None
+        self.profiler = None
+        if config.debug_token:
+            from .debug import Profiler
+
+            self.profiler = Profiler()
+
+    async def metrics_handler(self, request):
+        """HTTP handler for Prometheus metrics endpoint; collect[] limits it to some collectors"""
+        return self._metrics_response(request.query.getall("collect[]", None))
+
+    async def metrics_group_handler(self, request):
+        """Only the families of a named scrape group (EXPORTER_SCRAPE_GROUPS)"""
+        collectors = self.config.scrape_groups.get(request.match_info["group"])
+        if collectors is None:
+            return web.Response(text="Unknown scrape group\n", status=404)
+        return self._metrics_response(collectors)
+
+    def _metrics_response(self, collectors: list[str] | None):
         try:
-            data = generate_latest()
-            return web.Response(
-                body=data,
-                headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
-            )
+            data = self.render(collectors)
+        except ValueError as e:
+            return web.Response(text=f"{e}\n", status=400)
         except Exception as e:
             logger.error(f"Error generating metrics: {e}")
             return web.Response(text="Error generating metrics", status=500)
+        if data is None:
+            return web.Response(text="No snapshot published yet\n", status=503)
+        return web.Response(
+            body=data,
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+    def render(self, collectors: list[str] | None = None) -> bytes | memoryview | None:
+        """The exposition, or only the families of the given collectors"""
+        if not collectors:
+            return render_exposition()
+        return render_families(select_families(collectors))
+
+    @property
+    def is_ready(self) -> bool:
+        """Ready once the router stack is loaded and a collection has succeeded"""
+        return bool(
+            self.collector_manager
+            and self.collector_manager.is_connected
+            and self.collector_manager.has_collected
+        )
+
+    async def livez_handler(self, _request):
+        """Liveness endpoint: the process and event loop are responsive"""
+        return web.Response(text="ok\n")
+
+    async def readyz_handler(self, _request):
+        """Readiness endpoint: metrics are available from the router"""
+        if self.is_ready:
+            return web.Response(text="ready\n")
+        state = "starting" if not self.collector_manager else "waiting for router"
+        return web.Response(text=f"not ready: {state}\n", status=503)
 
     async def health_handler(self, _request):
         """Health check endpoint"""
-        status = "healthy" if self.collector_manager.is_connected else "unhealthy"
-        connection_status = "connected" if self.collector_manager.is_connected else "disconnected"
+        is_connected = bool(self.collector_manager and self.collector_manager.is_connected)
+        status = "healthy" if is_connected else "unhealthy"
+        connection_status = "connected" if is_connected else "disconnected"
 
         info = {
             "status": status,
@@ -48,17 +112,31 @@ class PrometheusServer:
         response_text = f"Status: {status}\n" + "\n".join([f"{k}: {v}" for k, v in info.items()])
         return web.Response(text=response_text)
 
+    def _collector_info(self) -> dict[str, list[str]]:
+        """Collector info, empty while the router stack is still loading"""
+        if not self.collector_manager:
+            return {}
+        return self.collector_manager.get_collector_info()
+
     async def info_handler(self, _request):
         """Info endpoint with metrics overview"""
-        collector_info = self.collector_manager.get_collector_info()
+        collector_info = self._collector_info()
 
         info_text = f"""ASUS Router Prometheus Exporter v2.0 (Modular)
 
 Available Endpoints:
-- /metrics       - Prometheus metrics
+- /metrics       - Prometheus metrics (?collect[]=<collector> for only some collectors)
+- /metrics/<group> - Metrics of a scrape group: {", ".join(self.config.scrape_groups) or "none"}
 - /health        - Health check
+- /livez         - Liveness probe
+- /readyz        - Readiness probe (503 until the first collection succeeds)
 - /info          - This information page
 - /collectors    - Collector information
+- /api/events    - Recent client connect/disconnect/roam events (JSON)
+- /api/clients   - Every client seen with first/last seen (only with EXPORTER_INVENTORY_ENABLED)
+- /api/ingest    - Samples pushed by a router-side agent (only with EXPORTER_INGEST_KEY)
+- /admin/...     - Runtime filter toggles (only with EXPORTER_ADMIN_TOKEN)
+- /debug/...     - Profiling, heap, cycle traces and cardinality (only with EXPORTER_DEBUG_TOKEN)
 
 Configuration:
 - Router: {self.config.hostname}
@@ -91,7 +169,7 @@ Enhanced Features:
 
     async def collectors_handler(self, _request):
         """Collectors information endpoint"""
-        collector_info = self.collector_manager.get_collector_info()
+        collector_info = self._collector_info()
 
         collectors_text = "ASUS Router Exporter - Collector Information\n\n"
 
@@ -108,15 +186,253 @@ Enhanced Features:
 
         return web.Response(text=collectors_text, content_type="text/plain")
 
+    async def events_handler(self, request):
+        """Recent client connect/disconnect/roam events as JSON, newest first"""
+        try:
+            limit = min(int(request.query.get("limit", "100")), 1000)
+            since = float(request.query["since"]) if "since" in request.query else None
+        except ValueError:
+            return web.json_response({"error": "limit and since must be numbers"}, status=400)
+
+        events = []
+        if self.collector_manager:
+            events = self.collector_manager.get_client_events(
+                limit=limit,
+                mac=request.query.get("mac"),
+                event_type=request.query.get("type"),
+                since=since,
+            )
+        return web.json_response({"events": events})
+
+    async def history_handler(self, request):
+        """Rows of the history archive between start and end (default: the last hour)"""
+        try:
+            end = float(request.query.get("end", time.time()))
+            start = float(request.query.get("start", end - 3600))
+            limit = min(int(request.query.get("limit", "10000")), 100000)
+        except ValueError:
+            return web.json_response({"error": "start, end and limit must be numbers"}, status=400)
+        try:
+            result = await asyncio.to_thread(
+                self.history.query,
+                request.query.get("table", "metrics"),
+                start,
+                end,
+                name=request.query.get("name"),
+                mac=request.query.get("mac"),
+                limit=limit,
+            )
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
+        return web.json_response(result)
+
+    async def clients_handler(self, request):
+        """Clients from the persistent inventory, most recently seen first"""
+        query = request.query
+        try:
+            seen_since = float(query["seen_since"]) if "seen_since" in query else None
+            limit = int(query.get("limit", "1000"))
+        except ValueError:
+            return web.json_response({"error": "seen_since and limit must be numbers"}, status=400)
+        online = None
+        if "online" in query:
+            if query["online"].lower() not in ("true", "false", "1", "0"):
+                return web.json_response({"error": "online must be true or false"}, status=400)
+            online = query["online"].lower() in ("true", "1")
+
+        inventory = getattr(self.collector_manager, "inventory", None)
+        if inventory is None:
+            return web.json_response({"error": "Client inventory not ready"}, status=503)
+        clients = await asyncio.to_thread(
+            inventory.query,
+            seen_since=seen_since,
+            band=query.get("band"),
+            node=query.get("node"),
+            mac=query.get("mac"),
+            name=query.get("name"),
+            online=online,
+            limit=limit,
+        )
+        return web.json_response({"clients": clients})
+
+    def _is_authorized(self, request, token: str | None = None) -> bool:
+        """Check the bearer token (the admin token unless another one is given)"""
+        expected = f"Bearer {token if token is not None else self.config.admin_token}"
+        return hmac.compare_digest(request.headers.get("Authorization", ""), expected)
+
+    async def ingest_handler(self, request):
+        """Accept line-protocol samples pushed by a router-side agent"""
+        from ..ingest.push import MAX_PAYLOAD_BYTES
+
+        if not self._is_authorized(request, self.config.ingest_key):
+            return web.json_response({"error": "unauthorized"}, status=401)
+        if request.content_length and request.content_length > MAX_PAYLOAD_BYTES:
+            return web.json_response({"error": "payload too large"}, status=413)
+
+        # content.read(n) returns what is buffered so far; loop until EOF or over the cap
+        body = bytearray()
+        try:
+            while len(body) <= MAX_PAYLOAD_BYTES:
+                chunk = await request.content.read(MAX_PAYLOAD_BYTES + 1 - len(body))
+                if not chunk:
+                    break
+                body += chunk
+        except (ConnectionResetError, ClientPayloadError):
+            # The agent hung up before sending Content-Length bytes
+            return web.json_response({"error": "incomplete body"}, status=400)
+        if len(body) > MAX_PAYLOAD_BYTES:
+            return web.json_response({"error": "payload too large"}, status=413)
+        if request.content_length is not None and len(body) < request.content_length:
+            return web.json_response({"error": "incomplete body"}, status=400)
+        try:
+            accepted = self.ingestor.ingest(body.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError) as e:
+            return web.json_response({"error": str(e)}, status=400)
+        return web.json_response({"accepted": accepted})
+
+    async def admin_state_handler(self, request):
+        """Show the current collector, data type and metric family filters"""
+        if not self._is_authorized(request):
+            return web.json_response({"error": "unauthorized"}, status=401)
+        if not self.collector_manager:
+            return web.json_response({"error": "collectors not loaded yet"}, status=503)
+        return web.json_response(self.collector_manager.get_filter_state())
+
+    async def admin_toggle_handler(self, request):
+        """Enable or disable a collector, data type or metric family at runtime"""
+        if not self._is_authorized(request):
+            return web.json_response({"error": "unauthorized"}, status=401)
+        if not self.collector_manager:
+            return web.json_response({"error": "collectors not loaded yet"}, status=503)
+
+        enabled_param = request.query.get("enabled", "").lower()
+        if enabled_param not in ("true", "false"):
+            return web.json_response({"error": "enabled must be true or false"}, status=400)
+        enabled = enabled_param == "true"
+
+        kind = request.match_info["kind"]
+        name = request.match_info["name"].lower()
+        setters = {
+            "collectors": self.collector_manager.set_collector_enabled,
+            "data_types": self.collector_manager.set_data_type_enabled,
+            "metrics": self.collector_manager.set_metric_enabled,
+        }
+        try:
+            setters[kind](name, enabled)
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
+
+        return web.json_response(self.collector_manager.get_filter_state())
+
+    async def profile_handler(self, request):
+        """cProfile (pstats) or sampled collapsed stacks of the event loop for N seconds"""
+        from .debug import MAX_PROFILE_SECONDS, ProfileBusyError
+
+        if not self._is_authorized(request, self.config.debug_token):
+            return web.json_response({"error": "unauthorized"}, status=401)
+        try:
+            seconds = float(request.query.get("seconds", "10"))
+            limit = int(request.query.get("limit", "50"))
+        except ValueError:
+            return web.json_response({"error": "seconds and limit must be numbers"}, status=400)
+        if not 0 < seconds <= MAX_PROFILE_SECONDS:
+            return web.json_response(
+                {"error": f"seconds must be in (0, {MAX_PROFILE_SECONDS}]"}, status=400
+            )
+        output = request.query.get("format", "pstats")
+        if output not in ("pstats", "collapsed"):
+            return web.json_response({"error": "format must be pstats or collapsed"}, status=400)
+
+        try:
+            text = await self.profiler.profile(seconds, output, limit)
+        except ProfileBusyError as e:
+            return web.json_response({"error": str(e)}, status=409)
+        return web.Response(text=text, content_type="text/plain")
+
+    async def heap_handler(self, request):
+        """tracemalloc top allocations and the diff against the previous call"""
+        if not self._is_authorized(request, self.config.debug_token):
+            return web.json_response({"error": "unauthorized"}, status=401)
+        if request.query.get("stop", "").lower() == "true":
+            return web.Response(text=self.profiler.stop_heap(), content_type="text/plain")
+        group_by = request.query.get("group_by", "lineno")
+        if group_by not in ("lineno", "filename", "traceback"):
+            return web.json_response(
+                {"error": "group_by must be lineno, filename or traceback"}, status=400
+            )
+        try:
+            limit = int(request.query.get("limit", "25"))
+        except ValueError:
+            return web.json_response({"error": "limit must be a number"}, status=400)
+        return web.Response(text=self.profiler.heap(limit, group_by), content_type="text/plain")
+
+    async def trace_handler(self, request):
+        """Chrome trace-event JSON of the last N collection cycles"""
+        from ..collectors.tracing import MAX_TRACE_CYCLES, TRACER
+
+        if not self._is_authorized(request, self.config.debug_token):
+            return web.json_response({"error": "unauthorized"}, status=401)
+        try:
+            cycles = min(int(request.query.get("cycles", "5")), MAX_TRACE_CYCLES)
+        except ValueError:
+            return web.json_response({"error": "cycles must be a number"}, status=400)
+        return web.json_response(
+            TRACER.to_chrome(cycles),
+            headers={"Content-Disposition": 'attachment; filename="asus-exporter-trace.json"'},
+        )
+
+    async def cardinality_handler(self, request):
+        """Metric families ranked by series count or exposition bytes"""
+        from prometheus_client import REGISTRY, generate_latest
+
+        from ..metrics.self_metrics import format_cardinality
+
+        if not self._is_authorized(request, self.config.debug_token):
+            return web.json_response({"error": "unauthorized"}, status=401)
+        sort_by = request.query.get("sort", "series")
+        if sort_by not in ("series", "bytes"):
+            return web.json_response({"error": "sort must be series or bytes"}, status=400)
+        try:
+            limit = int(request.query.get("limit", "50"))
+        except ValueError:
+            return web.json_response({"error": "limit must be a number"}, status=400)
+        # Not a scrape: render directly so the self-metrics and SERIES_COUNTS stay untouched
+        text = format_cardinality(generate_latest(REGISTRY), sort_by, limit)
+        return web.Response(text=text, content_type="text/plain")
+
     async def start_server(self):
         """Start the HTTP server"""
         self.app = web.Application()
         self.app.router.add_get("/metrics", self.metrics_handler)
+        self.app.router.add_get("/metrics/{group}", self.metrics_group_handler)
         self.app.router.add_get("/health", self.health_handler)
+        self.app.router.add_get("/livez", self.livez_handler)
+        self.app.router.add_get("/readyz", self.readyz_handler)
         self.app.router.add_get("/info", self.info_handler)
         self.app.router.add_get("/collectors", self.collectors_handler)
+        self.app.router.add_get("/api/events", self.events_handler)
         self.app.router.add_get("/", self.info_handler)
 
+        if self.ingestor:
+            self.app.router.add_post("/api/ingest", self.ingest_handler)
+
+        if self.history:
+            self.app.router.add_get("/api/history", self.history_handler)
+        if self.config.inventory_enabled:
+            self.app.router.add_get("/api/clients", self.clients_handler)
+
+        if self.config.admin_token:
+            self.app.router.add_get("/admin/filters", self.admin_state_handler)
+            self.app.router.add_post(
+                r"/admin/{kind:collectors|data_types|metrics}/{name}", self.admin_toggle_handler
+            )
+
+        if self.profiler:
+            self.app.router.add_get("/debug/profile", self.profile_handler)
+            self.app.router.add_get("/debug/heap", self.heap_handler)
+            self.app.router.add_get("/debug/trace", self.trace_handler)
+            self.app.router.add_get("/debug/cardinality", self.cardinality_handler)
+
         self.runner = web.AppRunner(self.app)
         await self.runner.setup()
         self.site = web.TCPSite(self.runner, "0.0.0.0", self.config.port)
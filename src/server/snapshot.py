@@ -0,0 +1,124 @@
+"""Lean scrape server answering from the collector process's shared memory snapshot"""
+
+import asyncio
+import dataclasses
+import json
+import logging
+import time
+from typing import Any
+
+from ..collectors.sessions import filter_events
+from ..config import ExporterConfig
+from ..inventory import ClientInventory
+from ..metrics.prometheus_metrics import check_collector_names
+from ..metrics.self_metrics import filter_exposition
+from ..output.shm import Snapshot, SnapshotBuffer
+from .server import PrometheusServer
+
+logger = logging.getLogger(__name__)
+
+# A snapshot older than this many collection intervals makes the server not ready and
+# reattach, in case the collector was restarted with a fresh segment
+STALE_INTERVALS = 3
+
+
+class SnapshotView:
+    """
+    Stands in for the collector manager in the server process: connection state, collector
+    info and client events come from the JSON snapshot of the latest published cycle, the
+    client inventory from a read-only connection to the collector's database.
+    """
+
+    def __init__(self, config: ExporterConfig):
+        self.name = config.shm_name
+        self.stale_after = max(STALE_INTERVALS * config.collection_interval, 60)
+        self.reattach_interval = config.collection_interval
+        self.buffer: SnapshotBuffer | None = None
+        self.current: Snapshot | None = None
+        self._reattach_at = 0.0
+        self._state: dict[str, Any] = {}
+        self._state_key: tuple[int, float] | None = None
+        self.inventory = (
+            ClientInventory(config.inventory_path, readonly=True)
+            if config.inventory_enabled
+            else None
+        )
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def refresh(self) -> Snapshot | None:
+        """Latest published snapshot, attaching (or reattaching) to the segment as needed"""
+        now = time.time()
+        if self.buffer is None and now >= self._reattach_at:
+            try:
+                self.buffer = SnapshotBuffer.attach(self.name)
+                self.logger.debug(f"Attached to shared memory '{self.name}'")
+            except FileNotFoundError:
+                return self.current
+        if self.buffer is not None:
+            self.current = self.buffer.read()
+            if self.current and now - self.current.published_at > self.stale_after:
+                # Keep serving the stale snapshot; the collector may come back on a new segment
+                self.buffer.close()
+                self.buffer = None
+                self._reattach_at = now + self.reattach_interval
+        return self.current
+
+    @property
+    def state(self) -> dict[str, Any]:
+        """Decoded JSON snapshot, parsed once per published cycle"""
+        snapshot = self.refresh()
+        if snapshot is None:
+            return {}
+        key = (snapshot.sequence, snapshot.published_at)
+        if key != self._state_key:
+            self._state = json.loads(bytes(snapshot.snapshot))
+            self._state_key = key
+        return self._state
+
+    @property
+    def is_connected(self) -> bool:
+        return bool(self.state.get("connected"))
+
+    @property
+    def has_collected(self) -> bool:
+        fresh = self.current and time.time() - self.current.published_at <= self.stale_after
+        return bool(fresh and self.state.get("collected"))
+
+    def get_collector_info(self) -> dict[str, list[str]]:
+        return self.state.get("collectors", {})
+
+    def get_client_events(self, **filters: Any) -> list[dict[str, Any]]:
+        return filter_events(self.state.get("events", []), **filters)
+
+
+class SnapshotServer(PrometheusServer):
+    """
+    The read-only endpoints of PrometheusServer, served from shared memory. /metrics
+    sends the collector's rendered exposition without copying it. Admin, ingest and
+    debug endpoints need the live collector and are not served here.
+    """
+
+    def __init__(self, config: ExporterConfig):
+        config = dataclasses.replace(config, admin_token="", ingest_key="", debug_token="")
+        super().__init__(config, SnapshotView(config))
+
+    def render(self, collectors: list[str] | None = None) -> bytes | memoryview | None:
+        """
+        The last published exposition straight from shared memory, or the family blocks of
+        the given collectors cut out of it
+        """
+        snapshot = self.collector_manager.refresh()
+        if snapshot is None:
+            return None
+        if not collectors:
+            return snapshot.exposition
+        check_collector_names(collectors)
+        return filter_exposition(snapshot.exposition, set(collectors))
+
+    async def run_forever(self) -> None:
+        """Serve until cancelled"""
+        await self.start_server()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop_server()
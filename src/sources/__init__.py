@@ -0,0 +1,18 @@
+"""Data sources the collectors read AsusData from: router HTTP API, SSH or a fixture"""
+
+from .base import DataSource
+from .http import HttpSource, create_router
+from .replay import FixtureSource, RecordingSource
+from .routing import DataSourceRouter, build_data_source
+from .ssh import SshSource
+
+__all__ = [
+    "DataSource",
+    "DataSourceRouter",
+    "FixtureSource",
+    "HttpSource",
+    "RecordingSource",
+    "SshSource",
+    "build_data_source",
+    "create_router",
+]
@@ -0,0 +1,26 @@
+"""DataSource protocol shared by every transport the collectors can read from"""
+
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
+
+if TYPE_CHECKING:
+    from asusrouter import AsusData
+
+
+@runtime_checkable
+class DataSource(Protocol):
+    """
+    Anything that can answer async_get_data(AsusData) the way asusrouter does.
+    An asusrouter.AsusRouter instance satisfies the fetch part structurally.
+    """
+
+    name: str
+
+    def supports(self, data_type: "AsusData") -> bool:
+        """Whether this source can produce the data type at all"""
+        ...
+
+    async def async_connect(self) -> bool: ...
+
+    async def async_disconnect(self) -> bool: ...
+
+    async def async_get_data(self, data_type: "AsusData", force: bool = False) -> Any: ...
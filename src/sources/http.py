@@ -0,0 +1,66 @@
+"""The asusrouter HTTP transport as a DataSource"""
+
+from typing import TYPE_CHECKING, Any
+
+from asusrouter import AsusData, AsusRouter
+from asusrouter.connection_config import ARConnectionConfig, ARConnectionConfigKey
+
+from ..metrics.prometheus_metrics import ROUTER_REQUESTS_TOTAL, ROUTER_RESPONSE_BYTES_TOTAL
+
+if TYPE_CHECKING:
+    from ..config import ExporterConfig
+
+
+def create_router(config: "ExporterConfig", hostname: str | None = None) -> AsusRouter:
+    """An asusrouter connection with the configured credentials and resilience settings"""
+    # Setup connection configuration with resilience (v1.19.0+)
+    connection_config = ARConnectionConfig()
+    connection_config.set(ARConnectionConfigKey.ALLOW_FALLBACK, config.allow_fallback)
+    connection_config.set(ARConnectionConfigKey.STRICT_SSL, config.strict_ssl)
+    connection_config.set(
+        ARConnectionConfigKey.ALLOW_UPGRADE_HTTP_TO_HTTPS,
+        config.allow_upgrade_http_to_https,
+    )
+    hostname = hostname or config.hostname
+    return AsusRouter(
+        hostname=hostname,
+        username=config.username,
+        password=config.password,
+        use_ssl=config.use_ssl,
+        dumpback=_request_counter(hostname),
+        connection_config=connection_config,
+    )
+
+
+def _request_counter(host: str):
+    """asusrouter dumpback hook counting every web interface request and its response size"""
+
+    async def count(endpoint, _payload, status, _headers, content) -> None:
+        endpoint = str(getattr(endpoint, "value", endpoint))
+        ROUTER_REQUESTS_TOTAL.labels(host=host, endpoint=endpoint, status=str(status)).inc()
+        # asusrouter hands over the decoded text; count its encoded size in bytes
+        size = len(content) if isinstance(content, bytes) else len(str(content).encode())
+        ROUTER_RESPONSE_BYTES_TOTAL.labels(host=host, endpoint=endpoint).inc(size)
+
+    return count
+
+
+class HttpSource:
+    """Polls the router web interface through asusrouter; supports every data type"""
+
+    name = "http"
+
+    def __init__(self, router: AsusRouter):
+        self.router = router
+
+    def supports(self, _data_type: AsusData) -> bool:
+        return True
+
+    async def async_connect(self) -> bool:
+        return await self.router.async_connect()
+
+    async def async_disconnect(self) -> bool:
+        return await self.router.async_disconnect()
+
+    async def async_get_data(self, data_type: AsusData, force: bool = False) -> Any:
+        return await self.router.async_get_data(data_type, force=force)
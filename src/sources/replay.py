@@ -0,0 +1,105 @@
+"""Fixture replay and recording, for running the collectors without a router"""
+
+import json
+import logging
+from enum import Enum
+from pathlib import Path
+from typing import Any
+
+from asusrouter import AsusData
+
+from .base import DataSource
+
+logger = logging.getLogger(__name__)
+
+
+def to_fixture(data: Any) -> Any:
+    """Make an asusrouter payload JSON-safe: enums become values, keys become strings"""
+    if isinstance(data, dict):
+        return {str(to_fixture(key)): to_fixture(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple, set)):
+        return [to_fixture(item) for item in data]
+    if isinstance(data, Enum):
+        return to_fixture(data.value)
+    if data is None or isinstance(data, (bool, int, float, str)):
+        return data
+    return str(data)
+
+
+def from_fixture(data: Any) -> Any:
+    """Undo the key stringification for integer keys (CPU cores, load periods)"""
+    if isinstance(data, dict):
+        return {
+            (int(key) if key.isdigit() else key): from_fixture(value) for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [from_fixture(item) for item in data]
+    return data
+
+
+class FixtureSource:
+    """Answers from a JSON file of {data type value: payload}, e.g. one written by recording"""
+
+    name = "fixture"
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.payloads: dict[str, Any] = {}
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def supports(self, data_type: AsusData) -> bool:
+        return data_type.value in self.payloads
+
+    async def async_connect(self) -> bool:
+        """(Re)load the fixture file"""
+        self.payloads = json.loads(self.path.read_text())
+        self.logger.info(f"Loaded {len(self.payloads)} data types from fixture {self.path}")
+        return True
+
+    async def async_disconnect(self) -> bool:
+        return True
+
+    async def async_get_data(self, data_type: AsusData, force: bool = False) -> Any:  # noqa: ARG002
+        """A fixture never changes, so force has nothing to bypass"""
+        if data_type.value not in self.payloads:
+            raise ValueError(f"Fixture {self.path} has no {data_type.value} data")
+        return from_fixture(self.payloads[data_type.value])
+
+
+class RecordingSource:
+    """Wraps another source and saves every answer, producing a fixture for replay"""
+
+    def __init__(self, inner: DataSource, path: str):
+        self.inner = inner
+        self.name = inner.name
+        self.path = Path(path)
+        self.payloads: dict[str, Any] = {}
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def supports(self, data_type: AsusData) -> bool:
+        return self.inner.supports(data_type)
+
+    async def async_connect(self) -> bool:
+        return await self.inner.async_connect()
+
+    async def async_disconnect(self) -> bool:
+        self.save()
+        return await self.inner.async_disconnect()
+
+    async def async_get_data(self, data_type: AsusData, force: bool = False) -> Any:
+        data = await self.inner.async_get_data(data_type, force=force)
+        self.payloads[data_type.value] = to_fixture(data)
+        return data
+
+    def save(self) -> None:
+        """Write the recorded payloads atomically"""
+        if not self.payloads:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self.payloads, indent=2, sort_keys=True))
+            tmp_path.replace(self.path)
+            self.logger.info(f"Recorded {len(self.payloads)} data types to {self.path}")
+        except OSError as e:
+            self.logger.warning(f"Could not write fixture {self.path}: {e}")
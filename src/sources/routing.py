@@ -0,0 +1,113 @@
+"""Per-data-type routing between data sources"""
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from asusrouter import AsusData
+
+from .base import DataSource
+
+if TYPE_CHECKING:
+    from asusrouter import AsusRouter
+
+    from ..config import ExporterConfig
+
+logger = logging.getLogger(__name__)
+
+SOURCE_NAMES = ("http", "ssh", "fixture")
+
+
+def parse_routes(entries: list[str]) -> dict[str, str]:
+    """Turn ["cpu=ssh", "ram=ssh"] into {"cpu": "ssh", "ram": "ssh"}"""
+    routes = {}
+    for entry in entries:
+        data_type, sep, source = entry.partition("=")
+        if not sep or source.strip() not in SOURCE_NAMES:
+            raise ValueError(f"Invalid data source route '{entry}', expected <data_type>=<source>")
+        if data_type.strip() not in {dt.value for dt in AsusData}:
+            raise ValueError(f"Unknown data type in data source route '{entry}'")
+        routes[data_type.strip()] = source.strip()
+    return routes
+
+
+class DataSourceRouter:
+    """
+    The DataSource the collectors see: sends each AsusData type to its routed source
+    and falls back to the default one when that source cannot answer it.
+    """
+
+    def __init__(self, sources: dict[str, DataSource], default: str, routes: dict[str, str]):
+        self.sources = sources
+        self.default = default
+        self.routes = routes
+        self.name = default
+        # Sources whose connection failed; their data types fall back to the default
+        self.unavailable: set[str] = set()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def source_for(self, data_type: AsusData) -> DataSource:
+        name = self.routes.get(data_type.value, self.default)
+        source = self.sources[name]
+        if name != self.default and (name in self.unavailable or not source.supports(data_type)):
+            return self.sources[self.default]
+        return source
+
+    def supports(self, data_type: AsusData) -> bool:
+        return self.source_for(data_type).supports(data_type)
+
+    async def async_connect(self) -> bool:
+        """Connect every source; only a failure of the default source is fatal"""
+        await self.sources[self.default].async_connect()
+        self.unavailable.clear()
+        for name, source in self.sources.items():
+            if name == self.default:
+                continue
+            try:
+                await source.async_connect()
+            except Exception as e:
+                self.unavailable.add(name)
+                self.logger.warning(f"Data source {name} unavailable, using {self.default}: {e}")
+        return True
+
+    async def async_disconnect(self) -> bool:
+        for source in self.sources.values():
+            try:
+                await source.async_disconnect()
+            except Exception as e:
+                self.logger.debug(f"Error disconnecting data source {source.name}: {e}")
+        return True
+
+    async def async_get_data(self, data_type: AsusData, force: bool = False) -> Any:
+        return await self.source_for(data_type).async_get_data(data_type, force=force)
+
+
+def build_data_source(config: "ExporterConfig", router: "AsusRouter") -> DataSourceRouter:
+    """Assemble the configured sources around the asusrouter connection"""
+    from .http import HttpSource
+    from .replay import FixtureSource, RecordingSource
+    from .ssh import SshSource
+
+    routes = parse_routes(config.data_source_routes)
+    if config.data_source not in SOURCE_NAMES:
+        raise ValueError(f"Unknown data source: {config.data_source}")
+
+    sources: dict[str, DataSource] = {}
+    for name in {config.data_source, *routes.values()}:
+        if name == "http":
+            sources[name] = HttpSource(router)
+        elif name == "ssh":
+            sources[name] = SshSource(
+                config.ssh_host or config.hostname,
+                config.ssh_username or config.username,
+                port=config.ssh_port,
+                key_path=config.ssh_key_path,
+                cache_time=config.cache_time,
+            )
+        else:
+            sources[name] = FixtureSource(config.fixture_path)
+
+    if config.data_source_record and config.data_source != "fixture":
+        default = sources[config.data_source]
+        sources[config.data_source] = RecordingSource(default, config.fixture_path)
+
+    return DataSourceRouter(sources, config.data_source, routes)
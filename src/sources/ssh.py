@@ -0,0 +1,294 @@
+"""SSH transport reading /proc and wl output directly on the router"""
+
+import asyncio
+import logging
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from asusrouter import AsusData
+
+logger = logging.getLogger(__name__)
+
+# One remote invocation prints every section, so a cycle costs a single exec on the
+# already-open (ControlMaster) connection no matter how many data types are routed here
+SNAPSHOT_SCRIPT = """
+echo '@@stat'; grep '^cpu' /proc/stat
+echo '@@meminfo'; cat /proc/meminfo
+echo '@@netdev'; cat /proc/net/dev
+echo '@@loadavg'; cat /proc/loadavg
+echo '@@conntrack'; cat /proc/sys/net/netfilter/nf_conntrack_count 2>/dev/null
+echo '@@thermal'; cat /sys/class/thermal/thermal_zone0/temp 2>/dev/null
+echo '@@wltemp'
+for i in 0 1 2 3; do
+    ifname=$(nvram get wl${i}_ifname 2>/dev/null)
+    [ -n "$ifname" ] && echo "$i $(wl -i "$ifname" phy_tempsense 2>/dev/null)"
+done
+echo '@@ifnames'
+wan=$(nvram get wan0_gw_ifname 2>/dev/null)
+[ -n "$wan" ] || wan=$(nvram get wan0_ifname 2>/dev/null)
+echo "wan $wan"
+echo "bridge $(nvram get lan_ifname 2>/dev/null)"
+echo "lan $(nvram get lan_ifnames 2>/dev/null)"
+for i in 0 1 2 3; do echo "wl$i $(nvram get wl${i}_ifname 2>/dev/null)"; done
+echo '@@end'
+"""
+
+SUPPORTED_DATA_TYPES = {
+    AsusData.CPU,
+    AsusData.NETWORK,
+    AsusData.RAM,
+    AsusData.SYSINFO,
+    AsusData.TEMPERATURE,
+}
+
+# wl unit -> asusrouter temperature sensor and NETWORK interface name
+WL_BANDS = {"0": "2ghz", "1": "5ghz", "2": "5ghz2", "3": "6ghz"}
+
+
+def split_sections(output: str) -> dict[str, list[str]]:
+    """Split the snapshot script output into its @@-marked sections"""
+    sections: dict[str, list[str]] = {}
+    current = None
+    for line in output.splitlines():
+        if line.startswith("@@"):
+            current = sections.setdefault(line[2:].strip(), [])
+        elif current is not None and line.strip():
+            current.append(line)
+    return sections
+
+
+def parse_cpu(lines: list[str]) -> dict[str | int, dict[str, float]]:
+    """Cumulative total/used jiffies per core from /proc/stat, "total" for the sum"""
+    cpu: dict[str | int, dict[str, float]] = {}
+    for line in lines:
+        name, *values = line.split()
+        numbers = [float(v) for v in values[:8]]
+        total = sum(numbers)
+        idle = numbers[3] + (numbers[4] if len(numbers) > 4 else 0)
+        key: str | int = "total" if name == "cpu" else int(name[3:]) + 1
+        cpu[key] = {"total": total, "used": total - idle}
+    return cpu
+
+
+def parse_meminfo(lines: list[str]) -> dict[str, float]:
+    """Values in KiB, like asusrouter's RAM data"""
+    values = {}
+    for line in lines:
+        key, _, rest = line.partition(":")
+        parts = rest.split()
+        if parts:
+            values[key] = float(parts[0])
+    return values
+
+
+def parse_netdev(lines: list[str]) -> dict[str, dict[str, float]]:
+    """Cumulative rx/tx bytes per interface from /proc/net/dev"""
+    interfaces = {}
+    for line in lines:
+        if ":" not in line:
+            continue
+        name, _, rest = line.partition(":")
+        fields = rest.split()
+        if len(fields) >= 9:
+            interfaces[name.strip()] = {"rx": float(fields[0]), "tx": float(fields[8])}
+    return interfaces
+
+
+def map_interfaces(
+    netdev: dict[str, dict[str, float]], lines: list[str]
+) -> dict[str, dict[str, float]]:
+    """
+    Kernel interface counters under asusrouter's NETWORK keys, as the web UI groups them:
+    wan, bridge, one key per WiFi band and wired as the sum of the wired LAN members.
+    Interfaces the web UI does not report (lo, vlans, tunnels) are left out.
+    """
+    ifnames = {}
+    for line in lines:
+        key, _, names = line.partition(" ")
+        ifnames[key] = names.split()
+
+    network = {}
+    wireless = set()
+    for unit, band in WL_BANDS.items():
+        for name in ifnames.get(f"wl{unit}", []):
+            wireless.add(name)
+            if name in netdev:
+                network[band] = dict(netdev[name])
+    for key in ("wan", "bridge"):
+        names = ifnames.get(key)
+        if names and names[0] in netdev:
+            network[key] = dict(netdev[names[0]])
+    wired = [
+        netdev[name] for name in ifnames.get("lan", []) if name in netdev and name not in wireless
+    ]
+    if wired:
+        network["wired"] = {
+            "rx": sum(stats["rx"] for stats in wired),
+            "tx": sum(stats["tx"] for stats in wired),
+        }
+    return network
+
+
+class SshSource:
+    """
+    Reads cheap, hot metrics over SSH instead of the router's httpd. Uses the system
+    OpenSSH client with connection multiplexing (ControlMaster), so one TCP/SSH session
+    is kept open and every snapshot is a single remote exec.
+    """
+
+    name = "ssh"
+
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        port: int = 22,
+        key_path: str = "",
+        cache_time: float = 5.0,
+        timeout: float = 10.0,
+    ):
+        self.host = host
+        self.username = username
+        self.port = port
+        self.key_path = key_path
+        self.cache_time = cache_time
+        self.timeout = timeout
+        self._control_dir = tempfile.mkdtemp(prefix="asus-exporter-ssh-")
+        self._snapshot: dict[str, list[str]] = {}
+        self._snapshot_time = 0.0
+        self._previous_cpu: dict[str | int, dict[str, float]] = {}
+        self._lock = asyncio.Lock()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def supports(self, data_type: AsusData) -> bool:
+        return data_type in SUPPORTED_DATA_TYPES
+
+    def _ssh_command(self, *extra: str) -> list[str]:
+        command = [
+            "ssh",
+            "-p",
+            str(self.port),
+            "-o",
+            "BatchMode=yes",
+            "-o",
+            "ControlMaster=auto",
+            "-o",
+            f"ControlPath={Path(self._control_dir) / '%C'}",
+            "-o",
+            "ControlPersist=300",
+            "-o",
+            f"ConnectTimeout={int(self.timeout)}",
+        ]
+        if self.key_path:
+            command += ["-i", self.key_path]
+        return [*command, *extra, f"{self.username}@{self.host}"]
+
+    async def _run(self, script: str) -> str:
+        process = await asyncio.create_subprocess_exec(
+            *self._ssh_command(),
+            "sh",
+            "-s",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(script.encode()), timeout=self.timeout
+            )
+        except TimeoutError:
+            process.kill()
+            await process.wait()
+            raise ConnectionError(f"SSH to {self.host} timed out") from None
+        if process.returncode != 0:
+            raise ConnectionError(
+                f"SSH to {self.host} failed ({process.returncode}): {stderr.decode().strip()}"
+            )
+        return stdout.decode(errors="replace")
+
+    async def async_connect(self) -> bool:
+        """Open the multiplexed master connection with a trivial command"""
+        await self._run("true")
+        self.logger.info(f"SSH data source connected to {self.username}@{self.host}")
+        return True
+
+    async def async_disconnect(self) -> bool:
+        """Ask the master connection to exit and remove its control socket directory"""
+        process = await asyncio.create_subprocess_exec(
+            *self._ssh_command("-O", "exit"),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        await process.wait()
+        shutil.rmtree(self._control_dir, ignore_errors=True)
+        return True
+
+    async def _get_snapshot(self, force: bool) -> dict[str, list[str]]:
+        """Fetch all sections at most once per cache_time"""
+        async with self._lock:
+            if force or time.monotonic() - self._snapshot_time >= self.cache_time:
+                self._snapshot = split_sections(await self._run(SNAPSHOT_SCRIPT))
+                self._snapshot_time = time.monotonic()
+            return self._snapshot
+
+    async def async_get_data(self, data_type: AsusData, force: bool = False) -> Any:
+        if not self.supports(data_type):
+            raise ValueError(f"SSH source does not provide {data_type.value}")
+        sections = await self._get_snapshot(force)
+        return getattr(self, f"_build_{data_type.value}")(sections)
+
+    def _build_cpu(self, sections: dict[str, list[str]]) -> dict[str | int, Any]:
+        """asusrouter CPU layout, with usage from the delta to the previous snapshot"""
+        cpu = parse_cpu(sections.get("stat", []))
+        for key, current in cpu.items():
+            before = self._previous_cpu.get(key)
+            if before and current["total"] > before["total"]:
+                used = current["used"] - before["used"]
+                current["usage"] = round(used / (current["total"] - before["total"]) * 100, 2)
+        self._previous_cpu = {key: dict(value) for key, value in cpu.items()}
+        return cpu
+
+    def _build_ram(self, sections: dict[str, list[str]]) -> dict[str, float]:
+        meminfo = parse_meminfo(sections.get("meminfo", []))
+        total = meminfo.get("MemTotal", 0.0)
+        free = meminfo.get("MemFree", 0.0)
+        ram = {"total": total, "free": free, "used": total - free}
+        if total:
+            ram["usage"] = round((total - free) / total * 100, 2)
+        return ram
+
+    def _build_network(self, sections: dict[str, list[str]]) -> dict[str, dict[str, float]]:
+        return map_interfaces(parse_netdev(sections.get("netdev", [])), sections.get("ifnames", []))
+
+    def _build_sysinfo(self, sections: dict[str, list[str]]) -> dict[str, Any]:
+        """The subset of SYSINFO that /proc provides: load, buffers/cache, conntrack"""
+        sysinfo: dict[str, Any] = {}
+        loadavg = sections.get("loadavg")
+        if loadavg:
+            values = loadavg[0].split()
+            sysinfo["load_avg"] = {1: float(values[0]), 5: float(values[1]), 15: float(values[2])}
+        meminfo = parse_meminfo(sections.get("meminfo", []))
+        sysinfo["memory"] = {
+            "buffers": meminfo.get("Buffers", 0.0),
+            "cache": meminfo.get("Cached", 0.0),
+        }
+        conntrack = sections.get("conntrack")
+        if conntrack:
+            sysinfo["connections"] = {"total": int(conntrack[0])}
+        return sysinfo
+
+    def _build_temperature(self, sections: dict[str, list[str]]) -> dict[str, float]:
+        temperature = {}
+        thermal = sections.get("thermal")
+        if thermal:
+            temperature["cpu"] = float(thermal[0]) / 1000
+        for line in sections.get("wltemp", []):
+            unit, _, raw = line.partition(" ")
+            parts = raw.split()
+            if unit in WL_BANDS and parts and parts[0].isdigit():
+                # Same conversion as the Asuswrt web UI: raw / 2 + 20
+                temperature[WL_BANDS[unit]] = int(parts[0]) / 2 + 20
+        return temperature
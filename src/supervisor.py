@@ -0,0 +1,123 @@
+"""Runs the collector and the scrape server as separate processes and restarts either on exit"""
+
+import asyncio
+import dataclasses
+import logging
+import multiprocessing
+import signal
+import time
+
+from .config import ExporterConfig, setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Restart backoff doubles per consecutive crash, up to this many seconds
+MAX_RESTART_DELAY = 60.0
+
+# A child that ran this long is considered healthy again and resets the backoff
+HEALTHY_RUNTIME = 60.0
+
+
+def run_collector(config: ExporterConfig) -> None:
+    """Collector process: polls the router and publishes each cycle to shared memory"""
+    from .main import AsusExporter
+
+    setup_logging(config.log_level, config.log_format)
+    config = dataclasses.replace(config, output_mode="shm")
+    asyncio.run(AsusExporter(config).run_forever())
+
+
+def run_server(config: ExporterConfig) -> None:
+    """Server process: answers scrapes from the shared memory snapshot"""
+    from .server.snapshot import SnapshotServer
+
+    setup_logging(config.log_level, config.log_format)
+    asyncio.run(SnapshotServer(config).run_forever())
+
+
+class _Child:
+    __slots__ = ("failures", "name", "process", "restart_at", "started_at", "target")
+
+    def __init__(self, name: str, target):
+        self.name = name
+        self.target = target
+        self.process: multiprocessing.Process | None = None
+        self.started_at = 0.0
+        self.restart_at = 0.0
+        self.failures = 0
+
+
+class Supervisor:
+    """
+    Starts the collector and server processes and restarts whichever exits, with
+    exponential backoff. Either side can crash or be restarted while the other keeps
+    running: the server keeps serving the last snapshot, and a restarted collector
+    reuses the existing shared memory segment.
+    """
+
+    def __init__(self, config: ExporterConfig):
+        self.config = config
+        self.context = multiprocessing.get_context("spawn")
+        self.children = [_Child("collector", run_collector), _Child("server", run_server)]
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def _start(self, child: _Child) -> None:
+        child.process = self.context.Process(
+            target=child.target, args=(self.config,), name=f"asus-exporter-{child.name}"
+        )
+        child.process.start()
+        child.started_at = time.monotonic()
+        self.logger.info(f"Started {child.name} process (pid {child.process.pid})")
+
+    def _check(self, child: _Child, now: float) -> None:
+        process = child.process
+        if process is not None and process.is_alive():
+            if child.failures and now - child.started_at > HEALTHY_RUNTIME:
+                child.failures = 0
+            return
+        if process is not None:
+            child.failures += 1
+            delay = min(2 ** (child.failures - 1), MAX_RESTART_DELAY)
+            self.logger.error(
+                f"{child.name} process exited with code {process.exitcode}, "
+                f"restarting in {delay:.0f}s"
+            )
+            process.close()
+            child.process = None
+            child.restart_at = now + delay
+        if now >= child.restart_at:
+            self._start(child)
+
+    async def run_forever(self) -> None:
+        """Supervise until cancelled, then stop both children and remove the segment"""
+        self.logger.info("Running collector and server as separate processes")
+        # docker stop sends SIGTERM; without a handler the children would be orphaned
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        for child in self.children:
+            self._start(child)
+        try:
+            while True:
+                await asyncio.sleep(1)
+                now = time.monotonic()
+                for child in self.children:
+                    self._check(child, now)
+        except asyncio.CancelledError:
+            self.logger.info("Stopping collector and server processes")
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        for child in self.children:
+            if child.process is not None and child.process.is_alive():
+                child.process.terminate()
+        for child in self.children:
+            if child.process is not None:
+                child.process.join(timeout=10)
+        from .output.shm import SnapshotBuffer
+
+        try:
+            buffer = SnapshotBuffer.attach(self.config.shm_name)
+        except (FileNotFoundError, ValueError):
+            return
+        buffer.unlink()
+        buffer.close()
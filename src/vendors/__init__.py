@@ -0,0 +1,5 @@
+"""Client vendor names from a compact, memory-mapped IEEE OUI index"""
+
+from .index import DEFAULT_INDEX, VendorIndex
+
+__all__ = ["DEFAULT_INDEX", "VendorIndex"]
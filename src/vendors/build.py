@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Build the binary OUI index read by VendorIndex from the IEEE MA-L registry CSV.
+
+Usage: python -m src.vendors.build oui.csv [-o src/vendors/oui.bin]
+       python -m src.vendors.build --download [-o src/vendors/oui.bin]
+"""
+
+import argparse
+import array
+import csv
+import io
+import sys
+import urllib.request
+from collections.abc import Iterable
+from pathlib import Path
+
+from .index import DEFAULT_INDEX, HEADER, MAGIC
+
+REGISTRY_URL = "https://standards-oui.ieee.org/oui/oui.csv"
+
+
+def read_registry(lines: Iterable[str]) -> dict[int, str]:
+    """OUI -> organization name from the IEEE CSV (Registry, Assignment, Organization Name)"""
+    vendors = {}
+    for row in csv.DictReader(lines):
+        if row.get("Registry") != "MA-L":
+            continue
+        try:
+            oui = int(row["Assignment"], 16)
+        except (KeyError, ValueError):
+            continue
+        name = " ".join(row.get("Organization Name", "").split())
+        if name:
+            vendors[oui] = name
+    return vendors
+
+
+def build_index(vendors: dict[int, str]) -> bytes:
+    """Serialize OUI -> name into the sorted layout described in VendorIndex"""
+    names: dict[str, int] = {}
+    prefixes = array.array("I", sorted(vendors))
+    ids = array.array("H", (names.setdefault(vendors[oui], len(names)) for oui in prefixes))
+    if len(names) > 0xFFFF:
+        raise ValueError(f"{len(names)} distinct vendor names do not fit 16-bit ids")
+
+    blob = bytearray()
+    offsets = array.array("I", [0])
+    for name in names:
+        blob += name.encode()
+        offsets.append(len(blob))
+    if sys.byteorder == "big":
+        for table in (prefixes, ids, offsets):
+            table.byteswap()
+
+    padding = b"\0" * (-len(ids) * ids.itemsize % 4)
+    return b"".join(
+        (
+            HEADER.pack(MAGIC, len(prefixes), len(names)),
+            prefixes.tobytes(),
+            ids.tobytes(),
+            padding,
+            offsets.tobytes(),
+            bytes(blob),
+        )
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("csv", nargs="?", type=Path, help="IEEE MA-L registry CSV (oui.csv)")
+    source.add_argument("--download", action="store_true", help=f"Fetch {REGISTRY_URL}")
+    parser.add_argument("-o", "--output", type=Path, default=DEFAULT_INDEX)
+    args = parser.parse_args()
+
+    if args.download:
+        request = urllib.request.Request(REGISTRY_URL, headers={"User-Agent": "asus-exporter"})
+        with urllib.request.urlopen(request, timeout=60) as response:
+            vendors = read_registry(io.TextIOWrapper(response, encoding="utf-8"))
+    else:
+        with open(args.csv, encoding="utf-8", newline="") as file:
+            vendors = read_registry(file)
+
+    data = build_index(vendors)
+    args.output.write_bytes(data)
+    print(f"Wrote {len(vendors)} prefixes ({len(data)} bytes) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
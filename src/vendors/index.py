@@ -0,0 +1,116 @@
+"""Vendor lookup by MAC prefix over a memory-mapped, sorted OUI index"""
+
+import array
+import bisect
+import logging
+import mmap
+import struct
+import sys
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"OUI1"
+
+# magic, prefix count, vendor name count
+HEADER = struct.Struct("<4sII4x")
+
+DEFAULT_INDEX = Path(__file__).with_name("oui.bin")
+
+
+def _prefix(mac: str) -> int | None:
+    """24-bit OUI of a MAC address, None for malformed or locally administered addresses"""
+    digits = mac.replace(":", "").replace("-", "")[:6]
+    try:
+        oui = int(digits, 16)
+    except ValueError:
+        return None
+    if len(digits) != 6 or oui & 0x020000:
+        # Locally administered: randomized (private WiFi) addresses have no vendor
+        return None
+    return oui
+
+
+class VendorIndex:
+    """
+    Vendor names by OUI from the binary index written by build.py. The file holds the
+    sorted 24-bit prefixes, a vendor id per prefix and a deduplicated table of names, all
+    little-endian. It is memory-mapped on the first lookup and binary-searched in place,
+    so only the touched pages are resident instead of a dict of the whole registry.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_INDEX):
+        self.path = Path(path)
+        self._mmap: mmap.mmap | None = None
+        self._view: memoryview | None = None
+        self._prefixes = self._ids = self._offsets = ()
+        self._names = b""
+        self._loaded = False
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            with open(self.path, "rb") as file:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError) as e:
+            # ValueError: empty file
+            self.logger.info(f"No OUI index at {self.path} ({e}), client vendors stay empty")
+            return
+        magic, count, names = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            self.logger.warning(f"{self.path} is not an OUI index, client vendors stay empty")
+            self.close()
+            return
+
+        view = self._view = memoryview(self._mmap)
+        start = HEADER.size
+        prefixes = view[start : start + 4 * count].cast("I")
+        start += 4 * count
+        ids = view[start : start + 2 * count].cast("H")
+        start += (2 * count + 3) & ~3
+        offsets = view[start : start + 4 * (names + 1)].cast("I")
+        start += 4 * (names + 1)
+        if sys.byteorder == "big":
+            # The casts read native order; copies of the small tables are byte-swapped once
+            prefixes, ids, offsets = (
+                array.array(table.format, table.tobytes()) for table in (prefixes, ids, offsets)
+            )
+            for table in (prefixes, ids, offsets):
+                table.byteswap()
+        self._prefixes, self._ids, self._offsets = prefixes, ids, offsets
+        self._names = view[start:]
+        self.logger.info(f"Loaded OUI index with {count} prefixes from {self.path}")
+
+    def lookup(self, mac: str) -> str:
+        """Vendor of a MAC address, empty when unknown or randomized"""
+        if not self._loaded:
+            self._load()
+        oui = _prefix(mac)
+        if oui is None:
+            return ""
+        prefixes = self._prefixes
+        i = bisect.bisect_left(prefixes, oui)
+        if i == len(prefixes) or prefixes[i] != oui:
+            return ""
+        vendor = self._ids[i]
+        return bytes(self._names[self._offsets[vendor] : self._offsets[vendor + 1]]).decode()
+
+    def __len__(self) -> int:
+        if not self._loaded:
+            self._load()
+        return len(self._prefixes)
+
+    def close(self) -> None:
+        """Release the mapping"""
+        for table in (self._prefixes, self._ids, self._offsets, self._names):
+            if isinstance(table, memoryview):
+                table.release()
+        self._prefixes = self._ids = self._offsets = ()
+        self._names = b""
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
@@ -0,0 +1,110 @@
+"""Probe engine against local TCP, HTTP and DNS listeners"""
+
+import asyncio
+import struct
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from prometheus_client import REGISTRY
+
+from src.probes.engine import ProbeEngine
+
+
+class DnsStandIn(asyncio.DatagramProtocol):
+    """Answers every query, SERVFAIL for names starting with "fail", else NXDOMAIN"""
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        query_id = struct.unpack("!H", data[:2])[0]
+        rcode = 2 if data[13:17] == b"fail" else 3
+        header = struct.pack("!HHHHHH", query_id, 0x8180 | rcode, 1, 0, 0, 0)
+        self.transport.sendto(header + data[12:], addr)
+
+
+async def ok(_request: web.Request) -> web.Response:
+    return web.Response(text="ok")
+
+
+async def broken(_request: web.Request) -> web.Response:
+    return web.Response(status=500)
+
+
+def probes_total(target: str, result: str) -> float:
+    labels = {"probe_type": target.split(":")[0], "target": target, "result": result}
+    return REGISTRY.get_sample_value("asus_probes_total", labels) or 0.0
+
+
+class ProbeEngineTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        loop = asyncio.get_running_loop()
+
+        self.tcp = await asyncio.start_server(lambda _r, w: w.close(), "127.0.0.1", 0)
+        self.tcp_port = self.tcp.sockets[0].getsockname()[1]
+        # A port that was just released, so nothing listens there
+        closed = await asyncio.start_server(lambda _r, w: w.close(), "127.0.0.1", 0)
+        self.closed_port = closed.sockets[0].getsockname()[1]
+        closed.close()
+        await closed.wait_closed()
+
+        app = web.Application()
+        app.router.add_get("/ok", ok)
+        app.router.add_get("/broken", broken)
+        self.http = TestServer(app, host="127.0.0.1")
+        await self.http.start_server()
+
+        self.dns, _ = await loop.create_datagram_endpoint(DnsStandIn, local_addr=("127.0.0.1", 0))
+        self.dns_port = self.dns.get_extra_info("sockname")[1]
+        # Bound but never answers
+        self.silent, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, local_addr=("127.0.0.1", 0)
+        )
+        self.silent_port = self.silent.get_extra_info("sockname")[1]
+
+    async def asyncTearDown(self):
+        self.tcp.close()
+        await self.tcp.wait_closed()
+        await self.http.close()
+        self.dns.close()
+        self.silent.close()
+
+    async def test_probe_results(self):
+        http = f"http://127.0.0.1:{self.http.port}"
+        dns = f"dns://127.0.0.1:{self.dns_port}"
+        expected = {
+            f"tcp://127.0.0.1:{self.tcp_port}": "success",
+            f"tcp://127.0.0.1:{self.closed_port}": "error",
+            f"{http}/ok": "success",
+            f"{http}/broken": "error",
+            f"{dns}/router.example": "success",
+            f"{dns}/fail.example": "error",
+            f"dns://127.0.0.1:{self.silent_port}/router.example": "timeout",
+        }
+        engine = ProbeEngine(list(expected), interval=3600, timeout=0.5)
+        await engine.start()
+        try:
+            results = await asyncio.gather(*(engine.probe(target) for target in engine.targets))
+        finally:
+            await engine.close()
+
+        self.assertEqual(dict(zip(expected, results, strict=True)), expected)
+        for spec, result in expected.items():
+            self.assertGreaterEqual(probes_total(spec, result), 1)
+
+    async def test_targets_are_probed_on_the_schedule(self):
+        spec = f"tcp://127.0.0.1:{self.tcp_port}"
+        before = probes_total(spec, "success")
+        engine = ProbeEngine([spec], interval=0.05, timeout=0.5)
+        await engine.start()
+        try:
+            async with asyncio.timeout(5):
+                while probes_total(spec, "success") < before + 3:
+                    await asyncio.sleep(0.01)
+        finally:
+            await engine.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""remote_write delivery against a local aiohttp receiver"""
+
+import asyncio
+import struct
+import tempfile
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from prometheus_client import CollectorRegistry, Gauge
+
+from src.config import ExporterConfig
+from src.output.remote_write import RemoteWriteClient
+
+try:
+    import cramjam
+except ImportError:
+    cramjam = None
+
+
+def decompress(data: bytes) -> bytes:
+    """Undo snappy_compress: cramjam when installed, else the literal-only fallback"""
+    if cramjam is not None:
+        return bytes(cramjam.snappy.decompress_raw(data))
+    position = 0
+    while data[position] & 0x80:
+        position += 1
+    position += 1
+    out = bytearray()
+    while position < len(data):
+        tag = data[position] >> 2
+        position += 1
+        if tag == 60:
+            length = data[position] + 1
+            position += 1
+        elif tag == 61:
+            length = struct.unpack_from("<H", data, position)[0] + 1
+            position += 2
+        else:
+            length = tag + 1
+        out += data[position : position + length]
+        position += length
+    return bytes(out)
+
+
+async def wait_until(predicate, timeout: float = 5.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+class Receiver:
+    """remote_write endpoint stand-in with a switchable status and a gate to stall it"""
+
+    def __init__(self):
+        self.status = 204
+        self.requests = 0
+        self.delivered: list[bytes] = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        await self.gate.wait()
+        self.requests += 1
+        body = await request.read()
+        if request.headers.get("Content-Encoding") != "snappy":
+            return web.Response(status=400)
+        if self.status < 300:
+            self.delivered.append(decompress(body))
+        return web.Response(status=self.status)
+
+
+class RemoteWriteDeliveryTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.receiver = Receiver()
+        app = web.Application()
+        app.router.add_post("/api/v1/write", self.receiver.handle)
+        self.server = TestServer(app, host="127.0.0.1")
+        await self.server.start_server()
+
+        self.wal_dir = tempfile.TemporaryDirectory()
+        self.registry = CollectorRegistry()
+        self.value = Gauge("asus_test_value", "Test value", registry=self.registry)
+        config = ExporterConfig(
+            hostname="192.168.1.1",
+            username="admin",
+            password="",
+            remote_write_url=str(self.server.make_url("/api/v1/write")),
+            remote_write_max_retries=0,
+            remote_write_timeout=2.0,
+            remote_write_wal_dir=self.wal_dir.name,
+        )
+        self.client = RemoteWriteClient(config, self.registry)
+        await self.client.start()
+
+    async def asyncTearDown(self):
+        self.receiver.gate.set()
+        await self.client.close()
+        await self.server.close()
+        self.wal_dir.cleanup()
+
+    async def test_publish_does_not_wait_for_the_receiver(self):
+        self.receiver.gate.clear()
+        self.value.set(1)
+        await asyncio.wait_for(self.client.publish(), timeout=1.0)
+        self.assertEqual(len(self.client.wal.segments()), 1)
+
+        self.receiver.gate.set()
+        await wait_until(lambda: not self.client.wal.segments())
+        self.assertEqual(len(self.receiver.delivered), 1)
+        self.assertIn(b"asus_test_value", self.receiver.delivered[0])
+
+    async def test_outage_is_backfilled_in_order(self):
+        self.receiver.status = 503
+        for value in (1, 2):
+            self.value.set(value)
+            await self.client.publish()
+            await wait_until(lambda count=value: self.receiver.requests >= count)
+        self.assertEqual(len(self.client.wal.segments()), 2)
+        self.assertEqual(self.receiver.delivered, [])
+
+        self.receiver.status = 204
+        self.value.set(3)
+        await self.client.publish()
+        await wait_until(lambda: not self.client.wal.segments())
+
+        self.assertEqual(len(self.receiver.delivered), 3)
+        for body, value in zip(self.receiver.delivered, (1.0, 2.0, 3.0), strict=True):
+            self.assertIn(b"\x09" + struct.pack("<d", value), body)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,215 @@
+"""SshSource against OpenSSH on localhost, or a local shell standing in for the router"""
+
+import asyncio
+import getpass
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import textwrap
+import time
+import unittest
+from pathlib import Path
+
+from asusrouter import AsusData
+
+from src.sources.ssh import SshSource
+
+SSHD = shutil.which("sshd") or shutil.which("sshd", path="/usr/sbin:/usr/local/sbin")
+
+# /proc/net/dev of the stand-in router: eth0 is the WAN, eth6/eth7 the 2.4/5 GHz radios
+NET_DEV = """\
+Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo:     100       1    0    0    0     0          0         0      100       1    0    0    0     0       0          0
+  eth0:    5000      10    0    0    0     0          0         0     6000      12    0    0    0     0       0          0
+  eth1:    1000       5    0    0    0     0          0         0     2000       6    0    0    0     0       0          0
+  eth2:    3000       7    0    0    0     0          0         0     4000       8    0    0    0     0       0          0
+  eth6:    7000      20    0    0    0     0          0         0     8000      21    0    0    0     0       0          0
+  eth7:   11000      30    0    0    0     0          0         0    12000      31    0    0    0     0       0          0
+   br0:    9000      40    0    0    0     0          0         0     9500      41    0    0    0     0       0          0
+"""
+
+NVRAM = """\
+#!/bin/sh
+case "$2" in
+    wan0_ifname) echo eth0 ;;
+    lan_ifname) echo br0 ;;
+    lan_ifnames) echo "eth1 eth2 eth6 eth7" ;;
+    wl0_ifname) echo eth6 ;;
+    wl1_ifname) echo eth7 ;;
+esac
+"""
+
+WL = """\
+#!/bin/sh
+echo "90 (0x5a)"
+"""
+
+EXPECTED_NETWORK = {
+    "wan": {"rx": 5000.0, "tx": 6000.0},
+    "bridge": {"rx": 9000.0, "tx": 9500.0},
+    "2ghz": {"rx": 7000.0, "tx": 8000.0},
+    "5ghz": {"rx": 11000.0, "tx": 12000.0},
+    "wired": {"rx": 4000.0, "tx": 6000.0},
+}
+
+
+def write_script(path: Path, content: str) -> None:
+    path.write_text(content)
+    path.chmod(0o755)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class _SshSourceCase:
+    """Checks shared by both transports; subclasses put an `ssh` first on PATH"""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="asus-ssh-test-"))
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+
+        # Commands the snapshot script runs on the router
+        self.router_bin = self.tmp / "router-bin"
+        self.router_bin.mkdir()
+        (self.tmp / "net_dev").write_text(NET_DEV)
+        write_script(self.router_bin / "nvram", NVRAM)
+        write_script(self.router_bin / "wl", WL)
+        cat = shutil.which("cat")
+        write_script(
+            self.router_bin / "cat",
+            f'#!/bin/sh\n[ "$1" = /proc/net/dev ] && exec {cat} {self.tmp / "net_dev"}\n'
+            f'exec {cat} "$@"\n',
+        )
+
+        self.client_bin = self.tmp / "client-bin"
+        self.client_bin.mkdir()
+        path = os.environ.get("PATH", "")
+        os.environ["PATH"] = f"{self.client_bin}:{path}"
+        self.addCleanup(os.environ.__setitem__, "PATH", path)
+
+    def make_source(self) -> SshSource:
+        raise NotImplementedError
+
+    async def check_snapshot(self):
+        source = self.make_source()
+        try:
+            self.assertTrue(await source.async_connect())
+            network = await source.async_get_data(AsusData.NETWORK)
+            temperature = await source.async_get_data(AsusData.TEMPERATURE)
+            ram = await source.async_get_data(AsusData.RAM)
+        finally:
+            await source.async_disconnect()
+
+        self.assertEqual(network, EXPECTED_NETWORK)
+        self.assertEqual(temperature["2ghz"], 65.0)
+        self.assertEqual(temperature["5ghz"], 65.0)
+        self.assertGreater(ram["total"], 0)
+
+    def test_snapshot(self):
+        asyncio.run(self.check_snapshot())
+
+
+class SshSourceShellTest(_SshSourceCase, unittest.TestCase):
+    """`ssh` replaced by a shell running the script locally, always available"""
+
+    def setUp(self):
+        super().setUp()
+        write_script(
+            self.client_bin / "ssh",
+            textwrap.dedent(
+                f"""\
+                #!/bin/sh
+                # "-O exit" stops the control master; there is none here
+                for arg; do [ "$arg" = -O ] && exit 0; done
+                PATH="{self.router_bin}:$PATH" exec sh -s
+                """
+            ),
+        )
+
+    def make_source(self) -> SshSource:
+        return SshSource("router.invalid", "admin", timeout=10.0)
+
+
+@unittest.skipUnless(SSHD, "OpenSSH server (sshd) is not installed")
+class SshSourceOpenSshTest(_SshSourceCase, unittest.TestCase):
+    """A throwaway sshd on 127.0.0.1 running the script as the current user"""
+
+    def setUp(self):
+        super().setUp()
+        keygen = ["ssh-keygen", "-q", "-t", "ed25519", "-N", ""]
+        subprocess.run([*keygen, "-f", str(self.tmp / "host_key")], check=True)
+        subprocess.run([*keygen, "-f", str(self.tmp / "client_key")], check=True)
+        public_key = (self.tmp / "client_key.pub").read_text().strip()
+        (self.tmp / "authorized_keys").write_text(
+            f'environment="PATH={self.router_bin}:/usr/bin:/bin" {public_key}\n'
+        )
+
+        self.port = free_port()
+        (self.tmp / "sshd_config").write_text(
+            textwrap.dedent(
+                f"""\
+                ListenAddress 127.0.0.1
+                Port {self.port}
+                HostKey {self.tmp / "host_key"}
+                AuthorizedKeysFile {self.tmp / "authorized_keys"}
+                PidFile {self.tmp / "sshd.pid"}
+                PasswordAuthentication no
+                PermitRootLogin prohibit-password
+                PermitUserEnvironment PATH
+                StrictModes no
+                UsePAM no
+                """
+            )
+        )
+        sshd = subprocess.Popen(
+            [SSHD, "-D", "-e", "-f", str(self.tmp / "sshd_config")],
+            stderr=subprocess.DEVNULL,
+        )
+        self.addCleanup(sshd.wait)
+        self.addCleanup(sshd.terminate)
+        self.wait_for_port()
+
+        # The source runs plain `ssh`; point it at the throwaway known_hosts
+        (self.tmp / "ssh_config").write_text(
+            textwrap.dedent(
+                f"""\
+                Host 127.0.0.1
+                    StrictHostKeyChecking no
+                    UserKnownHostsFile {self.tmp / "known_hosts"}
+                """
+            )
+        )
+        write_script(
+            self.client_bin / "ssh",
+            f'#!/bin/sh\nexec {shutil.which("ssh")} -F {self.tmp / "ssh_config"} "$@"\n',
+        )
+
+    def wait_for_port(self, timeout: float = 10.0) -> None:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=1).close()
+                return
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+
+    def make_source(self) -> SshSource:
+        return SshSource(
+            "127.0.0.1",
+            getpass.getuser(),
+            port=self.port,
+            key_path=str(self.tmp / "client_key"),
+            timeout=10.0,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""Syslog client events sent to a local receiver over UDP and TCP"""
+
+import asyncio
+import unittest
+
+from asusrouter import AsusData
+from prometheus_client import REGISTRY
+
+from src.collectors.manager import MetricsCollectorManager
+from src.config import ExporterConfig
+from src.ingest.syslog import SyslogReceiver
+
+MAC = "AA:BB:CC:00:00:01"
+LABELS = {"mac": MAC, "name": "laptop", "connection_type": "wifi_5g"}
+CLIENTS = {
+    MAC: {
+        "name": "laptop",
+        "nickName": None,
+        "isWL": "2",
+        "isOnline": "1",
+        "rssi": "-55",
+        "curTx": "866.7",
+        "curRx": "780.0",
+        "internetState": 1,
+        "node": None,
+    }
+}
+DISASSOC = (
+    f"<30>Oct 19 10:00:00 RT-AX86U wlceventd: wlceventd_proc_event(530): eth7: "
+    f"Disassoc {MAC}, status: 0, reason: Disassociated because sending station is leaving (8)"
+)
+DHCPRELEASE = (
+    f"<30>Oct 19 10:00:01 RT-AX86U dnsmasq-dhcp[1234]: DHCPRELEASE(br0) 192.168.50.20 "
+    f"{MAC.lower()} laptop"
+)
+
+
+class StaticSource:
+    """DataSource stand-in serving a fixed CLIENTS table"""
+
+    name = "static"
+
+    def supports(self, data_type: AsusData) -> bool:
+        return data_type == AsusData.CLIENTS
+
+    async def async_get_data(self, data_type: AsusData, force: bool = False):  # noqa: ARG002
+        return CLIENTS if data_type == AsusData.CLIENTS else {}
+
+
+async def wait_until(predicate, timeout: float = 5.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+def client_online() -> float | None:
+    return REGISTRY.get_sample_value("asus_client_online", LABELS)
+
+
+class SyslogClientEventTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        config = ExporterConfig(
+            hostname="192.168.50.1",
+            username="admin",
+            password="",
+            collectors=["wifi"],
+            capability_probe=False,
+            syslog_host="127.0.0.1",
+            syslog_port=0,
+        )
+        self.manager = MetricsCollectorManager(StaticSource(), config)
+        self.wifi = self.manager.get_collector("wifi")
+        await self.wifi.collect()
+        self.assertEqual(client_online(), 1)
+
+        self.config = config
+        self.receiver = None
+
+    async def asyncTearDown(self):
+        if self.receiver:
+            await self.receiver.close()
+
+    async def start_receiver(self, protocol: str) -> int:
+        self.config.syslog_protocol = protocol
+        self.receiver = SyslogReceiver(self.config, self.manager)
+        await self.receiver.start()
+        if protocol == "udp":
+            return self.receiver.transport.get_extra_info("sockname")[1]
+        return self.receiver.server.sockets[0].getsockname()[1]
+
+    async def test_udp_disassoc_until_the_next_poll(self):
+        port = await self.start_receiver("udp")
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, remote_addr=("127.0.0.1", port)
+        )
+        transport.sendto(DISASSOC.encode())
+        transport.close()
+
+        await wait_until(lambda: client_online() == 0)
+
+        # The router still lists the client online, and its poll must win over the event
+        await self.wifi.collect()
+        self.assertEqual(client_online(), 1)
+
+    async def test_tcp_octet_counted_dhcp_release(self):
+        port = await self.start_receiver("tcp")
+        _, writer = await asyncio.open_connection("127.0.0.1", port)
+        message = DHCPRELEASE.encode()
+        writer.write(str(len(message)).encode() + b" " + message)
+        await writer.drain()
+
+        await wait_until(lambda: client_online() == 0)
+        writer.close()
+        await writer.wait_closed()
+
+
+if __name__ == "__main__":
+    unittest.main()